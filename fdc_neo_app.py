@@ -4,9 +4,39 @@ FDC NEO Application
 Streamlit 기반 웹 UI
 """
 
+import contextlib
+import hashlib
+import os
+import sqlite3
+import tempfile
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
 import streamlit as st
 
-from fdc_neo_converter import FDCNEOConverter, ConversionResult
+from fdc_neo_converter import FDCNEOConverter, ConversionResult, parse_site_id
+from fdc_neo_batch import group_by_site, run_batch_merge, write_zip
+from fdc_neo_catalog import ENV_DB as CATALOG_ENV_DB, SiteCatalog
+from fdc_neo_latest import ENV_DIR as LATEST_ENV_DIR, LatestFaultsView
+from fdc_neo_metrics import start_from_env
+import fdc_neo_profile
+
+# 메트릭 (FDC_NEO_METRICS_PORT / FDC_NEO_METRICS_FILE 설정 시에만)
+start_from_env()
+
+# 사이트별 최근 고장 뷰 (파일 병합/일괄 병합 시 갱신, 홈 화면에서 조회)
+LATEST_DIR = os.environ.get(LATEST_ENV_DIR) or os.path.join(tempfile.gettempdir(), 'fdc_neo_latest')
+
+# 사이트 카탈로그 (설정 시 일괄 병합에서 사이트/기간으로 파일 선택)
+CATALOG_DB = os.environ.get(CATALOG_ENV_DB)
+
+# 일괄 병합 zip: 다운로드 버튼은 파일 전체를 메모리(미디어 저장소)에 올리므로
+# 이 크기를 넘으면 버튼 대신 서버의 BATCH_DIR에 남기고 경로만 표시
+BATCH_DIR = os.path.join(tempfile.gettempdir(), 'fdc_neo_batch')
+BATCH_DOWNLOAD_MAX_BYTES = 200 * 1024 * 1024
+
+# 프로파일 보고서 디렉토리 (출력 파일 경로가 없는 메모리 변환)
+PROFILE_DIR = os.path.join(tempfile.gettempdir(), 'fdc_neo_profile')
 
 # 페이지 설정
 st.set_page_config(
@@ -71,15 +101,68 @@ def main():
     st.sidebar.title("📋 메뉴")
     menu = st.sidebar.radio(
         "기능 선택",
-        ["🏠 홈", "🔄 파일 변환", "🔗 파일 병합"]
+        ["🏠 홈", "🔄 파일 변환", "🔗 파일 병합", "📦 일괄 병합"]
+    )
+    
+    # 프로파일링은 이 세션의 실행 스레드에서만 (다른 세션의 변환에는 영향 없음)
+    if show_profile_sidebar():
+        scope = fdc_neo_profile.profiling(PROFILE_DIR, st.session_state.profile_reports)
+    else:
+        scope = contextlib.nullcontext()
+    
+    with scope:
+        if menu == "🏠 홈":
+            show_home()
+        elif menu == "🔄 파일 변환":
+            show_conversion()
+        elif menu == "🔗 파일 병합":
+            show_merge()
+        elif menu == "📦 일괄 병합":
+            show_batch_merge()
+
+
+def show_profile_sidebar() -> bool:
+    """프로파일링 토글 + 이 세션의 최근 보고서 (켜져 있으면 True)"""
+    
+    st.sidebar.markdown("---")
+    enabled = st.sidebar.checkbox(
+        "🔬 프로파일링",
+        key='profile_enabled',
+        help="이 세션의 변환/병합 호출마다 호출 스택을 샘플링해 보고서 생성 (캐시된 결과는 변환기를 다시 실행하지 않으므로 제외)"
+    )
+    reports = st.session_state.setdefault('profile_reports', [])
+    if not enabled:
+        return False
+    
+    if not reports:
+        st.sidebar.caption("아직 보고서가 없습니다.")
+        return True
+    
+    reports = list(reversed(reports))
+    
+    report = st.sidebar.selectbox(
+        "보고서",
+        reports,
+        format_func=lambda r: f"{r.label} ({r.elapsed:.2f}s, 샘플 {r.samples})"
     )
+    try:
+        with open(report.summary_path, 'r', encoding='utf-8') as f:
+            summary = f.read()
+        with open(report.collapsed_path, 'rb') as f:
+            collapsed = f.read()
+    except OSError as e:
+        st.sidebar.error(f"보고서 읽기 실패: {e}")
+        return True
     
-    if menu == "🏠 홈":
-        show_home()
-    elif menu == "🔄 파일 변환":
-        show_conversion()
-    elif menu == "🔗 파일 병합":
-        show_merge()
+    with st.sidebar.expander("요약", expanded=False):
+        st.code(summary, language=None)
+    st.sidebar.download_button(
+        label="📥 collapsed stack",
+        data=collapsed,
+        file_name=os.path.basename(report.collapsed_path),
+        mime="text/plain"
+    )
+    return True
 
 
 def show_home():
@@ -100,6 +183,11 @@ def show_home():
         - 온라인 + 오프라인 병합
         - 타임스탬프 기준 중복 제거
         - 온라인 또는 오프라인 형식으로 출력
+        
+        #### 3. 📦 일괄 병합
+        - 여러 파일을 사이트 ID별로 자동 분류
+        - 사이트별 병렬 병합, 진행 현황 표시
+        - 결과를 zip 하나로 다운로드
         """)
     
     with col2:
@@ -118,6 +206,104 @@ def show_home():
         - 추출률: 99.6%
         - 처리 속도: ~1초/파일
         """)
+    
+    show_latest_faults()
+
+
+def show_latest_faults():
+    """사이트별 최근 고장 (뷰 파일만 조회, Fault_* 파일은 읽지 않음)"""
+    
+    st.markdown("---")
+    st.markdown("### 🕒 사이트별 최근 고장")
+    
+    try:
+        view = LatestFaultsView(LATEST_DIR)
+        sites = view.sites()
+    except (OSError, ValueError) as e:
+        st.error(f"최근 고장 뷰 읽기 실패: {e}")
+        return
+    
+    if not sites:
+        st.caption("아직 집계된 사이트가 없습니다. 🔗 파일 병합 또는 📦 일괄 병합을 실행하면 사이트별로 갱신됩니다.")
+        return
+    
+    st.dataframe(
+        [
+            {
+                "사이트": heap.site_id,
+                "종류": heap.site,
+                "최근 고장": heap.newest.strftime('%Y-%m-%d %H:%M:%S'),
+                "보관 레코드": len(heap),
+                "보관 시작": heap.oldest.strftime('%Y-%m-%d %H:%M:%S')
+            }
+            for heap in sites
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        site_id = st.selectbox("사이트", [heap.site_id for heap in sites], key='latest_site')
+    with col2:
+        count = st.number_input("표시 개수", min_value=1, max_value=view.capacity, value=20, key='latest_count')
+    
+    st.dataframe(
+        [
+            {
+                "시각": ts.strftime('%Y-%m-%d %H:%M:%S'),
+                "마커": f"{record[0]:02X} {record[1]:02X}",
+                "데이터": record[8:].hex(' ').upper()
+            }
+            for ts, record in view.latest(site_id, int(count))
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+
+def _upload_digest(uploaded_file) -> str:
+    """업로드 파일 내용 해시 (캐시 키)"""
+    return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+
+
+# =====================================================================
+# 변환/병합 결과 캐시
+# - 업로드 내용 해시 + 옵션을 키로 사용 (업로드 버퍼 자체는 해시하지 않음: '_' 접두사)
+# - 출력 파일명 변경, 다운로드 클릭 등 재실행 시 재파싱하지 않음
+# - /tmp 임시 파일을 사용하지 않으므로 세션 간 파일명 충돌 없음
+# =====================================================================
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_online_to_offline(digest: str, filename: str, _data: bytes) -> ConversionResult:
+    return FDCNEOConverter().online_to_offline_bytes(_data, filename)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_offline_to_online(digest: str, filename: str, _data: bytes) -> ConversionResult:
+    return FDCNEOConverter().offline_to_online_bytes(_data, filename)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_extract_records(digest: str, kind: str, _data: bytes) -> list:
+    return FDCNEOConverter().extract_records(_data, kind)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_merge(
+    online_digest: str,
+    offline_digest: str,
+    output_format: str,
+    site: str,
+    _online_records: list,
+    _offline_records: list,
+    site_id: Optional[str] = None
+) -> ConversionResult:
+    """병합 (site_id가 있으면 처음 병합할 때 사이트별 최근 고장 뷰도 갱신)"""
+    converter = FDCNEOConverter(latest=LatestFaultsView(LATEST_DIR) if site_id else None)
+    return converter.merge_records(
+        _online_records, _offline_records, output_format=output_format, site=site, site_id=site_id
+    )
 
 
 def show_conversion():
@@ -125,8 +311,6 @@ def show_conversion():
     
     st.markdown("### 🔄 파일 변환")
     
-    converter = FDCNEOConverter()
-    
     tab1, tab2 = st.tabs(["온라인 → 오프라인", "오프라인 → 온라인"])
     
     with tab1:
@@ -140,10 +324,6 @@ def show_conversion():
         )
         
         if uploaded_file:
-            temp_path = f"/tmp/{uploaded_file.name}"
-            with open(temp_path, 'wb') as f:
-                f.write(uploaded_file.getvalue())
-            
             output_name = st.text_input(
                 "출력 파일명",
                 value=f"Fault_Converted_{uploaded_file.name}",
@@ -152,7 +332,9 @@ def show_conversion():
             
             if st.button("변환 시작", type="primary", key='online_to_offline_btn'):
                 with st.spinner("변환 중..."):
-                    result = converter.online_to_offline(temp_path, f"/tmp/{output_name}")
+                    result = _cached_online_to_offline(
+                        _upload_digest(uploaded_file), uploaded_file.name, uploaded_file.getvalue()
+                    )
                     
                     if result.success:
                         st.success(f"✅ {result.message}")
@@ -167,13 +349,12 @@ def show_conversion():
                         col3.metric("변환률", "100%" if result.input_record_count > 0 else "0%")
                         
                         # 다운로드 버튼
-                        with open(result.output_file, 'rb') as f:
-                            st.download_button(
-                                label="📥 변환된 파일 다운로드",
-                                data=f,
-                                file_name=output_name,
-                                mime='application/octet-stream'
-                            )
+                        st.download_button(
+                            label="📥 변환된 파일 다운로드",
+                            data=result.output_data,
+                            file_name=output_name,
+                            mime='application/octet-stream'
+                        )
                     else:
                         st.error(f"❌ {result.message}")
     
@@ -188,10 +369,6 @@ def show_conversion():
         )
         
         if uploaded_file:
-            temp_path = f"/tmp/{uploaded_file.name}"
-            with open(temp_path, 'wb') as f:
-                f.write(uploaded_file.getvalue())
-            
             output_name = st.text_input(
                 "출력 파일명",
                 value=f"Online_Converted_{uploaded_file.name}",
@@ -200,7 +377,9 @@ def show_conversion():
             
             if st.button("변환 시작", type="primary", key='offline_to_online_btn'):
                 with st.spinner("변환 중..."):
-                    result = converter.offline_to_online(temp_path, f"/tmp/{output_name}")
+                    result = _cached_offline_to_online(
+                        _upload_digest(uploaded_file), uploaded_file.name, uploaded_file.getvalue()
+                    )
                     
                     if result.success:
                         st.success(f"✅ {result.message}")
@@ -215,13 +394,12 @@ def show_conversion():
                         col3.metric("변환률", "100%" if result.input_record_count > 0 else "0%")
                         
                         # 다운로드 버튼
-                        with open(result.output_file, 'r') as f:
-                            st.download_button(
-                                label="📥 변환된 파일 다운로드",
-                                data=f,
-                                file_name=output_name,
-                                mime='text/plain'
-                            )
+                        st.download_button(
+                            label="📥 변환된 파일 다운로드",
+                            data=result.output_data,
+                            file_name=output_name,
+                            mime='text/plain'
+                        )
                     else:
                         st.error(f"❌ {result.message}")
 
@@ -232,8 +410,6 @@ def show_merge():
     st.markdown("### 🔗 파일 병합")
     st.info("온라인 + 오프라인 파일을 병합하고 타임스탬프 기준으로 중복을 제거합니다.")
     
-    converter = FDCNEOConverter()
-    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -273,21 +449,34 @@ def show_merge():
         
         if st.button("병합 시작", type="primary"):
             with st.spinner("병합 중..."):
-                # 임시 파일 저장
-                online_path = f"/tmp/{online_file.name}"
-                offline_path = f"/tmp/{offline_file.name}"
-                output_path = f"/tmp/{output_name}"
-                
-                with open(online_path, 'wb') as f:
-                    f.write(online_file.getvalue())
-                with open(offline_path, 'wb') as f:
-                    f.write(offline_file.getvalue())
-                
-                # 병합
-                if output_format == "온라인 형식":
-                    result = converter.merge_to_online(online_path, offline_path, output_path)
-                else:
-                    result = converter.merge_to_offline(online_path, offline_path, output_path)
+                # 레코드 추출 (업로드별 캐시: 출력 형식을 바꿔도 재파싱하지 않음)
+                online_digest = _upload_digest(online_file)
+                offline_digest = _upload_digest(offline_file)
+                try:
+                    online_records = _cached_extract_records(online_digest, 'online', online_file.getvalue())
+                    offline_records = _cached_extract_records(offline_digest, 'offline', offline_file.getvalue())
+                    
+                    # 병합
+                    site = FDCNEOConverter().detect_site(
+                        offline_file.getvalue(), offline_file.name, online_file.name
+                    )
+                    # 사이트 ID를 파일명으로 알 수 있으면 사이트별 최근 고장 뷰도 갱신
+                    result = _cached_merge(
+                        online_digest,
+                        offline_digest,
+                        'online' if output_format == "온라인 형식" else 'offline',
+                        site,
+                        online_records,
+                        offline_records,
+                        parse_site_id(online_file.name) or parse_site_id(offline_file.name)
+                    )
+                except Exception as e:
+                    result = ConversionResult(
+                        success=False,
+                        output_file="",
+                        record_count=0,
+                        message=f"병합 실패: {str(e)}"
+                    )
                 
                 if result.success:
                     st.success(f"✅ {result.message}")
@@ -313,18 +502,207 @@ def show_merge():
                     
                     # 다운로드 버튼
                     mime_type = 'text/plain' if output_format == "온라인 형식" else 'application/octet-stream'
-                    read_mode = 'r' if output_format == "온라인 형식" else 'rb'
                     
-                    with open(result.output_file, read_mode) as f:
-                        st.download_button(
-                            label="📥 병합된 파일 다운로드",
-                            data=f,
-                            file_name=output_name,
-                            mime=mime_type
-                        )
+                    st.download_button(
+                        label="📥 병합된 파일 다운로드",
+                        data=result.output_data,
+                        file_name=output_name,
+                        mime=mime_type
+                    )
                 else:
                     st.error(f"❌ {result.message}")
 
 
+def pick_catalog_files() -> list:
+    """카탈로그에서 사이트/기간으로 파일 선택 (원본 파일을 열지 않고 조회, 선택한 파일만 읽어 (경로, 내용) 목록 반환)"""
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        start = st.date_input("시작일", value=date.today() - timedelta(days=7), key='catalog_since')
+    with col2:
+        end = st.date_input("종료일", value=date.today(), key='catalog_until')
+    since = datetime.combine(start, time.min)
+    until = datetime.combine(end, time.max)
+    
+    try:
+        with SiteCatalog(CATALOG_DB) as catalog:
+            sites = catalog.sites(since=since, until=until)
+            site_ids = st.multiselect(
+                "사이트 (기간 내 고장이 있는 사이트, 최근 고장 순)",
+                [s.site_id for s in sites],
+                key='catalog_sites'
+            )
+            entries = [entry for site_id in site_ids for entry in catalog.files(site_id, since, until)]
+    except sqlite3.Error as e:
+        st.error(f"카탈로그 조회 실패: {e}")
+        return []
+    
+    if not entries:
+        if site_ids:
+            st.caption("기간 내 레코드가 있는 파일이 없습니다.")
+        return []
+    
+    st.dataframe(
+        [
+            {
+                "파일": os.path.basename(entry.path),
+                "사이트": entry.site_id,
+                "형식": entry.format,
+                "레코드 수": entry.record_count,
+                "시작": entry.min_ts.strftime('%Y-%m-%d %H:%M:%S'),
+                "끝": entry.max_ts.strftime('%Y-%m-%d %H:%M:%S')
+            }
+            for entry in entries
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    files = []
+    for entry in entries:
+        try:
+            with open(entry.path, 'rb') as f:
+                files.append((entry.path, f.read()))
+        except OSError as e:
+            st.warning(f"⚠️ {entry.path} 읽기 실패 (카탈로그 갱신 필요): {e}")
+    return files
+
+
+def show_batch_merge():
+    """일괄 병합 화면"""
+    
+    st.markdown("### 📦 일괄 병합")
+    st.info("여러 온라인/오프라인 파일을 사이트 ID별로 묶어 병렬로 병합합니다. 형식은 파일 내용으로 자동 판별합니다.")
+    
+    source = "파일 업로드"
+    if CATALOG_DB and os.path.exists(CATALOG_DB):
+        source = st.radio("입력", ["파일 업로드", "카탈로그에서 선택"], horizontal=True, key='batch_source')
+    
+    if source == "카탈로그에서 선택":
+        files = pick_catalog_files()
+    else:
+        uploaded_files = st.file_uploader(
+            "파일 업로드 (여러 개 선택 가능)",
+            type=['txt'],
+            accept_multiple_files=True,
+            key='batch_upload',
+            help="GT_*.txt, WB_*.txt, Fault_*.txt"
+        )
+        files = [(f.name, f.getvalue()) for f in uploaded_files or []]
+    
+    if not files:
+        return
+    
+    groups = group_by_site(files)
+    
+    st.markdown("---")
+    st.markdown(f"#### 사이트 {len(groups)}개 / 파일 {len(files)}개")
+    st.dataframe(
+        [
+            {"사이트": g.site_id, "온라인 파일": len(g.online), "오프라인 파일": len(g.offline)}
+            for g in groups.values()
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        output_format = st.radio(
+            "출력 형식",
+            ["온라인 형식", "오프라인 형식"],
+            index=1,
+            horizontal=True,
+            key='batch_output_format'
+        )
+    with col2:
+        max_workers = st.slider("작업 프로세스 수", min_value=1, max_value=8, value=4, key='batch_workers')
+    
+    if not st.button("일괄 병합 시작", type="primary", key='batch_btn'):
+        return
+    
+    # 파일별 진행 현황
+    rows = {}
+    for group in groups.values():
+        for name in group.filenames:
+            rows[name] = {"파일": name, "사이트": group.site_id, "상태": "대기", "레코드 수": 0, "중복 제거": 0}
+    
+    progress = st.progress(0.0)
+    table = st.empty()
+    table.dataframe(list(rows.values()), use_container_width=True, hide_index=True)
+    
+    results = []
+    
+    def completed_outputs(output_dir):
+        """사이트 병합이 끝나는 대로 진행 현황을 갱신하고 출력 경로 전달"""
+        merged = run_batch_merge(
+            groups.values(),
+            'online' if output_format == "온라인 형식" else 'offline',
+            output_dir,
+            max_workers=max_workers,
+            latest_dir=LATEST_DIR
+        )
+        for site_result in merged:
+            results.append(site_result)
+            for status in site_result.files:
+                rows[status.filename].update({
+                    "상태": status.status,
+                    "레코드 수": status.record_count,
+                    "중복 제거": status.duplicate_count
+                })
+            progress.progress(len(results) / len(groups))
+            table.dataframe(list(rows.values()), use_container_width=True, hide_index=True)
+            if site_result.result.success:
+                yield site_result.result.output_file
+    
+    # 출력 파일은 작업 디렉토리에 저장되고, zip은 완료되는 대로 BATCH_DIR의 파일에 스트리밍 기록
+    # (병합 중에는 출력 전체를 메모리에 두지 않음, 다운로드 단계는 아래 참고)
+    os.makedirs(BATCH_DIR, exist_ok=True)
+    zip_file = tempfile.NamedTemporaryFile(
+        dir=BATCH_DIR, prefix='FDC_Batch_Merged_', suffix='.zip', delete=False
+    )
+    try:
+        with tempfile.TemporaryDirectory() as output_dir, zip_file:
+            with st.spinner("병합 중..."):
+                output_count = write_zip(completed_outputs(output_dir), zip_file)
+    except BaseException:
+        os.remove(zip_file.name)
+        raise
+    
+    failed = [r for r in results if not r.result.success]
+    for site_result in failed:
+        st.error(f"❌ {site_result.site_id}: {site_result.result.message}")
+    
+    if not output_count:
+        os.remove(zip_file.name)
+        return
+    
+    st.success(f"✅ {output_count}개 사이트 병합 완료")
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("병합 전 총 레코드", f"{sum(r.result.input_record_count for r in results):,}")
+    col2.metric("중복 제거", f"{sum(r.result.duplicate_count for r in results):,}")
+    col3.metric("최종 레코드 수", f"{sum(r.result.output_record_count for r in results):,}")
+    
+    zip_size = os.path.getsize(zip_file.name)
+    if zip_size > BATCH_DOWNLOAD_MAX_BYTES:
+        # 다운로드 버튼은 zip 전체를 메모리에 올리므로 큰 결과는 서버에 남김
+        st.warning(
+            f"결과 zip이 {zip_size / 1024 / 1024:,.0f}MB라 다운로드 버튼 대신 서버에 저장했습니다: `{zip_file.name}`"
+        )
+        return
+    
+    # 다운로드 버튼은 zip 전체를 메모리(미디어 저장소)에 올림 (BATCH_DOWNLOAD_MAX_BYTES 이하만)
+    with open(zip_file.name, 'rb') as f:
+        zip_data = f.read()
+    os.remove(zip_file.name)
+    st.download_button(
+        label="📥 병합 결과 다운로드 (zip)",
+        data=zip_data,
+        file_name=f"FDC_Batch_Merged_{len(results)}sites.zip",
+        mime='application/zip'
+    )
+
+
 if __name__ == '__main__':
     main()
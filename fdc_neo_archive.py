@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Archive
+사이트별 다중 세그먼트 오프라인 아카이브 (512KB/256KB 용량 제한 없이 이력 누적)
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass
+
+from fdc_neo_converter import (
+    FDCNEOConverter,
+    ConversionResult,
+    RecordFilter,
+    ScanResult,
+    BufferSource,
+    get_format,
+    offline_capacity,
+    _atomic_write,
+)
+from fdc_neo_latest import LatestFaultsView
+
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+BLOOM_NAME = 'bloom.bin'
+BLOOM_MAGIC = b'FDCBLM2\x00'  # 2: 정규화 키 (이전 형식 파일은 세그먼트에서 다시 생성)
+BLOOM_FP_RATE = 0.01  # 목표 오탐률
+BLOOM_MIN_CAPACITY = 16384
+
+# 세그먼트 레코드 경계 인덱스: [매직 8B][레코드 수 4B][레코드 데이터 크기 4B] + 레코드 시작 오프셋 uint32 × (N+1)
+# 온라인 파일에서 온 레코드(EA/EB 등 오프라인 마커가 아닌 레코드)나 데이터 안의 07 E? 바이트 때문에
+# 다시 스캔하면 경계가 달라질 수 있으므로, 아카이브는 기록한 경계 그대로 읽음
+SEGMENT_INDEX_EXT = '.idx'
+SEGMENT_INDEX_MAGIC = b'FDCSIX1\x00'
+_SEGMENT_INDEX_HEADER = struct.Struct('<8sII')
+
+
+class BloomFilter:
+    """
+    Bloom filter (중복 사전 검사용)
+    
+    - might_contain()이 False면 확실히 없는 키 → 정확한 조회 생략
+    - True면 있을 수 있음 → 정확한 조회로 확인
+    """
+    
+    def __init__(self, capacity: int, fp_rate: float = BLOOM_FP_RATE):
+        self.capacity = max(capacity, 1)
+        self.bit_count = max(8, int(-self.capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.bit_count / self.capacity * math.log(2)))
+        self.count = 0  # 추가된 (서로 다른) 키 수 추정
+        self.bits = bytearray((self.bit_count + 7) // 8)
+    
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        m = self.bit_count
+        return [(h1 + i * h2) % m for i in range(self.hash_count)]
+    
+    def add(self, key: bytes) -> bool:
+        """키 추가 (새로 켜진 비트가 있으면 True = 처음 보는 키)"""
+        changed = False
+        bits = self.bits
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                changed = True
+        if changed:
+            self.count += 1
+        return changed
+    
+    def might_contain(self, key: bytes) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+    
+    @property
+    def size_bytes(self) -> int:
+        """비트 배열 메모리 크기"""
+        return len(self.bits)
+    
+    @property
+    def fp_rate(self) -> float:
+        """현재 키 수 기준 추정 오탐률: (1 - e^(-kn/m))^k"""
+        k, n, m = self.hash_count, self.count, self.bit_count
+        return (1 - math.exp(-k * n / m)) ** k
+    
+    def to_bytes(self) -> bytes:
+        header = struct.pack('<8sQQIQ', BLOOM_MAGIC, self.capacity, self.bit_count, self.hash_count, self.count)
+        return header + bytes(self.bits)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BloomFilter':
+        magic, capacity, bit_count, hash_count, count = struct.unpack_from('<8sQQIQ', data)
+        if magic != BLOOM_MAGIC:
+            raise ValueError("Bloom filter 파일 형식이 아닙니다")
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.bit_count = bit_count
+        bloom.hash_count = hash_count
+        bloom.count = count
+        bloom.bits = bytearray(data[struct.calcsize('<8sQQIQ'):])
+        return bloom
+
+
+@dataclass
+class AppendStats:
+    """아카이브 추가 결과"""
+    added: int = 0  # 추가된 레코드 수
+    duplicates: int = 0  # 이미 있어 제외된 레코드 수
+    bloom_skipped: int = 0  # Bloom filter로 정확한 조회를 생략한 레코드 수
+    bloom_false_positives: int = 0  # Bloom filter 오탐 (조회 결과 실제로는 신규)
+
+
+def _bloom_key(ts: datetime, payload: bytes) -> bytes:
+    """Bloom filter 키: 6바이트 타임스탬프 + 정규화 레코드(_record_key) 다이제스트"""
+    ts_bytes = bytes([ts.year % 100, ts.month, ts.day, ts.hour, ts.minute, ts.second])
+    return ts_bytes + hashlib.blake2b(payload, digest_size=16).digest()
+
+
+@dataclass
+class SegmentInfo:
+    """세그먼트(Fault_* 이미지 1개) 메타데이터"""
+    file: str  # 아카이브 디렉토리 기준 파일명
+    record_count: int
+    used_bytes: int  # 레코드 데이터 영역 사용량
+    first_ts: Optional[datetime] = None  # 세그먼트 내 가장 오래된 타임스탬프
+    last_ts: Optional[datetime] = None  # 세그먼트 내 가장 최근 타임스탬프
+    
+    def overlaps(self, since: Optional[datetime], until: Optional[datetime]) -> bool:
+        """시간 범위와 겹치는지 확인 (타임스탬프 있는 레코드가 없으면 겹치지 않음)"""
+        if self.first_ts is None:
+            return False
+        if since is not None and self.last_ts < since:
+            return False
+        if until is not None and self.first_ts > until:
+            return False
+        return True
+    
+    def to_dict(self) -> dict:
+        return {
+            'file': self.file,
+            'record_count': self.record_count,
+            'used_bytes': self.used_bytes,
+            'first_ts': self.first_ts.isoformat() if self.first_ts else None,
+            'last_ts': self.last_ts.isoformat() if self.last_ts else None,
+        }
+    
+    @classmethod
+    def from_dict(cls, d: dict) -> 'SegmentInfo':
+        return cls(
+            file=d['file'],
+            record_count=d['record_count'],
+            used_bytes=d['used_bytes'],
+            first_ts=datetime.fromisoformat(d['first_ts']) if d.get('first_ts') else None,
+            last_ts=datetime.fromisoformat(d['last_ts']) if d.get('last_ts') else None,
+        )
+
+
+def _record_sort_key(record: Tuple[Optional[datetime], bytes]):
+    """타임스탬프 순 정렬 (타임스탬프 없는 레코드는 뒤로)"""
+    ts = record[0]
+    return (ts is None, ts or datetime.min)
+
+
+class SegmentedArchive:
+    """
+    사이트별 다중 세그먼트 오프라인 아카이브
+    
+    디렉토리 구조:
+        <archive_dir>/
+            manifest.json               세그먼트 목록 + 시간 범위
+            Fault_GT_<사이트>_0001.txt  세그먼트 (일반 Fault_* 이미지와 같은 형식)
+            Fault_GT_<사이트>_0002.txt
+            Fault_GT_<사이트>_0001.txt.idx  세그먼트 레코드 경계 인덱스
+            ...
+    
+    - 마지막 세그먼트만 열려 있고, 가득 차면 새 세그먼트로 넘어감
+      (기록 비용은 세그먼트 크기에 비례, 이전 세그먼트는 다시 쓰지 않음)
+    - 읽기/병합/조회는 manifest의 시간 범위로 필요 없는 세그먼트를 건너뜀
+    - bloom.bin: (타임스탬프, 정규화 레코드) Bloom filter - 확실한 신규 레코드는 세그먼트를 열지 않음
+    """
+    
+    def __init__(
+        self,
+        archive_dir: str,
+        site: str = 'GT',
+        site_id: str = 'Archive',
+        latest: Optional[LatestFaultsView] = None
+    ):
+        """
+        Args:
+            archive_dir: 아카이브 디렉토리 (없으면 생성)
+            site: 'GT' 또는 'WB' (기존 아카이브는 manifest 값 사용)
+            site_id: 사이트 ID (기존 아카이브는 manifest 값 사용)
+            latest: 사이트별 최근 고장 뷰 (지정 시 새로 추가된 레코드로 갱신)
+        """
+        self.archive_dir = archive_dir
+        self.converter = FDCNEOConverter()
+        self.site = self.converter.detect_site(site=site)
+        self.site_id = site_id
+        self.segments: List[SegmentInfo] = []
+        self._cache: Dict[str, List[Tuple[datetime, bytes]]] = {}
+        self._keys: Dict[str, Set[Tuple[datetime, bytes]]] = {}
+        self._bloom: Optional[BloomFilter] = None
+        self.latest = latest
+        
+        os.makedirs(archive_dir, exist_ok=True)
+        self._load_manifest()
+    
+    # =====================================================================
+    # 조회
+    # =====================================================================
+    
+    @property
+    def record_count(self) -> int:
+        return sum(seg.record_count for seg in self.segments)
+    
+    def select_segments(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[SegmentInfo]:
+        """시간 범위와 겹치는 세그먼트 (범위가 없으면 전체)"""
+        if since is None and until is None:
+            return list(self.segments)
+        return [seg for seg in self.segments if seg.overlaps(since, until)]
+    
+    def read(self, record_filter: Optional[RecordFilter] = None) -> List[Tuple[datetime, bytes]]:
+        """
+        아카이브 레코드 읽기 (시간 범위 밖 세그먼트는 열지 않음)
+        
+        Args:
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
+        
+        Returns:
+            (타임스탬프, 레코드 데이터) 리스트 (세그먼트 순서)
+        """
+        since = record_filter.since if record_filter else None
+        until = record_filter.until if record_filter else None
+        
+        records = []
+        for seg in self.select_segments(since, until):
+            if record_filter is None:
+                records.extend(self._load_segment(seg))
+            else:
+                with open(self._segment_path(seg), 'rb') as f:
+                    records.extend(self._extract_segment(seg, f.read(), record_filter))
+        return records
+    
+    # =====================================================================
+    # 기록
+    # =====================================================================
+    
+    def merge(
+        self,
+        data: BufferSource,
+        kind: Optional[str] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> ConversionResult:
+        """
+        온라인/오프라인 파일 내용을 아카이브에 병합
+        
+        Args:
+            data: 파일 내용 (bytes/memoryview/파일 객체)
+            kind: 'online' / 'offline' (없으면 자동 판별)
+            record_filter: 추출 필터
+        
+        Returns:
+            ConversionResult (output_file: 아카이브 디렉토리)
+        """
+        try:
+            scan = self.converter.scan_records(data, kind, record_filter)
+            stats = self.append(scan.records)
+            bloom = self.bloom
+            
+            result = ConversionResult(
+                success=True,
+                output_file=self.archive_dir,
+                record_count=self.record_count,
+                message=f"아카이브 병합 성공: {stats.added}개 레코드 추가 (세그먼트 {len(self.segments)}개)",
+                input_record_count=len(scan.records),
+                output_record_count=stats.added,
+                duplicate_count=stats.duplicates,
+                bloom_bytes=bloom.size_bytes,
+                bloom_fp_rate=bloom.fp_rate,
+                bloom_skipped=stats.bloom_skipped,
+                bloom_false_positives=stats.bloom_false_positives
+            )
+            return self.converter._add_scan_stats(result, scan)
+        
+        except Exception as e:
+            return ConversionResult(
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"아카이브 병합 실패: {str(e)}"
+            )
+    
+    def append(self, records: List[Tuple[datetime, bytes]]) -> AppendStats:
+        """
+        레코드 추가 (아카이브에 이미 있는 레코드는 제외)
+        
+        중복 규칙은 병합과 동일: 타임스탬프 + 데이터가 같으면 중복,
+        타임스탬프 없는 레코드는 중복 제거하지 않음
+        데이터는 온라인 형식으로 정규화해 비교하므로 (레코드 타입 바이트 제외)
+        온라인/오프라인 파일에서 온 같은 고장은 한 번만 기록
+        Bloom filter가 확실히 없다고 판정한 레코드는 세그먼트 조회를 생략
+        온라인 형식 레코드는 레코드 타입 바이트를 붙여 오프라인 형식으로 기록
+        
+        Returns:
+            AppendStats
+        """
+        stats = AppendStats()
+        bloom = self.bloom
+        new_records = []
+        seen: Set[Tuple[datetime, bytes]] = set()  # (타임스탬프, 정규화 레코드)
+        
+        for ts, data in records:
+            data = self.converter._to_offline_record(data)
+            if ts is not None:
+                key = self._record_key(ts, data)
+                if (ts, key) in seen:
+                    stats.duplicates += 1
+                    continue
+                if not bloom.might_contain(_bloom_key(ts, key)):
+                    stats.bloom_skipped += 1
+                elif self._contains(ts, key):
+                    stats.duplicates += 1
+                    continue
+                else:
+                    stats.bloom_false_positives += 1
+                seen.add((ts, key))
+            new_records.append((ts, data))
+        
+        stats.added = len(new_records)
+        if not new_records:
+            return stats
+        
+        # 열린(마지막) 세그먼트에 합쳐 다시 쓰고, 넘치면 새 세그먼트로
+        if self.segments:
+            open_seg = self.segments.pop()
+            pending = self._load_segment(open_seg) + new_records
+            next_index = len(self.segments) + 1
+        else:
+            pending = new_records
+            next_index = 1
+        pending.sort(key=_record_sort_key)
+        first_written = len(self.segments)
+        
+        capacity = offline_capacity(self.site)
+        chunk = []
+        used = 0
+        for record in pending:
+            if chunk and used + len(record[1]) > capacity:
+                self._write_segment(next_index, chunk)
+                next_index += 1
+                chunk = []
+                used = 0
+            chunk.append(record)
+            used += len(record[1])
+        if chunk:
+            self._write_segment(next_index, chunk)
+        
+        # 다시 기록한 세그먼트의 키를 Bloom filter에 반영 (용량 초과 시 재구성)
+        for seg in self.segments[first_written:]:
+            for ts, key in self._segment_keys(seg):
+                bloom.add(_bloom_key(ts, key))
+        if bloom.count > bloom.capacity:
+            self._bloom = self._build_bloom(bloom.capacity * 2)
+        
+        self._save_manifest()
+        self._save_bloom()
+        if self.latest is not None:
+            self.latest.update(self.site_id, new_records, self.site)
+        return stats
+    
+    @property
+    def bloom(self) -> BloomFilter:
+        """중복 사전 검사용 Bloom filter (bloom.bin이 없으면 세그먼트로 생성)"""
+        if self._bloom is None:
+            path = os.path.join(self.archive_dir, BLOOM_NAME)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    try:
+                        self._bloom = BloomFilter.from_bytes(f.read())
+                    except (ValueError, struct.error):
+                        # 이전 키 형식 / 손상된 파일
+                        self._bloom = None
+            if self._bloom is None:
+                self._bloom = self._build_bloom(self.record_count * 2)
+        return self._bloom
+    
+    # =====================================================================
+    # 내부 함수
+    # =====================================================================
+    
+    def _build_bloom(self, capacity: int) -> BloomFilter:
+        """전체 세그먼트 키로 Bloom filter 생성"""
+        bloom = BloomFilter(max(capacity, BLOOM_MIN_CAPACITY))
+        for seg in self.segments:
+            for ts, key in self._segment_keys(seg):
+                bloom.add(_bloom_key(ts, key))
+        return bloom
+    
+    def _save_bloom(self):
+        if self._bloom is not None:
+            _atomic_write(os.path.join(self.archive_dir, BLOOM_NAME), self._bloom.to_bytes())
+    
+    def _record_key(self, ts: datetime, data: bytes) -> bytes:
+        """
+        중복 판단용 정규화 레코드: 온라인 형식 ([07][마커][타임스탬프][데이터])
+        
+        같은 고장의 오프라인 사본(레코드 타입 바이트 포함)과 온라인 사본이 같은 키가 됨
+        """
+        return self.converter._to_online_record(ts, data) or data
+    
+    def _contains(self, ts: datetime, key: bytes) -> bool:
+        """같은 레코드(정규화 키)가 아카이브에 있는지 (시간 범위가 맞는 세그먼트만 확인)"""
+        for seg in self.segments:
+            if seg.first_ts is not None and seg.first_ts <= ts <= seg.last_ts:
+                if (ts, key) in self._segment_keys(seg):
+                    return True
+        return False
+    
+    def _segment_keys(self, seg: SegmentInfo) -> Set[Tuple[datetime, bytes]]:
+        """세그먼트의 (타임스탬프, 정규화 레코드) 집합"""
+        if seg.file not in self._keys:
+            self._keys[seg.file] = {
+                (ts, self._record_key(ts, data)) for ts, data in self._load_segment(seg) if ts is not None
+            }
+        return self._keys[seg.file]
+    
+    def _segment_path(self, seg: SegmentInfo) -> str:
+        return os.path.join(self.archive_dir, seg.file)
+    
+    def _segment_name(self, index: int) -> str:
+        prefix = get_format('offline', self.site).file_prefix
+        return f"{prefix}_{self.site_id}_{index:04d}.txt"
+    
+    def _load_segment(self, seg: SegmentInfo) -> List[Tuple[datetime, bytes]]:
+        if seg.file not in self._cache:
+            with open(self._segment_path(seg), 'rb') as f:
+                self._cache[seg.file] = self._extract_segment(seg, f.read())
+        return list(self._cache[seg.file])
+    
+    def _write_segment(self, index: int, records: List[Tuple[datetime, bytes]]):
+        """세그먼트 이미지 기록 (임시 파일 → rename) 후 목록에 추가"""
+        name = self._segment_name(index)
+        image = self.converter._build_offline_data(records, is_gt=self.site == 'GT')
+        _atomic_write(os.path.join(self.archive_dir, name), image)
+        
+        starts = array('I', [get_format('offline', self.site).record_start])
+        for _, data in records:
+            starts.append(starts[-1] + len(data))
+        used_bytes = starts[-1] - starts[0]
+        _atomic_write(
+            os.path.join(self.archive_dir, name + SEGMENT_INDEX_EXT),
+            _SEGMENT_INDEX_HEADER.pack(SEGMENT_INDEX_MAGIC, len(records), used_bytes) + starts.tobytes()
+        )
+        
+        timestamps = [ts for ts, _ in records if ts is not None]
+        seg = SegmentInfo(
+            file=name,
+            record_count=len(records),
+            used_bytes=used_bytes,
+            first_ts=min(timestamps) if timestamps else None,
+            last_ts=max(timestamps) if timestamps else None,
+        )
+        self.segments.append(seg)
+        # 중복 판단은 실제 이미지에서 다시 추출한 결과 기준
+        self._cache[name] = self._extract_segment(seg, image)
+        self._keys.pop(name, None)
+    
+    def _extract_segment(
+        self,
+        seg: SegmentInfo,
+        image: bytes,
+        record_filter: Optional[RecordFilter] = None
+    ) -> List[Tuple[datetime, bytes]]:
+        """
+        세그먼트 레코드 추출 (경계 인덱스 기준)
+        
+        인덱스가 없거나 manifest와 맞지 않으면 (이전 버전 아카이브, 기록 중 중단) 이미지를 스캔
+        """
+        starts = self._read_segment_index(seg)
+        if starts is None:
+            return self.converter.extract_records(image, 'offline', record_filter)
+        result = ScanResult()
+        self.converter._extract_range(image, starts, len(starts) - 1, True, record_filter, False, result)
+        return result.records
+    
+    def _read_segment_index(self, seg: SegmentInfo) -> Optional[array]:
+        try:
+            with open(self._segment_path(seg) + SEGMENT_INDEX_EXT, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < _SEGMENT_INDEX_HEADER.size:
+            return None
+        magic, count, used_bytes = _SEGMENT_INDEX_HEADER.unpack_from(data, 0)
+        if magic != SEGMENT_INDEX_MAGIC or count != seg.record_count or used_bytes != seg.used_bytes:
+            return None
+        starts = array('I')
+        starts.frombytes(data[_SEGMENT_INDEX_HEADER.size:_SEGMENT_INDEX_HEADER.size + 4 * (count + 1)])
+        return starts if len(starts) == count + 1 else None
+    
+    def _load_manifest(self):
+        path = os.path.join(self.archive_dir, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        self.site = manifest['site']
+        self.site_id = manifest['site_id']
+        self.segments = [SegmentInfo.from_dict(d) for d in manifest['segments']]
+    
+    def _save_manifest(self):
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'site': self.site,
+            'site_id': self.site_id,
+            'segments': [seg.to_dict() for seg in self.segments],
+        }
+        _atomic_write(
+            os.path.join(self.archive_dir, MANIFEST_NAME),
+            json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+        )
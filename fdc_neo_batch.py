@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Batch
+여러 온라인/오프라인 파일을 사이트별로 묶어 병렬 병합
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from fdc_neo_converter import FDCNEOConverter, ConversionResult, get_format, parse_site_id, _atomic_write
+from fdc_neo_latest import LatestFaultsView
+from fdc_neo_reader import prefetch_files
+
+
+# 사이트 ID를 알 수 없는 파일의 그룹 키
+UNKNOWN_SITE = 'UNKNOWN'
+
+# 재시작 가능한 일괄 작업의 기본 저널 파일명 (출력 디렉토리 안)
+JOURNAL_NAME = 'batch_journal.jsonl'
+
+
+@dataclass
+class SiteGroup:
+    """사이트별 입력 파일 묶음"""
+    site_id: str
+    online: List[Tuple[str, bytes]] = field(default_factory=list)  # (파일명, 내용)
+    offline: List[Tuple[str, bytes]] = field(default_factory=list)  # (파일명, 내용)
+    
+    @property
+    def filenames(self) -> List[str]:
+        return [name for name, _ in self.offline + self.online]
+
+
+@dataclass
+class FileStatus:
+    """파일별 처리 상태 (진행 현황 표 한 행)"""
+    filename: str
+    site_id: str
+    kind: str  # 'online' / 'offline'
+    status: str = '대기'  # 대기 / 완료 / 실패 / 건너뜀
+    record_count: int = 0  # 파일에서 추출한 레코드 수
+    duplicate_count: int = 0  # 이 파일 병합 시 제거된 중복 수
+    sha256: str = ''  # 입력 파일 내용 해시
+
+
+@dataclass
+class SiteMergeResult:
+    """사이트 단위 병합 결과"""
+    site_id: str
+    result: ConversionResult  # output_file: 출력 경로 (output_data는 비어 있음)
+    files: List[FileStatus] = field(default_factory=list)
+
+
+def group_by_site(files: Iterable[Tuple[str, bytes]]) -> Dict[str, SiteGroup]:
+    """
+    파일을 사이트 ID별로 분류 (형식은 내용으로 자동 판별)
+    
+    Args:
+        files: (파일명, 내용) 목록
+    
+    Returns:
+        사이트 ID → SiteGroup (온라인 파일은 파일명 순 = 스냅샷 시각 순)
+    """
+    converter = FDCNEOConverter()
+    groups: Dict[str, SiteGroup] = {}
+    
+    for name, data in files:
+        site_id = parse_site_id(name) or UNKNOWN_SITE
+        group = groups.setdefault(site_id, SiteGroup(site_id))
+        if converter.detect_format(data) == 'online':
+            group.online.append((name, data))
+        else:
+            group.offline.append((name, data))
+    
+    # 경로가 섞여 있어도 파일명 순으로 정렬
+    for group in groups.values():
+        group.online.sort(key=lambda f: os.path.basename(f[0]))
+        group.offline.sort(key=lambda f: os.path.basename(f[0]))
+    
+    return groups
+
+
+def merge_site_group(
+    group: SiteGroup,
+    output_format: str,
+    output_dir: str,
+    latest_dir: Optional[str] = None
+) -> SiteMergeResult:
+    """
+    한 사이트의 모든 파일을 병합하여 output_dir에 저장
+    
+    오프라인 파일을 먼저 누적한 뒤 온라인 스냅샷을 시각 순으로 병합하므로
+    연속된 스냅샷 간에 겹치는 레코드도 중복 제거됨
+    (작업 프로세스에서 실행되도록 모듈 최상위 함수로 정의)
+    
+    Args:
+        group: 사이트 파일 묶음
+        output_format: 'online' 또는 'offline'
+        output_dir: 출력 디렉토리
+        latest_dir: 사이트별 최근 고장 뷰 디렉토리 (지정 시 병합 결과로 갱신, UNKNOWN 묶음 제외)
+    
+    Returns:
+        SiteMergeResult
+    """
+    # 병합·중복 제거된 레코드로 최근 고장 뷰 갱신 (사이트를 알 수 없는 묶음은 뷰를 만들지 않음)
+    latest = LatestFaultsView(latest_dir) if latest_dir and group.site_id != UNKNOWN_SITE else None
+    converter = FDCNEOConverter(latest=latest)
+    statuses = []
+    
+    try:
+        sources = [(name, data, 'offline') for name, data in group.offline] + \
+                  [(name, data, 'online') for name, data in group.online]
+        extracted = []
+        for name, data, kind in sources:
+            records = converter.extract_records(data, kind)
+            extracted.append(records)
+            statuses.append(FileStatus(
+                name, group.site_id, kind, record_count=len(records),
+                sha256=hashlib.sha256(data).hexdigest()
+            ))
+        
+        # 마지막 파일 이전까지 누적 병합 (파일별 중복 수 집계)
+        merged = []
+        for status, records in zip(statuses[:-1], extracted[:-1]):
+            before = len(records) + len(merged)
+            merged = converter._merge_and_deduplicate(records, merged)
+            status.duplicate_count = before - len(merged)
+            status.status = '완료'
+        
+        # 마지막 파일과 병합하면서 출력 생성
+        site = converter.detect_site(
+            group.offline[0][1] if group.offline else b'', *group.filenames
+        )
+        result = converter.merge_records(
+            extracted[-1], merged, output_format=output_format, site=site, site_id=group.site_id
+        )
+        statuses[-1].duplicate_count = result.duplicate_count
+        statuses[-1].status = '완료'
+        
+        # 누적 통계로 보정
+        result.input_record_count = sum(s.record_count for s in statuses)
+        result.duplicate_count = sum(s.duplicate_count for s in statuses)
+        result.online_record_count = sum(s.record_count for s in statuses if s.kind == 'online')
+        result.offline_record_count = sum(s.record_count for s in statuses if s.kind == 'offline')
+        
+        # 출력 파일명: 사이트 ID 포함
+        timestamp = datetime.now().strftime('%y%m%d_%H%M%S')
+        if output_format == 'offline':
+            output_name = f"{get_format('offline', site).file_prefix}_{group.site_id}.txt"
+        else:
+            output_name = f"{site}_MERGED_{group.site_id}_{timestamp}.txt"
+        
+        output_path = os.path.join(output_dir, output_name)
+        _atomic_write(output_path, result.output_data)
+        result.output_file = output_path
+        result.output_data = b''
+        
+        return SiteMergeResult(group.site_id, result, statuses)
+        
+    except Exception as e:
+        for status in statuses:
+            status.status = '실패'
+        return SiteMergeResult(
+            group.site_id,
+            ConversionResult(
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"병합 실패: {str(e)}"
+            ),
+            statuses
+        )
+
+
+def merge_site_files(
+    site_id: str,
+    paths: List[str],
+    output_format: str,
+    output_dir: str,
+    latest_dir: Optional[str] = None
+) -> SiteMergeResult:
+    """
+    경로 목록을 읽어 한 사이트 병합 (작업 프로세스에서 파일을 동시에 미리 읽음)
+    
+    읽기 실패도 실패 결과로 반환하므로 손상된 파일 하나가 전체 작업을 멈추지 않음
+    """
+    try:
+        files = []
+        for item in prefetch_files(paths):
+            if not item.ok:
+                raise OSError(item.error)
+            files.append((item.path, item.data))
+        group = group_by_site(files).get(site_id) or SiteGroup(site_id)
+        return merge_site_group(group, output_format, output_dir, latest_dir)
+    
+    except Exception as e:
+        return SiteMergeResult(
+            site_id,
+            ConversionResult(
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"병합 실패: {str(e)}"
+            )
+        )
+
+
+def run_batch_merge(
+    groups: Iterable[SiteGroup],
+    output_format: str,
+    output_dir: str,
+    max_workers: Optional[int] = None,
+    latest_dir: Optional[str] = None
+) -> Iterator[SiteMergeResult]:
+    """
+    사이트별 병합을 작업 프로세스 풀에서 병렬 실행
+    
+    Args:
+        groups: 사이트 파일 묶음 목록
+        output_format: 'online' 또는 'offline'
+        output_dir: 출력 디렉토리
+        max_workers: 작업 프로세스 수 (없으면 CPU 수)
+        latest_dir: 사이트별 최근 고장 뷰 디렉토리 (지정 시 사이트마다 갱신)
+    
+    Yields:
+        완료되는 순서대로 SiteMergeResult
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(merge_site_group, group, output_format, output_dir, latest_dir)
+            for group in groups
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def write_zip(outputs: Iterable[str], fileobj: BinaryIO) -> int:
+    """
+    출력 파일들을 zip으로 스트리밍 기록 (파일 단위로 디스크에서 복사, 전체를 메모리에 올리지 않음)
+    
+    Args:
+        outputs: 출력 파일 경로 목록
+        fileobj: 기록할 바이너리 스트림
+    
+    Returns:
+        압축한 파일 수
+    """
+    count = 0
+    with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for path in outputs:
+            zf.write(path, arcname=os.path.basename(path))
+            count += 1
+    return count
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BatchJournal:
+    """
+    일괄 병합 체크포인트 저널 (JSON Lines, 추가 기록 전용)
+    
+    사이트 1개 처리가 끝날 때마다 입력 파일(경로, 크기, 수정 시각, 해시), 출력 경로, 통계를
+    한 줄씩 기록하고 fsync. 기록 도중 중단되어 잘린 마지막 줄은 읽을 때 무시
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        # (사이트 ID, 출력 형식) → 가장 최근 항목
+        self.entries: Dict[Tuple[str, str], dict] = {}
+        
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.entries[(entry['site_id'], entry['output_format'])] = entry
+    
+    def completed(self, site_id: str, output_format: str, paths: List[str]) -> Optional[dict]:
+        """
+        이전 실행에서 같은 입력으로 성공한 항목 (없으면 None)
+        
+        입력 파일 목록이 같고, 각 파일의 크기/수정 시각(바뀌었으면 해시)이 같고,
+        출력 파일이 남아 있어야 완료로 판정
+        """
+        entry = self.entries.get((site_id, output_format))
+        if entry is None or not entry['success'] or not os.path.exists(entry['output']):
+            return None
+        
+        inputs = {item['path']: item for item in entry['inputs']}
+        if set(inputs) != set(paths):
+            return None
+        for path in paths:
+            item = inputs[path]
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            if st.st_size != item['size']:
+                return None
+            if st.st_mtime_ns != item['mtime_ns'] and _file_sha256(path) != item['sha256']:
+                return None
+        return entry
+    
+    def record(self, site_result: SiteMergeResult, output_format: str, paths: List[str]) -> dict:
+        """사이트 처리 결과 1건을 저널에 추가"""
+        result = site_result.result
+        statuses = {status.filename: status for status in site_result.files}
+        inputs = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                size, mtime_ns = st.st_size, st.st_mtime_ns
+            except OSError:
+                size, mtime_ns = -1, 0
+            status = statuses.get(path, FileStatus(path, site_result.site_id, ''))
+            inputs.append({
+                'path': path,
+                'size': size,
+                'mtime_ns': mtime_ns,
+                'sha256': status.sha256,
+                'kind': status.kind,
+                'record_count': status.record_count,
+                'duplicate_count': status.duplicate_count
+            })
+        
+        entry = {
+            'site_id': site_result.site_id,
+            'output_format': output_format,
+            'success': result.success,
+            'output': result.output_file,
+            'message': result.message,
+            'finished_at': datetime.now().isoformat(),
+            'stats': {
+                'record_count': result.record_count,
+                'input_record_count': result.input_record_count,
+                'output_record_count': result.output_record_count,
+                'duplicate_count': result.duplicate_count,
+                'online_record_count': result.online_record_count,
+                'offline_record_count': result.offline_record_count,
+                'truncated_count': result.truncated_count
+            },
+            'inputs': inputs
+        }
+        
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries[(entry['site_id'], output_format)] = entry
+        return entry
+
+
+def _skipped_result(entry: dict) -> SiteMergeResult:
+    """저널 항목으로 건너뛴 사이트의 결과 구성"""
+    result = ConversionResult(
+        success=True,
+        output_file=entry['output'],
+        message=f"이전 실행에서 완료됨 (건너뜀): {entry['message']}",
+        **entry['stats']
+    )
+    files = [
+        FileStatus(
+            item['path'], entry['site_id'], item['kind'], '건너뜀',
+            item['record_count'], item['duplicate_count'], item['sha256']
+        )
+        for item in entry['inputs']
+    ]
+    return SiteMergeResult(entry['site_id'], result, files)
+
+
+def run_resumable_batch(
+    paths: Iterable[str],
+    output_format: str,
+    output_dir: str,
+    journal_path: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    latest_dir: Optional[str] = None
+) -> Iterator[SiteMergeResult]:
+    """
+    재시작 가능한 일괄 병합 (경로 기반)
+    
+    완료된 사이트는 저널에 기록되므로, 중단 후 같은 인자로 다시 실행하면
+    입력이 바뀌지 않은 사이트는 건너뛰고 남은(또는 실패한) 사이트만 처리
+    
+    Args:
+        paths: 입력 파일 경로 목록
+        output_format: 'online' 또는 'offline'
+        output_dir: 출력 디렉토리
+        journal_path: 저널 경로 (없으면 output_dir/batch_journal.jsonl)
+        max_workers: 작업 프로세스 수 (없으면 CPU 수)
+        latest_dir: 사이트별 최근 고장 뷰 디렉토리 (지정 시 처리한 사이트마다 갱신)
+    
+    Yields:
+        SiteMergeResult (건너뛴 사이트는 파일 상태 '건너뜀')
+    """
+    journal = BatchJournal(journal_path or os.path.join(output_dir, JOURNAL_NAME))
+    
+    by_site: Dict[str, List[str]] = {}
+    for path in paths:
+        path = os.path.abspath(path)
+        by_site.setdefault(parse_site_id(path) or UNKNOWN_SITE, []).append(path)
+    
+    pending = {}
+    for site_id, site_paths in sorted(by_site.items()):
+        entry = journal.completed(site_id, output_format, site_paths)
+        if entry is not None:
+            yield _skipped_result(entry)
+        else:
+            pending[site_id] = site_paths
+    
+    if not pending:
+        return
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(merge_site_files, site_id, site_paths, output_format, output_dir, latest_dir): site_id
+            for site_id, site_paths in pending.items()
+        }
+        for future in as_completed(futures):
+            site_id = futures[future]
+            try:
+                site_result = future.result()
+            except Exception as e:
+                # 작업 프로세스 비정상 종료 등
+                site_result = SiteMergeResult(
+                    site_id,
+                    ConversionResult(
+                        success=False,
+                        output_file="",
+                        record_count=0,
+                        message=f"병합 실패: {str(e)}"
+                    )
+                )
+            journal.record(site_result, output_format, pending[site_id])
+            yield site_result
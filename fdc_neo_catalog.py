@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Catalog
+디렉토리 트리의 Fault_* / GT_* / WB_* 파일 메타데이터를 SQLite에 저장하고 사이트별로 조회
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from fdc_neo_converter import FDCNEOConverter, parse_site_id
+
+
+# 카탈로그 대상 파일명 접두사
+CATALOG_PREFIXES = ('Fault_', 'GT_', 'WB_')
+
+# Streamlit 앱이 일괄 병합 파일 선택에 사용할 카탈로그 DB 경로
+ENV_DB = 'FDC_NEO_CATALOG_DB'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    site_id TEXT NOT NULL,
+    site TEXT NOT NULL,
+    format TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    record_count INTEGER NOT NULL,
+    min_ts TEXT,
+    max_ts TEXT,
+    markers TEXT NOT NULL,
+    scanned_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_site ON files(site_id);
+
+CREATE TABLE IF NOT EXISTS sites (
+    site_id TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    file_count INTEGER NOT NULL,
+    record_count INTEGER NOT NULL,
+    min_ts TEXT,
+    max_ts TEXT,
+    markers TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sites_max_ts ON sites(max_ts);
+"""
+
+# 스키마 버전 (PRAGMA user_version)
+# 1: min_ts/max_ts를 항상 마이크로초까지 기록 (문자열 대소 비교 = 시각 비교)
+SCHEMA_VERSION = 1
+
+
+@dataclass
+class FileEntry:
+    """파일 1개의 카탈로그 항목"""
+    path: str
+    site_id: str
+    site: str  # 'GT' / 'WB'
+    format: str  # 'online' / 'offline'
+    size: int
+    mtime_ns: int
+    content_hash: str  # SHA-256
+    record_count: int
+    min_ts: Optional[datetime] = None
+    max_ts: Optional[datetime] = None
+    markers: Dict[str, int] = field(default_factory=dict)  # 마커 히스토그램 (예: {'E9': 120})
+
+
+@dataclass
+class SiteSummary:
+    """사이트별 요약 통계"""
+    site_id: str
+    site: str
+    file_count: int
+    record_count: int
+    min_ts: Optional[datetime] = None
+    max_ts: Optional[datetime] = None
+    markers: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class RefreshStats:
+    """카탈로그 갱신 결과"""
+    scanned: int = 0  # 새로 스캔한 파일 수
+    unchanged: int = 0  # 크기/수정 시각이 같아 건너뛴 파일 수
+    touched: int = 0  # 수정 시각만 바뀌고 내용(해시)은 같은 파일 수
+    removed: int = 0  # 디렉토리에서 사라져 삭제한 항목 수
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (경로, 오류 메시지)
+
+
+def scan_file(path: str, known_hash: Optional[str] = None) -> Optional[FileEntry]:
+    """
+    파일 1개 스캔 (기존 추출 함수 사용)
+    
+    작업 프로세스에서 실행되도록 모듈 최상위 함수로 정의
+    
+    Args:
+        path: 파일 경로
+        known_hash: 카탈로그에 저장된 내용 해시 (같으면 파싱하지 않음)
+    
+    Returns:
+        FileEntry (내용 해시가 known_hash와 같으면 None)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    content_hash = hashlib.sha256(data).hexdigest()
+    if content_hash == known_hash:
+        return None
+    
+    converter = FDCNEOConverter()
+    st = os.stat(path)
+    
+    kind = converter.detect_format(data)
+    records = converter.extract_records(data, kind)
+    
+    # 마커 위치: 온라인 [07][마커]..., 오프라인 [레코드타입][07][마커]...
+    marker_index = 1 if kind == 'online' else 2
+    markers = Counter(
+        f"{record[marker_index]:02X}" for _, record in records if len(record) > marker_index
+    )
+    timestamps = [ts for ts, _ in records if ts is not None]
+    
+    return FileEntry(
+        path=path,
+        site_id=parse_site_id(path) or 'UNKNOWN',
+        site=converter.detect_site(data if kind == 'offline' else b'', path),
+        format=kind,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        content_hash=content_hash,
+        record_count=len(records),
+        min_ts=min(timestamps) if timestamps else None,
+        max_ts=max(timestamps) if timestamps else None,
+        markers=dict(markers)
+    )
+
+
+def _iter_catalog_files(root: str) -> Iterator[os.DirEntry]:
+    """디렉토리 트리에서 카탈로그 대상 파일 찾기"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and entry.name.startswith(CATALOG_PREFIXES):
+                    yield entry
+
+
+def _ts_text(ts: Optional[datetime]) -> Optional[str]:
+    """SQL 비교용 시각 문자열 (마이크로초가 0이어도 생략하지 않아 길이가 항상 같음)"""
+    return ts.isoformat(timespec='microseconds') if ts is not None else None
+
+
+def _ts_value(text: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(text) if text else None
+
+
+class SiteCatalog:
+    """
+    사이트 카탈로그 (SQLite)
+    
+    - refresh(): 디렉토리 트리를 병렬 스캔 (변경된 파일만 다시 스캔)
+    - 조회는 DB만 사용하므로 원본 파일을 열지 않음
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _migrate(self):
+        """이전 스키마 버전의 카탈로그를 현재 형식으로 변환"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        # 0: isoformat() 기본 형식 (마이크로초가 0이면 생략되어 문자열 비교가 어긋남)
+        for table, key in (('files', 'path'), ('sites', 'site_id')):
+            rows = self.conn.execute(f"SELECT {key}, min_ts, max_ts FROM {table}").fetchall()
+            self.conn.executemany(
+                f"UPDATE {table} SET min_ts = ?, max_ts = ? WHERE {key} = ?",
+                [
+                    (_ts_text(_ts_value(min_ts)), _ts_text(_ts_value(max_ts)), row_key)
+                    for row_key, min_ts, max_ts in rows
+                ]
+            )
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+    
+    # =====================================================================
+    # 갱신
+    # =====================================================================
+    
+    def refresh(self, root: str, max_workers: Optional[int] = None) -> RefreshStats:
+        """
+        디렉토리 트리 스캔 후 카탈로그 갱신
+        
+        크기와 수정 시각(ns)이 저장된 값과 같은 파일은 다시 스캔하지 않고,
+        바뀐 파일도 내용 해시가 같으면 파싱하지 않음 (크기/수정 시각만 갱신)
+        
+        Args:
+            root: 스캔할 최상위 디렉토리
+            max_workers: 작업 프로세스 수 (없으면 CPU 수)
+        
+        Returns:
+            RefreshStats
+        """
+        stats = RefreshStats()
+        known = {
+            path: (size, mtime_ns, content_hash, site_id)
+            for path, size, mtime_ns, content_hash, site_id in self.conn.execute(
+                "SELECT path, size, mtime_ns, content_hash, site_id FROM files"
+            )
+        }
+        changed_sites = set()
+        
+        root_prefix = os.path.join(os.path.abspath(root), '')
+        seen = set()
+        to_scan: Dict[str, os.stat_result] = {}
+        for entry in _iter_catalog_files(root):
+            path = os.path.abspath(entry.path)
+            seen.add(path)
+            st = entry.stat()
+            previous = known.get(path)
+            if previous is not None and previous[0] == st.st_size and previous[1] == st.st_mtime_ns:
+                stats.unchanged += 1
+            else:
+                to_scan[path] = st
+        
+        # 병렬 스캔 (기존 항목은 해시부터 비교)
+        if to_scan:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    path: executor.submit(scan_file, path, known[path][2] if path in known else None)
+                    for path in to_scan
+                }
+                for path, future in futures.items():
+                    try:
+                        entry = future.result()
+                    except Exception as e:
+                        stats.failed.append((path, str(e)))
+                        continue
+                    if entry is None:
+                        # 수정 시각만 바뀌고 내용은 같음: 파싱 결과는 그대로 두고 크기/수정 시각만 갱신
+                        # (해시 전에 얻은 값이므로 그 사이 다시 바뀌었으면 다음 갱신에서 다시 비교)
+                        stats.touched += 1
+                        st = to_scan[path]
+                        self.conn.execute(
+                            "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                            (st.st_size, st.st_mtime_ns, path)
+                        )
+                        continue
+                    previous = known.get(path)
+                    stats.scanned += 1
+                    changed_sites.add(entry.site_id)
+                    if previous is not None:
+                        changed_sites.add(previous[3])
+                    self._upsert_file(entry)
+        
+        # root 아래에서 사라진 파일 제거
+        removed = [
+            path for path in known
+            if path.startswith(root_prefix) and path not in seen
+        ]
+        self.conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+        stats.removed = len(removed)
+        changed_sites.update(known[p][3] for p in removed)
+        
+        self._rebuild_sites(changed_sites)
+        self.conn.commit()
+        return stats
+    
+    def _upsert_file(self, entry: FileEntry):
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO files
+            (path, site_id, site, format, size, mtime_ns, content_hash,
+             record_count, min_ts, max_ts, markers, scanned_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                entry.path, entry.site_id, entry.site, entry.format, entry.size, entry.mtime_ns,
+                entry.content_hash, entry.record_count, _ts_text(entry.min_ts), _ts_text(entry.max_ts),
+                json.dumps(entry.markers, sort_keys=True), datetime.now().isoformat()
+            )
+        )
+    
+    def _rebuild_sites(self, site_ids):
+        """변경된 사이트만 파일 항목으로 요약 다시 계산"""
+        summaries: Dict[str, SiteSummary] = {}
+        for site_id in site_ids:
+            self.conn.execute("DELETE FROM sites WHERE site_id = ?", (site_id,))
+            for entry in self.files(site_id):
+                summary = summaries.get(entry.site_id)
+                if summary is None:
+                    summary = summaries[entry.site_id] = SiteSummary(entry.site_id, entry.site, 0, 0)
+                self._accumulate(summary, entry)
+        
+        self.conn.executemany(
+            "INSERT INTO sites VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (s.site_id, s.site, s.file_count, s.record_count,
+                 _ts_text(s.min_ts), _ts_text(s.max_ts), json.dumps(s.markers, sort_keys=True))
+                for s in summaries.values()
+            ]
+        )
+    
+    def _accumulate(self, summary: SiteSummary, entry: FileEntry):
+        """파일 항목을 사이트 요약에 합산"""
+        summary.file_count += 1
+        summary.record_count += entry.record_count
+        if entry.min_ts is not None and (summary.min_ts is None or entry.min_ts < summary.min_ts):
+            summary.min_ts = entry.min_ts
+        if entry.max_ts is not None and (summary.max_ts is None or entry.max_ts > summary.max_ts):
+            summary.max_ts = entry.max_ts
+        for marker, count in entry.markers.items():
+            summary.markers[marker] = summary.markers.get(marker, 0) + count
+    
+    # =====================================================================
+    # 조회
+    # =====================================================================
+    
+    def sites(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[SiteSummary]:
+        """
+        사이트 요약 목록 (최근 고장 순)
+        
+        Args:
+            since: 지정 시 이 시각 이후 고장 레코드가 있는 사이트만
+                   (예: datetime.now() - timedelta(hours=24))
+            until: 지정 시 이 시각 이전 고장 레코드가 있는 사이트만
+        """
+        query = "SELECT site_id, site, file_count, record_count, min_ts, max_ts, markers FROM sites"
+        where, params = self._range_clause(since, until)
+        query += where + " ORDER BY max_ts DESC"
+        return [self._site_row(row) for row in self.conn.execute(query, params)]
+    
+    def site(self, site_id: str) -> Optional[SiteSummary]:
+        """사이트 1개 요약"""
+        row = self.conn.execute(
+            "SELECT site_id, site, file_count, record_count, min_ts, max_ts, markers FROM sites WHERE site_id = ?",
+            (site_id,)
+        ).fetchone()
+        return self._site_row(row) if row else None
+    
+    def files(
+        self,
+        site_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[FileEntry]:
+        """
+        파일 항목 목록
+        
+        Args:
+            site_id: 지정 시 해당 사이트만
+            since / until: 지정 시 레코드 시간 범위가 [since, until]과 겹치는 파일만
+        """
+        query = """
+            SELECT path, site_id, site, format, size, mtime_ns, content_hash,
+                   record_count, min_ts, max_ts, markers
+            FROM files
+        """
+        where, params = self._range_clause(since, until)
+        if site_id is not None:
+            where += (" AND" if where else " WHERE") + " site_id = ?"
+            params += (site_id,)
+        query += where + " ORDER BY path"
+        return [
+            FileEntry(
+                path=row[0], site_id=row[1], site=row[2], format=row[3], size=row[4],
+                mtime_ns=row[5], content_hash=row[6], record_count=row[7],
+                min_ts=_ts_value(row[8]), max_ts=_ts_value(row[9]), markers=json.loads(row[10])
+            )
+            for row in self.conn.execute(query, params)
+        ]
+    
+    @staticmethod
+    def _range_clause(since: Optional[datetime], until: Optional[datetime]) -> Tuple[str, tuple]:
+        """시간 범위 조건 (레코드 시간 범위 [min_ts, max_ts]가 [since, until]과 겹침)"""
+        conditions = []
+        params: tuple = ()
+        if since is not None:
+            conditions.append("max_ts >= ?")
+            params += (_ts_text(since),)
+        if until is not None:
+            conditions.append("min_ts <= ?")
+            params += (_ts_text(until),)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+    
+    def _site_row(self, row) -> SiteSummary:
+        return SiteSummary(
+            site_id=row[0], site=row[1], file_count=row[2], record_count=row[3],
+            min_ts=_ts_value(row[4]), max_ts=_ts_value(row[5]), markers=json.loads(row[6])
+        )
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Container
+Fault_* 이미지 / 온라인 파일을 블록 단위 압축 컨테이너(.fdcz)로 보관하고 원본을 그대로 복원
+"""
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+
+from fdc_neo_converter import (
+    FDCNEOConverter,
+    ConversionResult,
+    RecordFilter,
+    BufferSource,
+    marker_pattern,
+    registered_formats,
+    _unpack_timestamp,
+)
+
+
+# 컨테이너 구조: [매직 4B][버전 2B][인덱스 길이 4B][인덱스 JSON][압축 블록들...]
+CONTAINER_MAGIC = b'FDCZ'
+CONTAINER_VERSION = 1
+CONTAINER_EXT = '.fdcz'
+_HEADER = struct.Struct('<4sHI')
+
+# 블록 1개에 담을 레코드 수 (블록마다 독립적으로 압축 해제 가능)
+BLOCK_RECORDS = 256
+COMPRESSION_LEVEL = 6
+
+# 파일 끝 레코드는 최대 100바이트까지 (스캐너 레코드 경계와 동일)
+_LAST_RECORD_MAX = 100
+
+
+@dataclass
+class BlockInfo:
+    """압축 블록 1개 메타데이터 (시간 범위 인덱스)"""
+    offset: int  # 블록 데이터 영역 기준 오프셋
+    length: int  # 압축된 길이
+    raw_size: int  # 압축 해제 후 길이
+    record_count: int = 0
+    first_ts: Optional[datetime] = None  # 블록 내 가장 오래된 타임스탬프
+    last_ts: Optional[datetime] = None  # 블록 내 가장 최근 타임스탬프
+    
+    def overlaps(self, since: Optional[datetime], until: Optional[datetime]) -> bool:
+        """시간 범위와 겹치는지 확인 (타임스탬프 있는 레코드가 없으면 겹치지 않음)"""
+        if self.first_ts is None:
+            return False
+        if since is not None and self.last_ts < since:
+            return False
+        if until is not None and self.first_ts > until:
+            return False
+        return True
+    
+    def to_dict(self) -> dict:
+        return {
+            'offset': self.offset,
+            'length': self.length,
+            'raw_size': self.raw_size,
+            'record_count': self.record_count,
+            'first_ts': self.first_ts.isoformat() if self.first_ts else None,
+            'last_ts': self.last_ts.isoformat() if self.last_ts else None,
+        }
+    
+    @classmethod
+    def from_dict(cls, d: dict) -> 'BlockInfo':
+        return cls(
+            offset=d['offset'],
+            length=d['length'],
+            raw_size=d['raw_size'],
+            record_count=d.get('record_count', 0),
+            first_ts=datetime.fromisoformat(d['first_ts']) if d.get('first_ts') else None,
+            last_ts=datetime.fromisoformat(d['last_ts']) if d.get('last_ts') else None,
+        )
+
+
+@dataclass
+class ContainerIndex:
+    """컨테이너 인덱스 (원본 복원 정보 + 블록 목록)"""
+    kind: str  # 'online' / 'offline'
+    site: str  # 'GT' / 'WB'
+    filename: str  # 원본 파일명
+    sha256: str  # 원본 파일 해시 (복원 검증용)
+    encoding: str  # 'binary' (오프라인) / 'hex' (온라인 Hex-String, 대문자) / 'raw' (원문 그대로)
+    suffix: bytes = b''  # Hex-String 뒤 문자 (개행 등)
+    header: Optional[BlockInfo] = None  # 첫 레코드 앞 영역 (ConfigDone 헤더 / 파일 타임스탬프 + 헤더)
+    blocks: List[BlockInfo] = field(default_factory=list)
+    tail_zeros: int = 0  # 레코드 영역 뒤 0 패딩 길이 (저장하지 않음)
+    
+    def to_dict(self) -> dict:
+        return {
+            'kind': self.kind,
+            'site': self.site,
+            'filename': self.filename,
+            'sha256': self.sha256,
+            'encoding': self.encoding,
+            'suffix': self.suffix.hex(),
+            'header': self.header.to_dict() if self.header else None,
+            'blocks': [block.to_dict() for block in self.blocks],
+            'tail_zeros': self.tail_zeros,
+        }
+    
+    @classmethod
+    def from_dict(cls, d: dict) -> 'ContainerIndex':
+        return cls(
+            kind=d['kind'],
+            site=d['site'],
+            filename=d['filename'],
+            sha256=d['sha256'],
+            encoding=d['encoding'],
+            suffix=bytes.fromhex(d.get('suffix', '')),
+            header=BlockInfo.from_dict(d['header']) if d.get('header') else None,
+            blocks=[BlockInfo.from_dict(b) for b in d['blocks']],
+            tail_zeros=d.get('tail_zeros', 0),
+        )
+
+
+def pack_container(
+    data: BufferSource,
+    filename: str = '',
+    site: Optional[str] = None,
+    block_records: int = BLOCK_RECORDS,
+    level: int = COMPRESSION_LEVEL
+) -> bytes:
+    """
+    파일 내용을 컨테이너로 압축
+    
+    - 첫 레코드 앞(헤더)과 레코드 영역을 나누고, 레코드 영역은 block_records개씩 레코드 경계에서 잘라
+      블록마다 zlib으로 따로 압축 (블록별 시간 범위를 인덱스에 기록)
+    - 레코드 영역 뒤 0 패딩은 길이만 기록
+    
+    Args:
+        data: 오프라인 Binary 또는 온라인 Hex-String (자동 판별)
+        filename: 원본 파일명 (사이트 판별 / 복원 파일명)
+        site: 'GT' 또는 'WB' (없으면 자동 판별)
+        block_records: 블록당 레코드 수
+        level: zlib 압축 수준
+    
+    Returns:
+        컨테이너 내용
+    """
+    converter = FDCNEOConverter()
+    original = converter._read_buffer(data)
+    kind = converter.detect_format(original)
+    scan = converter.scan_table(original, kind)
+    binary = scan.buffer
+    
+    index = ContainerIndex(
+        kind=kind,
+        site=converter.detect_site(original if kind == 'offline' else b'', filename, site=site),
+        filename=os.path.basename(filename),
+        sha256=hashlib.sha256(original).hexdigest(),
+        encoding='binary'
+    )
+    
+    if kind == 'online':
+        # Hex-String은 대문자로 다시 만들 수 있는 경우만 Binary로 저장, 아니면 원문 그대로
+        hex_text = binary.hex().upper().encode('ascii')
+        if original.startswith(hex_text) and not original[len(hex_text):].strip():
+            index.encoding = 'hex'
+            index.suffix = original[len(hex_text):]
+        else:
+            index.encoding = 'raw'
+            binary = original
+            scan.table = []
+    
+    # 레코드 영역 범위: 첫 레코드 시작 ~ (마지막 레코드 최대 길이, 마지막 0이 아닌 바이트 중 뒤쪽)
+    table = scan.table
+    content_end = len(binary.rstrip(b'\x00'))
+    if table:
+        area_start = table[0][1]
+        area_end = max(content_end, min(table[-1][1] + _LAST_RECORD_MAX, len(binary)))
+    else:
+        area_start = area_end = content_end
+    index.tail_zeros = len(binary) - area_end
+    
+    blob = bytearray()
+    
+    def add_block(raw: bytes, rows) -> BlockInfo:
+        compressed = zlib.compress(raw, level)
+        keys = [key for key, _, _ in rows if key is not None]
+        block = BlockInfo(
+            offset=len(blob),
+            length=len(compressed),
+            raw_size=len(raw),
+            record_count=len(rows),
+            first_ts=_unpack_timestamp(min(keys)) if keys else None,
+            last_ts=_unpack_timestamp(max(keys)) if keys else None
+        )
+        blob.extend(compressed)
+        return block
+    
+    index.header = add_block(binary[:area_start], [])
+    for i in range(0, len(table), block_records):
+        rows = table[i:i + block_records]
+        block_end = table[i + block_records][1] if i + block_records < len(table) else area_end
+        index.blocks.append(add_block(binary[rows[0][1]:block_end], rows))
+    
+    index_json = json.dumps(index.to_dict()).encode('utf-8')
+    return _HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, len(index_json)) + index_json + bytes(blob)
+
+
+class FaultContainer:
+    """
+    컨테이너 읽기
+    
+    - read(): 필터 시간 범위와 겹치는 블록만 압축 해제
+    - reconstitute(): 원본 파일을 바이트 단위로 동일하게 복원 (SHA-256 검증)
+    """
+    
+    def __init__(self, source: Union[str, BufferSource]):
+        self.converter = FDCNEOConverter()
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                self.data = f.read()
+        else:
+            self.data = self.converter._read_buffer(source)
+        
+        magic, version, index_len = _HEADER.unpack_from(self.data)
+        if magic != CONTAINER_MAGIC:
+            raise ValueError("FDC NEO 컨테이너가 아님")
+        if version > CONTAINER_VERSION:
+            raise ValueError(f"지원하지 않는 컨테이너 버전: {version}")
+        index_start = _HEADER.size
+        self.index = ContainerIndex.from_dict(
+            json.loads(self.data[index_start:index_start + index_len].decode('utf-8'))
+        )
+        self._blob_start = index_start + index_len
+        self.decompressed_blocks = 0  # 압축 해제한 블록 수 (헤더 제외)
+    
+    @property
+    def blocks(self) -> List[BlockInfo]:
+        return self.index.blocks
+    
+    @property
+    def record_count(self) -> int:
+        return sum(block.record_count for block in self.blocks)
+    
+    def select_blocks(self, record_filter: Optional[RecordFilter] = None) -> List[int]:
+        """필터 시간 범위와 겹치는 블록 번호 (범위가 없으면 전체)"""
+        since = record_filter.since if record_filter else None
+        until = record_filter.until if record_filter else None
+        if since is None and until is None:
+            return list(range(len(self.blocks)))
+        return [i for i, block in enumerate(self.blocks) if block.overlaps(since, until)]
+    
+    def read(self, record_filter: Optional[RecordFilter] = None) -> List[Tuple[datetime, bytes]]:
+        """
+        레코드 읽기 (원본 파일을 extract_records 한 결과와 같은 레코드)
+        
+        Args:
+            record_filter: 추출 필터 (시간 범위 밖 블록은 압축 해제하지 않음)
+        
+        Returns:
+            (타임스탬프, 레코드 데이터) 리스트 (파일 순서)
+        """
+        if self.index.encoding == 'raw':
+            # 원문 그대로 보관한 온라인 파일은 블록 인덱스가 없으므로 전체 스캔
+            return self.converter.extract_records(self.reconstitute(), 'online', record_filter)
+        
+        records = []
+        last = len(self.blocks) - 1
+        for i in self.select_blocks(record_filter):
+            records.extend(self._block_records(i, i == last, record_filter))
+        return records
+    
+    def reconstitute(self) -> bytes:
+        """원본 파일 내용 복원 (Fault_* 이미지 / 온라인 Hex-String)"""
+        binary = self._decompress(self.index.header) + b''.join(
+            self._decompress(block) for block in self.blocks
+        ) + b'\x00' * self.index.tail_zeros
+        
+        if self.index.encoding == 'hex':
+            original = binary.hex().upper().encode('ascii') + self.index.suffix
+        else:
+            original = binary
+        
+        if hashlib.sha256(original).hexdigest() != self.index.sha256:
+            raise ValueError("복원 결과가 원본 해시와 다름")
+        return original
+    
+    def _decompress(self, block: BlockInfo) -> bytes:
+        start = self._blob_start + block.offset
+        return zlib.decompress(self.data[start:start + block.length])
+    
+    def _block_records(
+        self,
+        i: int,
+        is_last: bool,
+        record_filter: Optional[RecordFilter]
+    ) -> List[Tuple[datetime, bytes]]:
+        """블록 1개만 압축 해제하여 스캔"""
+        raw = self._decompress(self.blocks[i])
+        self.decompressed_blocks += 1
+        
+        kind = self.index.kind
+        marker = min(min(spec.markers) for spec in registered_formats(kind))
+        if not is_last:
+            # 블록 끝 레코드가 다음 블록 시작까지 이어지도록 경계용 마커를 덧붙임
+            # (8바이트 미만이므로 레코드로는 추출되지 않음)
+            raw += (b'\x01' if kind == 'offline' else b'') + bytes([0x07, marker])
+        
+        pattern = marker_pattern(kind)
+        return self.converter._scan(raw, 0, pattern, kind == 'offline', record_filter).records
+
+
+def pack_file(input_file: str, output_file: Optional[str] = None, site: Optional[str] = None) -> ConversionResult:
+    """
+    파일을 컨테이너로 압축 저장
+    
+    Args:
+        input_file: Fault_* 이미지 또는 온라인 파일 경로
+        output_file: 출력 경로 (없으면 input_file + .fdcz)
+        site: 'GT' 또는 'WB' (없으면 자동 판별)
+    
+    Returns:
+        ConversionResult
+    """
+    try:
+        with open(input_file, 'rb') as f:
+            data = f.read()
+        packed = pack_container(data, filename=input_file, site=site)
+        
+        output_file = output_file or input_file + CONTAINER_EXT
+        with open(output_file, 'wb') as f:
+            f.write(packed)
+        
+        container = FaultContainer(packed)
+        return ConversionResult(
+            success=True,
+            output_file=output_file,
+            record_count=container.record_count,
+            message=(
+                f"압축 성공: {len(data):,} → {len(packed):,} bytes "
+                f"({len(packed) / max(len(data), 1):.1%}), 블록 {len(container.blocks)}개"
+            ),
+            input_record_count=container.record_count,
+            output_record_count=container.record_count
+        )
+    
+    except Exception as e:
+        return ConversionResult(
+            success=False,
+            output_file="",
+            record_count=0,
+            message=f"압축 실패: {str(e)}"
+        )
+
+
+def unpack_file(container_file: str, output_file: Optional[str] = None) -> ConversionResult:
+    """
+    컨테이너에서 원본 파일 복원
+    
+    Args:
+        container_file: .fdcz 경로
+        output_file: 출력 경로 (없으면 컨테이너 옆에 원본 파일명으로)
+    
+    Returns:
+        ConversionResult (output_data에 원본 파일 내용)
+    """
+    try:
+        container = FaultContainer(container_file)
+        original = container.reconstitute()
+        
+        if output_file is None:
+            output_file = os.path.join(
+                os.path.dirname(container_file),
+                container.index.filename or os.path.basename(container_file)[:-len(CONTAINER_EXT)]
+            )
+        with open(output_file, 'wb') as f:
+            f.write(original)
+        
+        return ConversionResult(
+            success=True,
+            output_file=output_file,
+            record_count=container.record_count,
+            message=f"복원 성공: {len(original):,} bytes (원본과 동일)",
+            output_record_count=container.record_count,
+            output_data=original
+        )
+    
+    except Exception as e:
+        return ConversionResult(
+            success=False,
+            output_file="",
+            record_count=0,
+            message=f"복원 실패: {str(e)}"
+        )
@@ -4,10 +4,176 @@ FDC NEO Converter
 온라인 ↔ 오프라인 파일 변환 및 병합
 """
 
+import csv
+import io
 import os
+import re
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
 from datetime import datetime
-from typing import List, Tuple, Optional
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple, Optional, Union, BinaryIO, FrozenSet
+from dataclasses import dataclass, field
+
+from fdc_neo_metrics import instrument_class
+from fdc_neo_profile import profile_class
+
+if TYPE_CHECKING:
+    # fdc_neo_latest가 이 모듈을 import하므로 타입 표기에만 사용
+    from fdc_neo_latest import LatestFaultsView
+
+
+# 버퍼 입력: bytes / bytearray / memoryview 또는 read()를 지원하는 파일 객체
+BufferSource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+# 사이트 종류: GT(Fault_GT, GSP, 512KB) / WB(Fault_WBVF, 256KB)
+SITE_TYPES = ('GT', 'WB')
+
+# 온라인 파일 최대 크기: [파일타임스탬프 6B][헤더 2B][레코드 데이터 최대 510B]
+ONLINE_FILE_SIZE = 518
+
+# 오프라인 파일: 레코드 데이터 시작 오프셋 / 이미지 크기 (GT 512KB, WB 256KB)
+# (기본 형식 등록값, 실제 처리는 형식 레지스트리 기준)
+OFFLINE_RECORD_START = 7000
+OFFLINE_IMAGE_SIZE = {'GT': 524288, 'WB': 262144}
+
+# 오프라인 헤더: 시스템 식별자 오프셋 / 인덱스 테이블 (오프셋 273부터 200바이트)
+OFFLINE_IDENTIFIER_OFFSET = 42
+OFFLINE_INDEX_OFFSET = 273
+OFFLINE_INDEX_SIZE = 200
+
+
+@dataclass(frozen=True)
+class FormatSpec:
+    """
+    파일 형식 변형 1개 (컨트롤러 세대)
+    
+    새 형식은 register_format()으로 등록하면 스캐너/판별/생성에 바로 반영되며,
+    스캐너는 종류별로 등록된 모든 마커를 정규식 하나로 묶어 단일 패스로 찾음
+    """
+    name: str  # 'GT' / 'WBVF' / 'GT_ONLINE' / 'WB_ONLINE'
+    kind: str  # 'offline' / 'online'
+    site: str  # 'GT' / 'WB'
+    markers: FrozenSet[int]  # 07 다음 마커 바이트
+    record_start: int  # 레코드 데이터 시작 오프셋
+    file_size: int  # 오프라인 이미지 크기 / 온라인 파일 최대 크기
+    file_prefix: str  # 파일명 접두사 (Fault_GT / Fault_WBVF / GT / WB)
+    identifier: bytes = b''  # 시스템 식별자 (오프라인, 예: GSP / WBVF)
+    identifier_offset: int = OFFLINE_IDENTIFIER_OFFSET
+
+
+# 형식 레지스트리: 이름 → FormatSpec (등록 순서 = 판별 우선순위)
+FORMAT_REGISTRY: Dict[str, FormatSpec] = {}
+
+# 종류별 마커 정규식 (레지스트리가 바뀌면 다음 스캔 때 다시 컴파일)
+_marker_patterns: Dict[str, 're.Pattern'] = {}
+
+
+def register_format(spec: FormatSpec):
+    """형식 등록 (같은 이름이면 교체)"""
+    if spec.kind not in ('online', 'offline'):
+        raise ValueError(f"알 수 없는 파일 종류: {spec.kind}")
+    if spec.site not in SITE_TYPES:
+        raise ValueError(f"알 수 없는 사이트 종류: {spec.site}")
+    FORMAT_REGISTRY[spec.name] = spec
+    _marker_patterns.clear()
+
+
+def registered_formats(kind: Optional[str] = None, site: Optional[str] = None) -> List[FormatSpec]:
+    """등록된 형식 목록 (종류/사이트로 거르기)"""
+    return [
+        spec for spec in FORMAT_REGISTRY.values()
+        if (kind is None or spec.kind == kind) and (site is None or spec.site == site)
+    ]
+
+
+def get_format(kind: str, site: str) -> FormatSpec:
+    """종류/사이트의 기본 형식 (먼저 등록된 것)"""
+    specs = registered_formats(kind, site)
+    if not specs:
+        raise ValueError(f"등록되지 않은 형식: {kind}/{site}")
+    return specs[0]
+
+
+def marker_pattern(kind: str) -> 're.Pattern':
+    """종류별로 등록된 모든 마커를 07 + 바이트 클래스 정규식 하나로 컴파일"""
+    pattern = _marker_patterns.get(kind)
+    if pattern is None:
+        markers = sorted(set().union(*(spec.markers for spec in registered_formats(kind))))
+        if not markers:
+            raise ValueError(f"등록된 {kind} 형식이 없음")
+        pattern = re.compile(b'\x07[' + b''.join(re.escape(bytes([m])) for m in markers) + b']')
+        _marker_patterns[kind] = pattern
+    return pattern
+
+
+def offline_capacity(site: str) -> int:
+    """오프라인 이미지 1개에 담을 수 있는 레코드 데이터 바이트 수"""
+    spec = get_format('offline', site)
+    return spec.file_size - spec.record_start
+
+
+# 레코드 경계 판별 엄격도 (FDCNEOConverter(strictness=...))
+# - loose: 마커(07 E?) 위치를 모두 경계로 사용 (오프라인은 레코드 타입 0x00만 제외)
+# - normal: 마커 뒤 6바이트가 실제 날짜인 후보만 경계로 사용
+# - strict: normal + 앞뒤 레코드와 연도가 이어지지 않거나 연도/레코드 타입 분포에서 드문 후보 제외
+BOUNDARY_STRICTNESS = ('loose', 'normal', 'strict')
+# strict 분포 검사: 후보가 이 수 이상일 때만 적용, 비율이 이 값 미만인 연도/레코드 타입은 제외
+STRICT_MIN_SAMPLES = 50
+STRICT_MIN_SHARE = 0.01
+
+# 병렬 스캔 (FDCNEOConverter(scan_workers=...)): 레코드 영역이 이 크기 이상일 때만 작업 프로세스 사용
+# (작은 파일은 프로세스 시작 비용이 스캔보다 큼), 작업 프로세스당 구간 수 (구간별 밀도 차이 분산)
+PARALLEL_SCAN_MIN_BYTES = 8 * 1024 * 1024
+PARALLEL_SCAN_CHUNKS_PER_WORKER = 4
+
+
+# 기본 형식: 오프라인 07 E4-E9, 온라인 07 E7/E9/EA/EB
+_OFFLINE_MARKERS = frozenset(range(0xE4, 0xEA))
+_ONLINE_MARKERS = frozenset((0xE7, 0xE9, 0xEA, 0xEB))
+
+# 온라인 레코드를 오프라인 이미지에 기록할 때 붙이는 레코드 타입 (온라인 형식에는 타입 정보가 없음)
+ONLINE_RECORD_TYPE = 0x01
+
+register_format(FormatSpec(
+    'GT', 'offline', 'GT', _OFFLINE_MARKERS, OFFLINE_RECORD_START, OFFLINE_IMAGE_SIZE['GT'],
+    'Fault_GT', identifier=b'GSP'
+))
+register_format(FormatSpec(
+    'WBVF', 'offline', 'WB', _OFFLINE_MARKERS, OFFLINE_RECORD_START, OFFLINE_IMAGE_SIZE['WB'],
+    'Fault_WBVF', identifier=b'WBVF'
+))
+# 온라인: [파일타임스탬프 6B][헤더 2B][레코드 데이터]
+register_format(FormatSpec('GT_ONLINE', 'online', 'GT', _ONLINE_MARKERS, 8, ONLINE_FILE_SIZE, 'GT'))
+register_format(FormatSpec('WB_ONLINE', 'online', 'WB', _ONLINE_MARKERS, 8, ONLINE_FILE_SIZE, 'WB'))
+
+
+def parse_site_id(filename: str) -> Optional[str]:
+    """
+    파일명에서 사이트 ID 추출
+    
+    GT_N24987L02_260107_091837.txt      → N24987L02
+    GT_FULL_N23261L01_260120_153045.txt → N23261L01
+    Fault_GT_N24987L02.txt              → N24987L02
+    
+    Returns:
+        사이트 ID (형식을 알 수 없으면 None)
+    """
+    base_name = os.path.splitext(os.path.basename(filename))[0]
+    parts = base_name.split('_')
+    if parts[0] == 'Fault' and len(parts) >= 3:
+        return parts[2]
+    if parts[0] in ('GT', 'WB') and len(parts) >= 2:
+        if parts[1] == 'FULL' and len(parts) >= 3:
+            return parts[2]
+        return parts[1]
+    return None
+
+
+def _site_id_from(filenames: Iterable[str]) -> Optional[str]:
+    """파일명 목록에서 처음 판별되는 사이트 ID (없으면 None)"""
+    return next((site_id for site_id in map(parse_site_id, filenames) if site_id), None)
 
 
 @dataclass
@@ -23,77 +189,234 @@ class ConversionResult:
     duplicate_count: int = 0  # 중복 제거된 레코드 수 (병합 시)
     online_record_count: int = 0  # 온라인 파일 레코드 수 (병합 시)
     offline_record_count: int = 0  # 오프라인 파일 레코드 수 (병합 시)
+    # 필터 통계 (RecordFilter 사용 시)
+    excluded_by_time: int = 0  # 시간 범위 밖으로 제외된 레코드 수
+    excluded_by_marker: int = 0  # 마커 조건으로 제외된 레코드 수
+    excluded_by_record_type: int = 0  # 레코드 타입 조건으로 제외된 레코드 수
+    rejected_candidates: int = 0  # 레코드 경계로 인정되지 않은 마커 후보 수 (strictness)
+    # 메모리 변환 결과 (*_bytes 메서드 사용 시, output 스트림을 지정하면 비어 있음)
+    output_data: bytes = b''  # 출력 파일 내용
+    truncated_count: int = 0  # 오프라인 이미지 용량 초과로 잘린 레코드 수
+    # 아카이브 병합 중복 사전 검사 (Bloom filter)
+    bloom_bytes: int = 0  # 필터 메모리 크기
+    bloom_fp_rate: float = 0.0  # 추정 오탐률
+    bloom_skipped: int = 0  # 정확한 조회 없이 신규로 판정된 레코드 수
+    bloom_false_positives: int = 0  # 필터 오탐 (조회 결과 실제로는 신규)
+    # 덤프 비교 (diff) 결과
+    added_count: int = 0  # new에만 있는 레코드 수
+    removed_count: int = 0  # old에만 있는 레코드 수
+    identical_count: int = 0  # 양쪽에 모두 있는 레코드 수
+    # 여러 파일 출력 (페이지 내보내기 시)
+    output_files: List[str] = field(default_factory=list)  # 출력 파일 경로 목록
+
+
+def _pack_timestamp(ts: datetime) -> int:
+    """datetime을 6바이트 타임스탬프(YY MM DD hh mm ss) 정수 키로 변환 (대소 비교용)"""
+    if ts.year < 2000:
+        return 0
+    if ts.year > 2099:
+        return (1 << 48) - 1
+    yy = ts.year - 2000
+    return (yy << 40) | (ts.month << 32) | (ts.day << 24) | (ts.hour << 16) | (ts.minute << 8) | ts.second
+
+
+def _unpack_timestamp(key: int) -> datetime:
+    """정수 타임스탬프 키를 datetime으로 변환 (_pack_timestamp의 역변환)"""
+    return datetime(
+        2000 + (key >> 40), (key >> 32) & 0xFF, (key >> 24) & 0xFF,
+        (key >> 16) & 0xFF, (key >> 8) & 0xFF, key & 0xFF
+    )
+
+
+def _atomic_write(path: str, data: bytes):
+    """
+    임시 파일에 기록하고 fsync한 뒤 rename (출력/세그먼트/인덱스/뷰 파일 공용)
+    
+    중단되거나 rename 직후 시스템이 멈춰도 이전 파일 또는 완성된 새 파일만 남음
+    (임시 파일명에 프로세스 ID를 붙여 다른 프로세스의 같은 경로 기록과 섞이지 않음)
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class RecordFilter:
+    """
+    레코드 추출 필터 (스캔 중 평가, 제외된 레코드는 슬라이싱/디코딩하지 않음)
+    
+    - since/until: 타임스탬프 범위 (양 끝 포함, 타임스탬프가 없는 레코드는 제외)
+    - markers: 허용할 마커 두 번째 바이트 (예: {0xE9, 0xEA})
+    - record_types: 허용할 레코드 타입 바이트 (오프라인 레코드에만 적용)
+    """
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    markers: Optional[Iterable[int]] = None
+    record_types: Optional[Iterable[int]] = None
+    
+    def marker_set(self) -> Optional[FrozenSet[int]]:
+        return frozenset(self.markers) if self.markers is not None else None
+    
+    def record_type_set(self) -> Optional[FrozenSet[int]]:
+        return frozenset(self.record_types) if self.record_types is not None else None
+    
+    def time_keys(self) -> Tuple[Optional[int], Optional[int]]:
+        return (
+            _pack_timestamp(self.since) if self.since is not None else None,
+            _pack_timestamp(self.until) if self.until is not None else None
+        )
+
+
+@dataclass
+class OnlinePage:
+    """518바이트 온라인 파일 1개 (페이지 내보내기 단위)"""
+    file_name: str  # 권장 파일명 (GT_<사이트>_<yymmdd>_<hhmmss>.txt)
+    data: bytes  # 온라인 파일 내용 (Hex-String)
+    record_count: int  # 포함된 레코드 수 (레코드 단위로만 나눔)
+    newest: Optional[datetime]  # 파일 타임스탬프로 사용한 가장 최근 레코드 시각
+    oldest: Optional[datetime]  # 가장 오래된 레코드 시각
+    skipped_count: int = 0  # 510바이트를 넘어 담을 수 없어 건너뛴 레코드 수
+
+
+@dataclass
+class ScanResult:
+    """레코드 스캔 결과"""
+    records: List[Tuple[datetime, bytes]] = field(default_factory=list)
+    candidate_count: int = 0  # 마커 후보 수
+    excluded_by_time: int = 0  # 시간 범위 밖으로 제외된 레코드 수
+    excluded_by_marker: int = 0  # 마커 조건으로 제외된 레코드 수
+    excluded_by_record_type: int = 0  # 레코드 타입 조건으로 제외된 레코드 수
+    rejected_candidates: int = 0  # 레코드 경계로 인정되지 않은 마커 후보 수 (앞 레코드에 포함됨)
+    # 레코드 테이블 (scan_table 사용 시 records 대신 채움)
+    table: List[Tuple[Optional[int], int, int]] = field(default_factory=list)  # (정수 타임스탬프 키, 시작, 끝)
+    buffer: bytes = b''  # 테이블 오프셋이 가리키는 Binary 내용
 
 
 class FDCNEOConverter:
     """FDC NEO 파일 변환기"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        strictness: str = 'loose',
+        scan_workers: Optional[int] = 1,
+        latest: Optional['LatestFaultsView'] = None
+    ):
+        """
+        Args:
+            strictness: 레코드 경계 판별 엄격도 ('loose' / 'normal' / 'strict', BOUNDARY_STRICTNESS 참고)
+                        데이터 안에 우연히 07 E? 바이트가 있는 덤프는 'normal' 이상 권장
+            scan_workers: 큰 파일(PARALLEL_SCAN_MIN_BYTES 이상) 스캔에 사용할 작업 프로세스 수
+                          (1이면 단일 스캔, None이면 CPU 수)
+            latest: 사이트별 최근 고장 뷰 (지정 시 merge_to_online/merge_to_offline 결과로 갱신,
+                    사이트 ID는 입력 파일명에서 판별)
+        """
+        if strictness not in BOUNDARY_STRICTNESS:
+            raise ValueError(f"알 수 없는 엄격도: {strictness}")
+        self.strictness = strictness
+        self.scan_workers = scan_workers
+        self.latest = latest
         self.records = []
     
     # =====================================================================
     # 1. 온라인 → 오프라인 변환
     # =====================================================================
     
-    def online_to_offline(self, online_file: str, output_file: str = None) -> ConversionResult:
+    def online_to_offline(
+        self,
+        online_file: str,
+        output_file: str = None,
+        site: Optional[str] = None
+    ) -> ConversionResult:
         """
         온라인 파일을 오프라인 형식으로 변환
         
         Args:
             online_file: 온라인 파일 경로 (GT_*.txt, WB_*.txt)
             output_file: 출력 파일 경로 (없으면 자동 생성)
+            site: 'GT' 또는 'WB' (없으면 파일명으로 판별)
         
         Returns:
             ConversionResult
         """
         try:
-            # 1. 온라인 파일 읽기 (Hex-String)
             with open(online_file, 'rb') as f:
-                hex_string = f.read().decode('ascii').strip()
+                result = self.online_to_offline_bytes(f, filename=online_file, site=site)
+            if result.success:
+                result.output_file = self._write_output(result, output_file)
+            return result
+            
+        except Exception as e:
+            return ConversionResult(
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"변환 실패: {str(e)}"
+            )
+    
+    def online_to_offline_bytes(
+        self,
+        data: BufferSource,
+        filename: str = '',
+        site: Optional[str] = None,
+        output: Optional[BinaryIO] = None
+    ) -> ConversionResult:
+        """
+        온라인 파일 내용을 오프라인 형식으로 변환 (메모리 내 처리)
+        
+        Args:
+            data: 온라인 파일 내용 (Hex-String, bytes/memoryview/파일 객체)
+            filename: 원본 파일명 (출력 파일명 생성용, site가 없으면 GT/WB 판별에도 사용)
+            site: 'GT' 또는 'WB' (없으면 파일명으로 판별, 판별 불가 시 GT)
+            output: 출력 스트림 (지정 시 결과를 기록하고 output_data는 비워 둠)
+        
+        Returns:
+            ConversionResult (output_data에 오프라인 파일 내용, output_file에 권장 파일명)
+        """
+        try:
+            # 1. 온라인 파일 읽기 (Hex-String)
+            hex_string = self._read_buffer(data).decode('ascii').strip()
             
             # 2. Binary로 변환
             binary_data = bytes.fromhex(hex_string)
             
             # 3. 온라인 파일에서 레코드 데이터만 추출 (파일 타임스탬프와 헤더 제거)
             # 온라인 형식: [파일타임스탬프 6B][헤더 2B][레코드 데이터...]
-            if len(binary_data) > 8:
-                record_data = binary_data[8:]  # 파일 타임스탬프(6) + 헤더(2) 제거
+            site = self.detect_site(b'', filename, site=site)
+            record_start = get_format('online', site).record_start
+            if len(binary_data) > record_start:
+                record_data = binary_data[record_start:]
             else:
                 record_data = binary_data
             
             # 4. 출력 파일명 생성
-            if output_file is None:
-                base_name = os.path.basename(online_file)
-                # GT_N24987L02_260107_091837.txt → Fault_GT_N24987L02.txt
-                if base_name.startswith('GT_'):
-                    parts = base_name.split('_')
-                    output_file = f"Fault_GT_{parts[1]}.txt"
-                elif base_name.startswith('WB_'):
+            base_name = os.path.basename(filename)
+            # GT_N24987L02_260107_091837.txt → Fault_GT_N24987L02.txt
+            output_file = "Fault_Converted.txt"
+            for spec in registered_formats('online'):
+                if base_name.startswith(spec.file_prefix + '_'):
                     parts = base_name.split('_')
-                    output_file = f"Fault_WBVF_{parts[1]}.txt"
-                else:
-                    output_file = "Fault_Converted.txt"
+                    output_file = f"{get_format('offline', spec.site).file_prefix}_{parts[1]}.txt"
+                    break
             
             # 5. 오프라인 형식 생성
-            offline_data = self._create_offline_format(record_data, is_gt='GT_' in online_file)
-            
-            # 6. 파일 저장
-            with open(output_file, 'wb') as f:
-                f.write(offline_data)
+            offline_data = self._create_offline_format(record_data, is_gt=site == 'GT')
             
-            # 7. 레코드 수 계산
-            input_record_count = record_data.count(b'\x07\xE9') + record_data.count(b'\x07\xEA') + \
-                                record_data.count(b'\x07\xEB') + record_data.count(b'\x07\xE7')
+            # 6. 레코드 수 계산 (스캐너와 같은 마커 테이블)
+            input_record_count = len(marker_pattern('online').findall(record_data))
             output_record_count = input_record_count  # 변환 시 레코드 수는 동일
             
-            return ConversionResult(
+            return self._emit(ConversionResult(
                 success=True,
                 output_file=output_file,
                 record_count=output_record_count,
                 message=f"온라인 → 오프라인 변환 성공: {output_record_count}개 레코드",
                 input_record_count=input_record_count,
-                output_record_count=output_record_count
-            )
+                output_record_count=output_record_count,
+                output_data=offline_data
+            ), output)
             
         except Exception as e:
             return ConversionResult(
@@ -113,109 +436,213 @@ class FDCNEOConverter:
         - 설정 데이터 계속: 오프셋 46-272 (227 bytes for WBVF, 228 bytes for GT)
         - 인덱스 테이블: 오프셋 273-472 (200 bytes)
         - 레코드 데이터: 오프셋 ~7000 이후부터 시작
+        
+        식별자/레코드 시작 오프셋/이미지 크기는 형식 레지스트리 기준
         """
+        spec = get_format('offline', 'GT' if is_gt else 'WB')
+        offline_data = self._offline_header(spec) + record_data
+        
+        # 256KB 또는 512KB로 패딩
+        target_size = spec.file_size
+        if len(offline_data) < target_size:
+            offline_data += b'\x00' * (target_size - len(offline_data))
+        else:
+            offline_data = offline_data[:target_size]
+        
+        return offline_data
+    
+    def _offline_header(self, spec: FormatSpec) -> bytes:
+        """오프라인 이미지 헤더 (레코드 데이터 시작 오프셋까지)"""
         
         # ConfigDone 헤더 (10 bytes)
         config_done = b'ConfigDone'
         
-        # 설정 데이터 영역 (32 bytes, 오프셋 10-41)
-        config_area_1 = b'\x00' * 32
+        # 설정 데이터 영역 (오프셋 10 ~ 식별자 앞, 기본 32 bytes)
+        config_area_1 = b'\x00' * (spec.identifier_offset - len(config_done))
         
-        # 시스템 식별자 (오프셋 42부터)
-        if is_gt:
-            identifier = b'GSP'  # 3 bytes
-            config_area_2 = b'\x00' * 228  # 오프셋 45-272 (228 bytes)
-        else:
-            identifier = b'WBVF'  # 4 bytes
-            config_area_2 = b'\x00' * 227  # 오프셋 46-272 (227 bytes)
+        # 시스템 식별자 (기본 오프셋 42: GSP 3B / WBVF 4B) 이후 인덱스 테이블 앞까지 설정 데이터
+        config_area_2 = b'\x00' * (OFFLINE_INDEX_OFFSET - spec.identifier_offset - len(spec.identifier))
         
         # 인덱스 테이블 (200 bytes, 오프셋 273-472)
         # B2, B1, 1, 2, 3, ... 형식
         index_table = b'\x00\x00' + b'B2\x00B1\x00' + b'1\x00\x002\x00\x003\x00\x00'
         # 나머지 인덱스 항목들 (간단한 버전)
-        index_table += b'\x00' * (200 - len(index_table))
-        
-        # 레코드 데이터 시작 위치까지 패딩 (~7000 오프셋)
-        # 현재까지: 10 + 32 + (3 or 4) + (228 or 227) + 200 = 473 or 474 bytes
-        # 레코드 시작 위치까지: 7000 - 473 = 6527 bytes (GT 기준)
-        record_start_padding = b'\x00' * (7000 - len(config_done) - len(config_area_1) - len(identifier) - len(config_area_2) - len(index_table))
-        
-        # 전체 구조
-        offline_data = config_done + config_area_1 + identifier + config_area_2 + index_table + record_start_padding + record_data
+        index_table += b'\x00' * (OFFLINE_INDEX_SIZE - len(index_table))
         
-        # 256KB 또는 512KB로 패딩
-        target_size = 524288 if is_gt else 262144  # 512KB or 256KB
-        if len(offline_data) < target_size:
-            offline_data += b'\x00' * (target_size - len(offline_data))
-        else:
-            offline_data = offline_data[:target_size]
+        header = config_done + config_area_1 + spec.identifier + config_area_2 + index_table
         
-        return offline_data
+        # 레코드 데이터 시작 위치까지 패딩 (~7000 오프셋)
+        return header + b'\x00' * (spec.record_start - len(header))
     
     # =====================================================================
     # 2. 오프라인 → 온라인 변환
     # =====================================================================
     
-    def offline_to_online(self, offline_file: str, output_file: str = None) -> ConversionResult:
+    def offline_to_online(
+        self,
+        offline_file: str,
+        output_file: str = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> ConversionResult:
         """
         오프라인 파일을 온라인 형식으로 변환 (전체 데이터 포함)
         
         Args:
             offline_file: 오프라인 파일 경로 (Fault_*.txt)
             output_file: 출력 파일 경로 (없으면 자동 생성)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
         
         Returns:
             ConversionResult
         """
+        try:
+            with open(offline_file, 'rb') as f:
+                result = self.offline_to_online_bytes(f, filename=offline_file, record_filter=record_filter)
+            if result.success:
+                result.output_file = self._write_output(result, output_file)
+            return result
+            
+        except Exception as e:
+            return ConversionResult(
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"변환 실패: {str(e)}"
+            )
+    
+    def offline_to_online_bytes(
+        self,
+        data: BufferSource,
+        filename: str = '',
+        output: Optional[BinaryIO] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> ConversionResult:
+        """
+        오프라인 파일 내용을 온라인 형식으로 변환 (메모리 내 처리, 전체 데이터 포함)
+        
+        Args:
+            data: 오프라인 파일 내용 (Binary, bytes/memoryview/파일 객체)
+            filename: 원본 파일명 (출력 파일명 생성용)
+            output: 출력 스트림 (지정 시 결과를 기록하고 output_data는 비워 둠)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
+        
+        Returns:
+            ConversionResult (output_data에 Hex-String, output_file에 권장 파일명)
+        """
         try:
             # 1. 오프라인 파일에서 레코드 추출
-            records = self._extract_records_from_offline(offline_file)
+            scan = self.scan_records(data, 'offline', record_filter)
+            records = scan.records
             
             # 타임스탬프 기준 정렬 (최신순, None 타임스탬프는 가장 오래된 것으로 처리)
             records.sort(key=lambda r: r[0] if r[0] is not None else datetime.min, reverse=True)
             
             if not records:
-                return ConversionResult(
+                return self._add_scan_stats(ConversionResult(
                     success=False,
                     output_file="",
                     record_count=0,
                     message="추출 가능한 레코드가 없습니다"
-                )
+                ), scan)
             
             # 2. 출력 파일명 생성 (FULL 표시)
-            if output_file is None:
-                base_name = os.path.basename(offline_file)
-                timestamp = datetime.now().strftime('%y%m%d_%H%M%S')
-                
-                if 'WBVF' in base_name:
-                    parts = base_name.split('_')
-                    site_id = parts[2].replace('.txt', '')
-                    output_file = f"WB_FULL_{site_id}_{timestamp}.txt"
-                elif 'GT' in base_name:
-                    parts = base_name.split('_')
-                    site_id = parts[2].replace('.txt', '')
-                    output_file = f"GT_FULL_{site_id}_{timestamp}.txt"
-                else:
-                    output_file = f"Online_FULL_Converted_{timestamp}.txt"
+            base_name = os.path.basename(filename)
+            timestamp = datetime.now().strftime('%y%m%d_%H%M%S')
+            
+            if 'WBVF' in base_name:
+                parts = base_name.split('_')
+                site_id = parts[2].replace('.txt', '')
+                output_file = f"WB_FULL_{site_id}_{timestamp}.txt"
+            elif 'GT' in base_name:
+                parts = base_name.split('_')
+                site_id = parts[2].replace('.txt', '')
+                output_file = f"GT_FULL_{site_id}_{timestamp}.txt"
+            else:
+                output_file = f"Online_FULL_Converted_{timestamp}.txt"
             
             # 3. 온라인 형식 생성 (전체 레코드)
             online_data = self._create_online_format_from_tuples(records)
             
-            # 4. 파일 저장 (Hex-String, 크기 제한 없음)
+            # 4. Hex-String 변환 (크기 제한 없음)
             hex_string = online_data.hex().upper()
-            with open(output_file, 'w') as f:
-                f.write(hex_string)
             
             input_record_count = len(records)
             output_record_count = input_record_count  # 변환 시 레코드 수는 동일
             
-            return ConversionResult(
+            return self._emit(self._add_scan_stats(ConversionResult(
                 success=True,
                 output_file=output_file,
                 record_count=output_record_count,
                 message=f"오프라인 → 온라인(전체) 변환 성공: {output_record_count}개 레코드",
                 input_record_count=input_record_count,
-                output_record_count=output_record_count
+                output_record_count=output_record_count,
+                output_data=hex_string.encode('ascii')
+            ), scan), output)
+            
+        except Exception as e:
+            return ConversionResult(
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"변환 실패: {str(e)}"
+            )
+    
+    def offline_to_online_pages(
+        self,
+        offline_file: str,
+        output_dir: str = '.',
+        max_records: Optional[int] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> ConversionResult:
+        """
+        오프라인 파일을 518바이트 온라인 파일 여러 개로 나누어 변환 (최신 레코드부터)
+        
+        Args:
+            offline_file: 오프라인 파일 경로 (Fault_*.txt, FULL 온라인 파일도 가능)
+            output_dir: 출력 디렉토리
+            max_records: 내보낼 최신 레코드 수 (없으면 전체)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
+        
+        Returns:
+            ConversionResult (output_files에 생성된 파일 경로 목록)
+        """
+        try:
+            output_files = []
+            record_count = 0
+            skipped_count = 0
+            
+            with open(offline_file, 'rb') as f:
+                pages = self.iter_online_pages(
+                    f, filename=offline_file, max_records=max_records, record_filter=record_filter
+                )
+                for page in pages:
+                    output_file = os.path.join(output_dir, page.file_name)
+                    with open(output_file, 'wb') as out:
+                        out.write(page.data)
+                    output_files.append(output_file)
+                    record_count += page.record_count
+                    skipped_count += page.skipped_count
+            
+            if not output_files:
+                return ConversionResult(
+                    success=False,
+                    output_file="",
+                    record_count=0,
+                    message="추출 가능한 레코드가 없습니다"
+                )
+            
+            message = f"오프라인 → 온라인(페이지) 변환 성공: {record_count}개 레코드, {len(output_files)}개 파일"
+            if skipped_count:
+                message += f" ({skipped_count}개 레코드는 크기 초과로 제외)"
+            
+            return ConversionResult(
+                success=True,
+                output_file=output_files[0],
+                record_count=record_count,
+                message=message,
+                input_record_count=record_count + skipped_count,
+                output_record_count=record_count,
+                output_files=output_files
             )
             
         except Exception as e:
@@ -226,99 +653,155 @@ class FDCNEOConverter:
                 message=f"변환 실패: {str(e)}"
             )
     
-    def _create_online_format(self, record_data: bytes) -> bytes:
-        """온라인 파일 형식 생성 (Raw 데이터)"""
+    def iter_online_pages(
+        self,
+        data: BufferSource,
+        filename: str = '',
+        max_records: Optional[int] = None,
+        record_filter: Optional[RecordFilter] = None,
+        site: Optional[str] = None
+    ) -> Iterator[OnlinePage]:
+        """
+        레코드를 최신순으로 518바이트 온라인 파일 단위로 나누어 생성
         
-        # 현재 타임스탬프
-        now = datetime.now()
-        file_timestamp = bytes([
-            now.year % 100,
-            now.month,
-            now.day,
-            now.hour,
-            now.minute,
-            now.second
-        ])
+        - 정렬된 레코드를 한 번만 순회하며 페이지를 채움 (전체 Hex-String을 만들지 않음)
+        - 레코드 중간에서 자르지 않음 (510바이트를 넘는 레코드는 건너뜀)
+        - 파일 타임스탬프는 페이지의 가장 최근 레코드 시각
         
-        # 헤더
-        header = b'\x00\x0A'
+        Args:
+            data: 파일 내용 (오프라인 Binary 또는 온라인 Hex-String, 자동 판별)
+            filename: 원본 파일명 (사이트 ID / 출력 파일명 생성용)
+            max_records: 내보낼 최신 레코드 수 (없으면 전체)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
+            site: 'GT' 또는 'WB' (없으면 자동 판별)
+        
+        Yields:
+            OnlinePage (최신 페이지부터)
+        """
+        data = self._read_buffer(data)
+        records = self.extract_records(data, record_filter=record_filter)
+        
+        # 타임스탬프 기준 정렬 (최신순, None 타임스탬프는 가장 오래된 것으로 처리)
+        records.sort(key=lambda r: r[0] if r[0] is not None else datetime.min, reverse=True)
+        
+        prefix = self.detect_site(data, filename, site=site)
+        site_id = parse_site_id(filename) or 'Converted'
+        used_names = set()
+        
+        def make_page(page_records, skipped):
+            newest = page_records[0][0]
+            oldest = page_records[-1][0]
+            file_ts = newest if newest is not None else datetime.now()
+            online_data = self._timestamp_bytes(file_ts) + b'\x00\x0A' + \
+                b''.join(online_record for _, online_record in page_records)
+            
+            file_name = f"{prefix}_{site_id}_{file_ts.strftime('%y%m%d_%H%M%S')}.txt"
+            # 같은 시각의 페이지가 여러 개면 일련번호 추가
+            n = 2
+            while file_name in used_names:
+                file_name = f"{prefix}_{site_id}_{file_ts.strftime('%y%m%d_%H%M%S')}_{n}.txt"
+                n += 1
+            used_names.add(file_name)
+            
+            return OnlinePage(
+                file_name=file_name,
+                data=online_data.hex().upper().encode('ascii'),
+                record_count=len(page_records),
+                newest=newest,
+                oldest=oldest,
+                skipped_count=skipped
+            )
         
-        # 전체 구조
-        online_data = file_timestamp + header + record_data
+        online_spec = get_format('online', prefix)
+        payload_limit = online_spec.file_size - online_spec.record_start
+        page_records = []
+        page_size = 0
+        skipped = 0
+        emitted = 0
         
-        # 518 bytes로 제한
-        if len(online_data) > 518:
-            online_data = online_data[:518]
+        for ts, record_bytes in records:
+            if max_records is not None and emitted >= max_records:
+                break
+            
+            online_record = self._to_online_record(ts, record_bytes)
+            if not online_record or len(online_record) > payload_limit:
+                skipped += 1
+                continue
+            
+            # 현재 페이지에 다 들어가지 않으면 페이지 마감
+            if page_size + len(online_record) > payload_limit:
+                yield make_page(page_records, skipped)
+                page_records = []
+                page_size = 0
+                skipped = 0
+            
+            page_records.append((ts, online_record))
+            page_size += len(online_record)
+            emitted += 1
         
-        return online_data
+        if page_records:
+            yield make_page(page_records, skipped)
     
     def _create_online_format_from_tuples(self, records: List[Tuple[datetime, bytes]]) -> bytes:
         """온라인 파일 형식 생성 (튜플 리스트로부터, 크기 제한 없음)"""
         
         # 현재 타임스탬프
-        now = datetime.now()
-        file_timestamp = bytes([
-            now.year % 100,
-            now.month,
-            now.day,
-            now.hour,
-            now.minute,
-            now.second
-        ])
+        file_timestamp = self._timestamp_bytes(datetime.now())
         
         # 헤더
         header = b'\x00\x0A'
         
-        # 레코드 데이터 생성 (모든 레코드 포함)
-        record_data = b''
-        for ts, record_bytes in records:
-            # 오프라인 형식: [레코드타입][07][마커][타임스탬프][데이터]
-            # 온라인 형식: [07][마커][타임스탬프][데이터]
-            
-            if len(record_bytes) >= 9:
-                # 오프라인 형식인 경우 (레코드타입 + 07 + 마커 + 타임스탬프 + 데이터)
-                if record_bytes[1:3] == b'\x07':  # 레코드타입 다음이 07
-                    # 레코드 타입 제거하고 온라인 형식으로 변환
-                    online_record = record_bytes[1:]  # 레코드 타입 제거
-                    record_data += online_record
-                elif record_bytes[0:2] == b'\x07':  # 이미 온라인 형식
-                    record_data += record_bytes
-                else:
-                    # 마커 찾아서 재구성
-                    marker_pos = record_bytes.find(b'\x07')
-                    if marker_pos != -1 and marker_pos + 1 < len(record_bytes):
-                        marker_byte = record_bytes[marker_pos + 1]
-                        # 타임스탬프가 None이면 레코드 데이터에서 타임스탬프 추출 시도
-                        if ts is not None:
-                            ts_bytes = bytes([
-                                ts.year % 100,
-                                ts.month,
-                                ts.day,
-                                ts.hour,
-                                ts.minute,
-                                ts.second
-                            ])
-                        else:
-                            # 타임스탬프가 없으면 레코드 데이터에서 추출 시도 (마커 뒤 6바이트)
-                            if marker_pos + 8 <= len(record_bytes):
-                                ts_bytes = record_bytes[marker_pos+2:marker_pos+8]
-                                if len(ts_bytes) != 6:
-                                    ts_bytes = b'\x00' * 6  # 기본값
-                            else:
-                                ts_bytes = b'\x00' * 6  # 기본값
-                        data_start = marker_pos + 8  # 07 + 마커 + 타임스탬프(6)
-                        record_data_part = record_bytes[data_start:] if data_start < len(record_bytes) else b''
-                        online_record = b'\x07' + bytes([marker_byte]) + ts_bytes + record_data_part
-                        record_data += online_record
-            elif len(record_bytes) >= 8 and record_bytes[0:2] == b'\x07':
-                # 이미 온라인 형식
-                record_data += record_bytes
+        # 레코드 데이터 생성 (모든 레코드 포함, 9바이트 미만 레코드 제외)
+        record_data = b''.join(
+            self._to_online_record(ts, record_bytes)
+            for ts, record_bytes in records
+            if len(record_bytes) >= 9
+        )
         
         # 전체 구조 (크기 제한 없음 - 전체 레코드 포함)
         online_data = file_timestamp + header + record_data
         
         return online_data
     
+    def _timestamp_bytes(self, ts: datetime) -> bytes:
+        """datetime → 6바이트 타임스탬프 (YY MM DD hh mm ss)"""
+        return bytes([ts.year % 100, ts.month, ts.day, ts.hour, ts.minute, ts.second])
+    
+    def _to_online_record(self, ts: Optional[datetime], record_bytes: bytes) -> bytes:
+        """
+        레코드 1개를 온라인 형식으로 변환 (변환할 수 없으면 b'')
+        
+        오프라인 형식: [레코드타입][07][마커][타임스탬프][데이터]
+        온라인 형식: [07][마커][타임스탬프][데이터]
+        """
+        # 마커 찾아서 재구성
+        marker_pos = record_bytes.find(b'\x07')
+        if marker_pos == -1 or marker_pos + 1 >= len(record_bytes):
+            return b''
+        marker_byte = record_bytes[marker_pos + 1]
+        
+        # 타임스탬프가 None이면 레코드 데이터에서 추출 시도 (마커 뒤 6바이트)
+        if ts is not None:
+            ts_bytes = self._timestamp_bytes(ts)
+        elif marker_pos + 8 <= len(record_bytes):
+            ts_bytes = record_bytes[marker_pos + 2:marker_pos + 8]
+        else:
+            ts_bytes = b'\x00' * 6  # 기본값
+        
+        # 07 + 마커 + 타임스탬프(6) 이후가 데이터
+        return b'\x07' + bytes([marker_byte]) + ts_bytes + record_bytes[marker_pos + 8:]
+    
+    def _to_offline_record(self, record_bytes: bytes) -> bytes:
+        """
+        레코드 1개를 오프라인 형식으로 변환 (이미 오프라인 형식이면 그대로)
+        
+        온라인 형식: [07][마커][타임스탬프][데이터] → [ONLINE_RECORD_TYPE][07][마커][타임스탬프][데이터]
+        (타입 바이트 없이 이미지에 기록하면 스캐너가 앞 레코드의 마지막 바이트를 타입으로 읽음)
+        """
+        if len(record_bytes) >= 2 and record_bytes[0] == 0x07 and record_bytes[1] in _ONLINE_MARKERS:
+            return bytes([ONLINE_RECORD_TYPE]) + record_bytes
+        return record_bytes
+    
     # =====================================================================
     # 3. 병합 → 온라인 출력
     # =====================================================================
@@ -327,7 +810,8 @@ class FDCNEOConverter:
         self, 
         online_file: str, 
         offline_file: str, 
-        output_file: str = None
+        output_file: str = None,
+        record_filter: Optional[RecordFilter] = None
     ) -> ConversionResult:
         """
         온라인 + 오프라인 파일 병합하여 온라인 형식으로 출력
@@ -337,44 +821,61 @@ class FDCNEOConverter:
             online_file: 온라인 파일 경로
             offline_file: 오프라인 파일 경로
             output_file: 출력 파일 경로
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
         
         Returns:
             ConversionResult
         """
         try:
-            # 1. 두 파일에서 레코드 추출
-            online_records = self._extract_records_from_online(online_file)
-            offline_records = self._extract_records_from_offline(offline_file)
-            
-            # 2. 병합 및 중복 제거
-            online_record_count = len(online_records)
-            offline_record_count = len(offline_records)
-            total_before_merge = online_record_count + offline_record_count
-            
-            merged_records = self._merge_and_deduplicate(online_records, offline_records)
-            
-            final_record_count = len(merged_records)
-            duplicate_count = total_before_merge - final_record_count
-            
-            # 3. 출력 파일명 생성
-            if output_file is None:
-                timestamp = datetime.now().strftime('%y%m%d_%H%M%S')
-                output_file = f"Merged_Online_{timestamp}.txt"
-            
-            # 4. 온라인 형식으로 저장
-            result = self._save_as_online(merged_records, output_file)
+            with open(online_file, 'rb') as f_on, open(offline_file, 'rb') as f_off:
+                result = self.merge_to_online_bytes(
+                    f_on, f_off, record_filter=record_filter, filenames=(online_file, offline_file)
+                )
+            if result.success:
+                result.output_file = self._write_output(result, output_file)
+            return result
             
+        except Exception as e:
             return ConversionResult(
-                success=True,
-                output_file=output_file,
-                record_count=final_record_count,
-                message=f"병합 성공: {final_record_count}개 레코드 (중복 제거 완료)",
-                input_record_count=total_before_merge,
-                output_record_count=final_record_count,
-                duplicate_count=duplicate_count,
-                online_record_count=online_record_count,
-                offline_record_count=offline_record_count
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"병합 실패: {str(e)}"
             )
+    
+    def merge_to_online_bytes(
+        self,
+        online_data: BufferSource,
+        offline_data: BufferSource,
+        output: Optional[BinaryIO] = None,
+        record_filter: Optional[RecordFilter] = None,
+        filenames: Tuple[str, ...] = ()
+    ) -> ConversionResult:
+        """
+        온라인 + 오프라인 파일 내용 병합하여 온라인 형식으로 출력 (메모리 내 처리)
+        
+        Args:
+            online_data: 온라인 파일 내용 (bytes/memoryview/파일 객체)
+            offline_data: 오프라인 파일 내용 (bytes/memoryview/파일 객체)
+            output: 출력 스트림 (지정 시 결과를 기록하고 output_data는 비워 둠)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
+            filenames: 원본 파일명 (최근 고장 뷰의 사이트 ID 판별용)
+        
+        Returns:
+            ConversionResult (output_data에 Hex-String)
+        """
+        try:
+            online_scan = self.scan_records(online_data, 'online', record_filter)
+            offline_scan = self.scan_records(offline_data, 'offline', record_filter)
+            
+            result = self.merge_records(
+                online_scan.records,
+                offline_scan.records,
+                output_format='online',
+                site=self.detect_site(b'', *filenames),
+                site_id=_site_id_from(filenames)
+            )
+            return self._emit(self._add_scan_stats(result, online_scan, offline_scan), output)
             
         except Exception as e:
             return ConversionResult(
@@ -392,7 +893,9 @@ class FDCNEOConverter:
         self, 
         online_file: str, 
         offline_file: str, 
-        output_file: str = None
+        output_file: str = None,
+        site: Optional[str] = None,
+        record_filter: Optional[RecordFilter] = None
     ) -> ConversionResult:
         """
         온라인 + 오프라인 파일 병합하여 오프라인 형식으로 출력
@@ -402,50 +905,71 @@ class FDCNEOConverter:
             online_file: 온라인 파일 경로
             offline_file: 오프라인 파일 경로
             output_file: 출력 파일 경로
+            site: 'GT' 또는 'WB' (없으면 오프라인 파일 식별자 → 파일명 순으로 판별)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
         
         Returns:
             ConversionResult
         """
         try:
-            # 1. 두 파일에서 레코드 추출
-            online_records = self._extract_records_from_online(online_file)
-            offline_records = self._extract_records_from_offline(offline_file)
-            
-            # 2. 병합 및 중복 제거
-            online_record_count = len(online_records)
-            offline_record_count = len(offline_records)
-            total_before_merge = online_record_count + offline_record_count
-            
-            merged_records = self._merge_and_deduplicate(online_records, offline_records)
-            
-            final_record_count = len(merged_records)
-            duplicate_count = total_before_merge - final_record_count
-            
-            # 3. 출력 파일명 생성
-            if output_file is None:
-                timestamp = datetime.now().strftime('%y%m%d_%H%M%S')
-                is_gt = 'GT' in offline_file or 'GT' in online_file
-                prefix = 'Fault_GT' if is_gt else 'Fault_WBVF'
-                output_file = f"{prefix}_Merged_{timestamp}.txt"
-            
-            # 4. 오프라인 형식으로 저장
-            result = self._save_as_offline(
-                merged_records, 
-                output_file,
-                is_gt='GT' in offline_file or 'GT' in online_file
-            )
+            with open(online_file, 'rb') as f_on, open(offline_file, 'rb') as f_off:
+                result = self.merge_to_offline_bytes(
+                    f_on,
+                    f_off,
+                    site=site,
+                    filenames=(online_file, offline_file),
+                    record_filter=record_filter
+                )
+            if result.success:
+                result.output_file = self._write_output(result, output_file)
+            return result
             
+        except Exception as e:
             return ConversionResult(
-                success=True,
-                output_file=output_file,
-                record_count=final_record_count,
-                message=f"병합 성공: {final_record_count}개 레코드 (중복 제거 완료)",
-                input_record_count=total_before_merge,
-                output_record_count=final_record_count,
-                duplicate_count=duplicate_count,
-                online_record_count=online_record_count,
-                offline_record_count=offline_record_count
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"병합 실패: {str(e)}"
+            )
+    
+    def merge_to_offline_bytes(
+        self,
+        online_data: BufferSource,
+        offline_data: BufferSource,
+        site: Optional[str] = None,
+        filenames: Tuple[str, ...] = (),
+        output: Optional[BinaryIO] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> ConversionResult:
+        """
+        온라인 + 오프라인 파일 내용 병합하여 오프라인 형식으로 출력 (메모리 내 처리)
+        
+        Args:
+            online_data: 온라인 파일 내용 (bytes/memoryview/파일 객체)
+            offline_data: 오프라인 파일 내용 (bytes/memoryview/파일 객체)
+            site: 'GT' (Fault_GT, 512KB) 또는 'WB' (Fault_WBVF, 256KB)
+                  없으면 오프라인 파일 식별자(GSP/WBVF) → filenames 순으로 판별
+            filenames: 사이트(종류/ID) 판별용 원본 파일명
+            output: 출력 스트림 (지정 시 결과를 기록하고 output_data는 비워 둠)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
+        
+        Returns:
+            ConversionResult (output_data에 Binary)
+        """
+        try:
+            offline_data = self._read_buffer(offline_data)
+            online_scan = self.scan_records(online_data, 'online', record_filter)
+            offline_scan = self.scan_records(offline_data, 'offline', record_filter)
+            
+            site = self.detect_site(offline_data, *filenames, site=site)
+            result = self.merge_records(
+                online_scan.records,
+                offline_scan.records,
+                output_format='offline',
+                site=site,
+                site_id=_site_id_from(filenames)
             )
+            return self._emit(self._add_scan_stats(result, online_scan, offline_scan), output)
             
         except Exception as e:
             return ConversionResult(
@@ -456,98 +980,519 @@ class FDCNEOConverter:
             )
     
     # =====================================================================
-    # 헬퍼 함수들
+    # 5. 레코드 단위 API (추출 결과 재사용)
     # =====================================================================
     
-    def _extract_records_from_online(self, filepath: str) -> List[Tuple[datetime, bytes]]:
-        """온라인 파일에서 레코드 추출"""
-        records = []
+    def extract_records(
+        self,
+        data: BufferSource,
+        kind: Optional[str] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> List[Tuple[datetime, bytes]]:
+        """
+        파일 내용에서 레코드 추출
         
-        # 파일 타입 자동 감지
-        with open(filepath, 'rb') as f:
-            raw_data = f.read()
+        Args:
+            data: 파일 내용 (bytes/memoryview/파일 객체)
+            kind: 'online' (Hex-String, Binary면 오프라인으로 자동 처리) 또는 'offline'
+                  없으면 내용으로 자동 판별 (detect_format)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
         
-        # Binary 파일인지 확인 (오프라인 파일)
-        # 온라인 파일은 Hex-String이므로 ASCII로 디코딩 가능해야 함
+        Returns:
+            (타임스탬프, 레코드 데이터) 리스트
+        """
+        return self.scan_records(data, kind, record_filter).records
+    
+    def scan_records(
+        self,
+        data: BufferSource,
+        kind: Optional[str] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> ScanResult:
+        """
+        파일 내용에서 레코드 추출 (필터별 제외 통계 포함)
+        
+        필터는 스캔 중 원시 바이트로 평가되므로 제외된 레코드는 슬라이싱/디코딩되지 않음
+        
+        Args:
+            data: 파일 내용 (bytes/memoryview/파일 객체)
+            kind: 'online' / 'offline' (없으면 자동 판별)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
+        
+        Returns:
+            ScanResult
+        """
+        return self._scan_kind(data, kind, record_filter, False)
+    
+    def scan_table(
+        self,
+        data: BufferSource,
+        kind: Optional[str] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> ScanResult:
+        """
+        레코드를 슬라이싱하지 않고 (정수 타임스탬프 키, 시작, 끝) 테이블로 스캔
+        
+        레코드 바이트는 필요할 때 result.buffer[시작:끝]으로 꺼냄
+        (타임스탬프가 없거나 날짜가 유효하지 않은 레코드의 키는 None)
+        
+        Returns:
+            ScanResult (table, buffer)
+        """
+        return self._scan_kind(data, kind, record_filter, True)
+    
+    def detect_format(self, data: BufferSource) -> str:
+        """
+        파일 내용으로 형식 판별
+        
+        Returns:
+            'online' (Hex-String 텍스트) 또는 'offline' (Binary)
+        """
+        return 'online' if self._is_hex_text(self._read_buffer(data)) else 'offline'
+    
+    def detect_site(self, data: BufferSource = b'', *filenames: str, site: Optional[str] = None) -> str:
+        """
+        사이트 종류 판별
+        
+        우선순위: 명시된 site → 오프라인 식별자(오프셋 42, GSP/WBVF) → 파일명 → 기본값 GT
+        
+        Args:
+            data: 오프라인 파일 내용 (없으면 생략)
+            filenames: 원본 파일명 (경로면 파일명 부분만 사용)
+            site: 명시된 사이트 종류
+        
+        Returns:
+            'GT' 또는 'WB'
+        """
+        if site is not None:
+            site = site.upper()
+            if site not in SITE_TYPES:
+                raise ValueError(f"알 수 없는 사이트 종류: {site}")
+            return site
+        
+        data = self._read_buffer(data)
+        spec = self._offline_format_of(data)
+        if spec is not None:
+            return spec.site
+        
+        for filename in filenames:
+            base_name = os.path.basename(filename)
+            if 'WBVF' in base_name or base_name.startswith('WB_'):
+                return 'WB'
+            if 'GT' in base_name:
+                return 'GT'
+        
+        return 'GT'
+    
+    def merge_records(
+        self,
+        online_records: List[Tuple[datetime, bytes]],
+        offline_records: List[Tuple[datetime, bytes]],
+        output_format: str = 'online',
+        site: str = 'GT',
+        site_id: Optional[str] = None
+    ) -> ConversionResult:
+        """
+        추출된 레코드 병합 (중복 제거) 후 출력 형식으로 생성
+        
+        같은 입력에 대해 출력 형식만 바꿔 다시 병합할 때 재파싱 없이 사용
+        
+        Args:
+            online_records: 온라인 파일 레코드
+            offline_records: 오프라인 파일 레코드
+            output_format: 'online' (Hex-String) 또는 'offline' (Binary)
+            site: 오프라인 출력 시 'GT' (Fault_GT) / 'WB' (Fault_WBVF)
+            site_id: 사이트 ID (지정하고 변환기에 최근 고장 뷰가 있으면 병합·중복 제거된 레코드로 갱신)
+        
+        Returns:
+            ConversionResult (output_data에 출력 파일 내용, output_file에 권장 파일명)
+        """
+        # 1. 병합 및 중복 제거
+        online_record_count = len(online_records)
+        offline_record_count = len(offline_records)
+        total_before_merge = online_record_count + offline_record_count
+        
+        merged_records = self._merge_and_deduplicate(online_records, offline_records)
+        
+        final_record_count = len(merged_records)
+        duplicate_count = total_before_merge - final_record_count
+        
+        # 2. 출력 형식 생성 및 권장 파일명
+        timestamp = datetime.now().strftime('%y%m%d_%H%M%S')
+        if output_format == 'online':
+            output_data = self._build_online_data(merged_records)
+            output_file = f"Merged_Online_{timestamp}.txt"
+        elif output_format == 'offline':
+            site = self.detect_site(site=site)
+            is_gt = site == 'GT'
+            output_data = self._build_offline_data(merged_records, is_gt=is_gt)
+            prefix = get_format('offline', site).file_prefix
+            output_file = f"{prefix}_Merged_{timestamp}.txt"
+            truncated_count = final_record_count - self._count_fitting_records(merged_records, site)
+        else:
+            raise ValueError(f"알 수 없는 출력 형식: {output_format}")
+        
+        message = f"병합 성공: {final_record_count}개 레코드 (중복 제거 완료)"
+        if output_format == 'offline' and truncated_count:
+            message += f" - 용량 초과로 {truncated_count}개 레코드 잘림 (세그먼트 아카이브 사용 권장)"
+        
+        # 3. 사이트별 최근 고장 뷰 갱신
+        if self.latest is not None and site_id is not None:
+            self.latest.update(site_id, merged_records, site)
+        
+        return ConversionResult(
+            success=True,
+            output_file=output_file,
+            record_count=final_record_count,
+            message=message,
+            input_record_count=total_before_merge,
+            output_record_count=final_record_count,
+            duplicate_count=duplicate_count,
+            online_record_count=online_record_count,
+            offline_record_count=offline_record_count,
+            truncated_count=truncated_count if output_format == 'offline' else 0,
+            output_data=output_data
+        )
+    
+    # =====================================================================
+    # 6. 덤프 비교 (diff)
+    # =====================================================================
+    
+    def diff(
+        self,
+        old_file: str,
+        new_file: str,
+        output_file: str = None,
+        output_format: str = 'online',
+        record_filter: Optional[RecordFilter] = None
+    ) -> ConversionResult:
+        """
+        두 파일(예: 어제/오늘 Fault_GT 다운로드) 비교하여 변경분 출력
+        
+        Args:
+            old_file: 이전 파일 경로
+            new_file: 새 파일 경로
+            output_file: 출력 파일 경로
+            output_format: 'online' (추가된 레코드, Hex-String) 또는 'csv' (추가/삭제 레코드 열 형식)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
+        
+        Returns:
+            ConversionResult
+        """
         try:
-            hex_string = raw_data.decode('ascii').strip()
-            # Hex-String인지 확인 (0-9, A-F, a-f, 공백, 개행만 포함)
-            hex_chars = set(b'0123456789ABCDEFabcdef\n\r\t ')
-            sample = raw_data[:min(100, len(raw_data))]
-            if not all(c in hex_chars for c in sample):
-                # Binary 파일로 판단
-                raise UnicodeDecodeError('ascii', raw_data, 0, 1, 'not ascii')
-        except (UnicodeDecodeError, AttributeError):
-            # Binary 파일이면 오프라인 추출 함수로 처리
-            return self._extract_records_from_offline(filepath)
+            with open(old_file, 'rb') as f_old, open(new_file, 'rb') as f_new:
+                result = self.diff_bytes(f_old, f_new, output_format=output_format, record_filter=record_filter)
+            if result.success:
+                result.output_file = self._write_output(result, output_file)
+            return result
         
-        # Hex-String이면 계속 처리
-        binary_data = bytes.fromhex(hex_string)
+        except Exception as e:
+            return ConversionResult(
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"비교 실패: {str(e)}"
+            )
+    
+    def diff_bytes(
+        self,
+        old_data: BufferSource,
+        new_data: BufferSource,
+        output_format: str = 'online',
+        output: Optional[BinaryIO] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> ConversionResult:
+        """
+        두 파일 내용 비교 (메모리 내 처리)
         
-        # 파일 타임스탬프와 헤더 건너뛰기 (처음 8바이트)
-        data_start = 8
-        if len(binary_data) > data_start:
-            binary_data = binary_data[data_start:]
-        
-        # 마커 찾기
-        markers = [b'\x07\xE9', b'\x07\xEA', b'\x07\xEB', b'\x07\xE7']
-        all_marker_positions = []
-        
-        # 모든 마커 위치 찾기
-        for marker in markers:
-            pos = 0
-            while True:
-                pos = binary_data.find(marker, pos)
-                if pos == -1:
-                    break
-                all_marker_positions.append(pos)
-                pos += 1
+        레코드 동일 기준은 병합과 같음 (타임스탬프 + 데이터).
+        양쪽을 레코드 테이블(정수 타임스탬프 키, 오프셋)로 스캔해 키 순으로 정렬한 뒤
+        한 번에 나란히 훑으므로, 레코드 바이트는 키가 같은 묶음과 변경분만 꺼냄
         
-        # 마커 위치 정렬
-        all_marker_positions.sort()
+        Args:
+            old_data: 이전 파일 내용 (bytes/memoryview/파일 객체, 형식 자동 판별)
+            new_data: 새 파일 내용
+            output_format: 'online' (추가된 레코드) 또는 'csv' (추가/삭제 레코드)
+            output: 출력 스트림 (지정 시 결과를 기록하고 output_data는 비워 둠)
+            record_filter: 추출 필터 (시간 범위, 마커, 레코드 타입)
         
-        # 각 마커에서 레코드 추출 (타임스탬프 검증 완화)
-        for i, pos in enumerate(all_marker_positions):
-            # 타임스탬프 추출 (마커 뒤 6바이트)
-            ts = None
-            if pos + 8 <= len(binary_data):
-                ts_bytes = binary_data[pos+2:pos+8]
-                if len(ts_bytes) == 6:
-                    try:
-                        yy, mm, dd, hh, mi, ss = ts_bytes
-                        # 타임스탬프 검증 완화: 기본적인 범위만 확인
-                        if (0 <= yy <= 99 and 0 <= mm <= 12 and 0 <= dd <= 31 and
-                            0 <= hh < 24 and 0 <= mi < 60 and 0 <= ss < 60):
-                            try:
-                                ts = datetime(2000 + yy, mm, dd, hh, mi, ss)
-                            except:
-                                # 날짜가 유효하지 않아도 레코드는 포함
-                                pass
-                    except:
-                        pass
-            
-            # 레코드 데이터: 다음 마커까지 또는 최대 100바이트
-            if i + 1 < len(all_marker_positions):
-                # 다음 마커가 있으면 그 전까지
-                record_end = all_marker_positions[i + 1]
-            else:
-                # 마지막 레코드면 최대 100바이트 또는 파일 끝까지
-                record_end = min(pos + 100, len(binary_data))
+        Returns:
+            ConversionResult (added_count, removed_count, identical_count)
+        """
+        try:
+            old_scan = self.scan_table(old_data, record_filter=record_filter)
+            new_scan = self.scan_table(new_data, record_filter=record_filter)
+            added, removed, identical_count = self._diff_tables(old_scan, new_scan)
             
-            record_data = binary_data[pos:record_end]
+            timestamp = datetime.now().strftime('%y%m%d_%H%M%S')
+            if output_format == 'online':
+                output_data = self._build_online_data(added)
+                output_file = f"Diff_Online_{timestamp}.txt"
+                output_record_count = len(added)
+            elif output_format == 'csv':
+                output_data = self._build_delta_csv(added, removed)
+                output_file = f"Diff_{timestamp}.csv"
+                output_record_count = len(added) + len(removed)
+            else:
+                raise ValueError(f"알 수 없는 출력 형식: {output_format}")
             
-            if len(record_data) >= 8:  # 최소 마커 + 타임스탬프
-                # 타임스탬프가 없어도 레코드는 포함 (타임스탬프는 None으로 유지)
-                records.append((ts, record_data))
+            result = ConversionResult(
+                success=True,
+                output_file=output_file,
+                record_count=output_record_count,
+                message=f"비교 완료: 추가 {len(added)}개, 삭제 {len(removed)}개, 동일 {identical_count}개",
+                input_record_count=len(old_scan.table) + len(new_scan.table),
+                output_record_count=output_record_count,
+                added_count=len(added),
+                removed_count=len(removed),
+                identical_count=identical_count,
+                output_data=output_data
+            )
+            return self._emit(self._add_scan_stats(result, old_scan, new_scan), output)
         
-        return records
+        except Exception as e:
+            return ConversionResult(
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"비교 실패: {str(e)}"
+            )
+    
+    def _diff_tables(
+        self,
+        old_scan: ScanResult,
+        new_scan: ScanResult
+    ) -> Tuple[List[Tuple[datetime, bytes]], List[Tuple[datetime, bytes]], int]:
+        """
+        정렬된 두 레코드 테이블을 나란히 훑어 (추가, 삭제, 동일 수) 계산
+        
+        - 키가 한쪽에만 있으면 바이트 비교 없이 바로 추가/삭제
+        - 키가 같은 묶음 안에서만 데이터를 꺼내 개수 단위로 비교 (같은 레코드 2개 vs 1개 → 1개 변경)
+        - 타임스탬프 없는 레코드는 키 -1 묶음으로 데이터만 비교
+        - 파일 끝 레코드는 최대 100바이트까지 잡히면서 이미지의 0 패딩이 붙으므로,
+          마지막 행의 끝 0 바이트를 잘라내고 데이터는 끝 0 바이트를 뺀 값으로 비교
+          (다음 덤프에서 더 이상 마지막이 아닌 같은 레코드가 변경으로 잡히지 않도록)
+        """
+        def sorted_table(scan: ScanResult):
+            rows = [(key if key is not None else -1, start, end) for key, start, end in scan.table]
+            if rows:
+                key, start, end = rows[-1]
+                trimmed = len(scan.buffer[start:end].rstrip(b'\x00'))
+                rows[-1] = (key, start, start + max(trimmed, min(8, end - start)))
+            # 오프라인 덤프는 대부분 시간 순이므로 정렬 비용은 거의 선형
+            return sorted(rows, key=lambda row: row[0])
+        
+        def record(buffer: bytes, row) -> Tuple[Optional[datetime], bytes]:
+            key, start, end = row
+            return (_unpack_timestamp(key) if key >= 0 else None), buffer[start:end]
+        
+        old_rows, new_rows = sorted_table(old_scan), sorted_table(new_scan)
+        old_buf, new_buf = old_scan.buffer, new_scan.buffer
+        added = []
+        removed = []
+        identical_count = 0
+        
+        i = j = 0
+        while i < len(old_rows) or j < len(new_rows):
+            old_key = old_rows[i][0] if i < len(old_rows) else None
+            new_key = new_rows[j][0] if j < len(new_rows) else None
+            
+            if new_key is None or (old_key is not None and old_key < new_key):
+                removed.append(record(old_buf, old_rows[i]))
+                i += 1
+                continue
+            if old_key is None or new_key < old_key:
+                added.append(record(new_buf, new_rows[j]))
+                j += 1
+                continue
+            
+            # 같은 키 묶음
+            i_end, j_end = i, j
+            while i_end < len(old_rows) and old_rows[i_end][0] == old_key:
+                i_end += 1
+            while j_end < len(new_rows) and new_rows[j_end][0] == new_key:
+                j_end += 1
+            
+            old_group = [record(old_buf, row) for row in old_rows[i:i_end]]
+            remaining = Counter(data.rstrip(b'\x00') for _, data in old_group)
+            for row in new_rows[j:j_end]:
+                ts, data = record(new_buf, row)
+                payload = data.rstrip(b'\x00')
+                if remaining[payload] > 0:
+                    remaining[payload] -= 1
+                    identical_count += 1
+                else:
+                    added.append((ts, data))
+            for ts, data in old_group:
+                payload = data.rstrip(b'\x00')
+                if remaining[payload] > 0:
+                    remaining[payload] -= 1
+                    removed.append((ts, data))
+            i, j = i_end, j_end
+        
+        return added, removed, identical_count
+    
+    def _build_delta_csv(
+        self,
+        added: List[Tuple[datetime, bytes]],
+        removed: List[Tuple[datetime, bytes]]
+    ) -> bytes:
+        """변경분을 열 형식(CSV)으로 생성: 구분, 타임스탬프, 레코드 타입, 마커, 길이, 데이터(Hex)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(['change', 'timestamp', 'record_type', 'marker', 'length', 'data_hex'])
+        
+        rows = [('added', ts, data) for ts, data in added] + [('removed', ts, data) for ts, data in removed]
+        rows.sort(key=lambda row: row[1] if row[1] is not None else datetime.min)
+        for change, ts, data in rows:
+            # 온라인 레코드: [07][마커]..., 오프라인 레코드: [레코드타입][07][마커]...
+            marker_pos = data.find(b'\x07')
+            writer.writerow([
+                change,
+                ts.isoformat(sep=' ') if ts is not None else '',
+                f"{data[0]:02X}" if marker_pos == 1 else '',
+                f"{data[marker_pos + 1]:02X}" if 0 <= marker_pos < len(data) - 1 else '',
+                len(data),
+                data.hex().upper()
+            ])
+        return buffer.getvalue().encode('utf-8')
+    
+    # =====================================================================
+    # 헬퍼 함수들
+    # =====================================================================
+    
+    def _offline_format_of(self, data: bytes) -> Optional[FormatSpec]:
+        """ConfigDone 헤더의 시스템 식별자로 오프라인 형식 판별 (판별 불가 시 None)"""
+        if data[:10] != b'ConfigDone':
+            return None
+        for spec in registered_formats('offline'):
+            offset = spec.identifier_offset
+            if spec.identifier and data[offset:offset + len(spec.identifier)] == spec.identifier:
+                return spec
+        return None
+    
+    def _scan_kind(
+        self,
+        data: BufferSource,
+        kind: Optional[str],
+        record_filter: Optional[RecordFilter],
+        table: bool
+    ) -> ScanResult:
+        data = self._read_buffer(data)
+        if kind is None:
+            kind = self.detect_format(data)
+        if kind == 'online':
+            return self._scan_online(data, record_filter, table)
+        if kind == 'offline':
+            return self._scan_offline(data, record_filter, table)
+        raise ValueError(f"알 수 없는 파일 종류: {kind}")
+    
+    def _read_buffer(self, source: BufferSource) -> bytes:
+        """버퍼 입력을 bytes로 변환 (파일 객체는 끝까지 읽음)"""
+        if isinstance(source, bytes):
+            return source
+        if isinstance(source, (bytearray, memoryview)):
+            return bytes(source)
+        if hasattr(source, 'read'):
+            data = source.read()
+            # 텍스트 모드 스트림 (Hex-String)
+            if isinstance(data, str):
+                return data.encode('ascii')
+            return bytes(data)
+        raise TypeError(f"지원하지 않는 입력 타입: {type(source).__name__}")
+    
+    def _add_scan_stats(self, result: ConversionResult, *scans: ScanResult) -> ConversionResult:
+        """스캔 필터 통계를 변환 결과에 합산"""
+        for scan in scans:
+            result.excluded_by_time += scan.excluded_by_time
+            result.excluded_by_marker += scan.excluded_by_marker
+            result.excluded_by_record_type += scan.excluded_by_record_type
+            result.rejected_candidates += scan.rejected_candidates
+        return result
+    
+    def _emit(self, result: ConversionResult, output: Optional[BinaryIO]) -> ConversionResult:
+        """출력 스트림이 지정되면 결과를 기록하고 메모리 사본은 비움"""
+        if output is not None and result.success:
+            output.write(result.output_data)
+            result.output_data = b''
+        return result
+    
+    def _is_hex_text(self, raw_data: bytes) -> bool:
+        """Hex-String 텍스트(온라인 파일)인지 확인 (앞 100바이트 표본)"""
+        try:
+            raw_data.decode('ascii')
+        except UnicodeDecodeError:
+            return False
+        # Hex-String인지 확인 (0-9, A-F, a-f, 공백, 개행만 포함)
+        hex_chars = set(b'0123456789ABCDEFabcdef\n\r\t ')
+        sample = raw_data[:min(100, len(raw_data))]
+        return all(c in hex_chars for c in sample)
+    
+    def _write_output(self, result: ConversionResult, output_file: Optional[str]) -> str:
+        """변환 결과(output_data)를 파일로 저장하고 저장 경로 반환 (경로 없으면 권장 파일명 사용)"""
+        if output_file is None:
+            output_file = result.output_file
+        with open(output_file, 'wb') as f:
+            f.write(result.output_data)
+        return output_file
+    
+    def _extract_records_from_online(self, filepath: str) -> List[Tuple[datetime, bytes]]:
+        """온라인 파일에서 레코드 추출"""
+        with open(filepath, 'rb') as f:
+            return self._extract_records_from_online_data(f.read())
+    
+    def _extract_records_from_online_data(self, raw_data: bytes) -> List[Tuple[datetime, bytes]]:
+        """온라인 파일 내용에서 레코드 추출 (Binary면 오프라인 추출로 자동 전환)"""
+        return self._scan_online(raw_data).records
     
     def _extract_records_from_offline(self, filepath: str) -> List[Tuple[datetime, bytes]]:
         """오프라인 파일에서 레코드 추출"""
-        records = []
-        
         with open(filepath, 'rb') as f:
-            binary_data = f.read()
+            return self._extract_records_from_offline_data(f.read())
+    
+    def _extract_records_from_offline_data(self, binary_data: bytes) -> List[Tuple[datetime, bytes]]:
+        """오프라인 파일 내용에서 레코드 추출"""
+        return self._scan_offline(binary_data).records
+    
+    def _scan_online(
+        self,
+        raw_data: bytes,
+        record_filter: Optional[RecordFilter] = None,
+        table: bool = False
+    ) -> ScanResult:
+        """온라인 파일 내용 스캔 (Binary면 오프라인 스캔으로 자동 전환)"""
+        
+        # Binary 파일인지 확인 (오프라인 파일)
+        # 온라인 파일은 Hex-String이므로 ASCII로 디코딩 가능해야 함
+        if not self._is_hex_text(raw_data):
+            # Binary 파일이면 오프라인 스캔으로 처리
+            return self._scan_offline(raw_data, record_filter, table)
+        
+        # Hex-String이면 계속 처리
+        binary_data = bytes.fromhex(raw_data.decode('ascii').strip())
+        return self._scan_online_binary(binary_data, record_filter, table)
+    
+    def _scan_online_binary(
+        self,
+        binary_data: bytes,
+        record_filter: Optional[RecordFilter] = None,
+        table: bool = False
+    ) -> ScanResult:
+        """Hex 디코딩된 온라인 파일 내용 스캔"""
+        
+        # 파일 타임스탬프와 헤더 건너뛰기 (처음 8바이트)
+        record_start = min(spec.record_start for spec in registered_formats('online'))
+        data_start = record_start if len(binary_data) > record_start else 0
+        
+        return self._scan(binary_data, data_start, marker_pattern('online'), False, record_filter, table)
+    
+    def _scan_offline(
+        self,
+        binary_data: bytes,
+        record_filter: Optional[RecordFilter] = None,
+        table: bool = False
+    ) -> ScanResult:
+        """오프라인 파일 내용 스캔"""
         
         # ConfigDone 헤더 이후부터 시작 (약 7000바이트 이후)
         # 실제 레코드 데이터는 보통 7000바이트 이후부터 시작
@@ -556,79 +1501,348 @@ class FDCNEOConverter:
         if config_done_pos != -1:
             # ConfigDone 이후 인덱스 테이블을 건너뛰고 레코드 영역으로 이동
             # 인덱스 테이블은 약 200바이트, 설정 데이터 포함 약 7000바이트
-            data_start = max(7000, config_done_pos + 1000)
+            # (식별자로 형식을 알면 그 형식의 시작 오프셋, 모르면 등록된 형식 중 가장 앞)
+            spec = self._offline_format_of(binary_data)
+            if spec is not None:
+                record_start = spec.record_start
+            else:
+                record_start = min(spec.record_start for spec in registered_formats('offline'))
+            data_start = max(record_start, config_done_pos + 1000)
         
-        if data_start > 0:
-            binary_data = binary_data[data_start:]
+        return self._scan(binary_data, data_start, marker_pattern('offline'), True, record_filter, table)
+    
+    def _scan(
+        self,
+        data: bytes,
+        data_start: int,
+        marker_re,
+        with_record_type: bool,
+        record_filter: Optional[RecordFilter] = None,
+        table: bool = False
+    ) -> ScanResult:
+        """
+        레코드 영역 단일 패스 스캔
         
-        # 마커 찾기
-        markers = [b'\x07\xE4', b'\x07\xE5', b'\x07\xE6', b'\x07\xE7', b'\x07\xE8', b'\x07\xE9']
-        all_marker_positions = []
+        - 마커(07 E?) 후보를 정규식 한 번으로 찾음 (마커별 반복 검색 없음)
+        - 레코드 경계: 다음 레코드 시작까지 또는 최대 100바이트
+        - 필터는 슬라이싱/타임스탬프 디코딩 전에 원시 바이트로 평가
+          (시간 범위는 6바이트 타임스탬프를 정수로 묶어 비교)
+        - 필터로 제외된 레코드도 앞 레코드의 경계로는 사용됨
+        - strictness가 loose가 아니면 경계로 인정되지 않은 후보는 앞 레코드에 포함됨
+        - scan_workers가 2 이상이고 레코드 영역이 PARALLEL_SCAN_MIN_BYTES 이상이면
+          구간별로 나누어 작업 프로세스에서 스캔 (_scan_parallel, 결과는 단일 스캔과 동일)
         
-        # 모든 마커 위치 찾기 (레코드 타입 검증 완화)
-        for marker in markers:
-            pos = 0
-            while True:
-                pos = binary_data.find(marker, pos)
-                if pos == -1:
-                    break
+        Args:
+            data: 전체 파일 내용 (Binary)
+            data_start: 레코드 영역 시작 오프셋
+            marker_re: 마커 정규식
+            with_record_type: True면 마커 앞 1바이트를 레코드 타입으로 포함 (오프라인)
+            record_filter: 추출 필터
+            table: True면 레코드를 슬라이싱하지 않고 result.table에 오프셋만 기록
+        """
+        workers = self.scan_workers or os.cpu_count() or 1
+        if workers > 1 and len(data) - data_start >= PARALLEL_SCAN_MIN_BYTES:
+            return self._scan_parallel(data, data_start, marker_re, with_record_type, record_filter, table, workers)
+        
+        result = ScanResult()
+        if table:
+            result.buffer = data
+        
+        # 1. 레코드 시작 위치 수집
+        starts = self._find_starts(data, data_start, marker_re, with_record_type)
+        result.candidate_count = len(starts)
+        if self.strictness != 'loose':
+            starts = self._validate_boundaries(data, starts, with_record_type)
+            result.rejected_candidates = result.candidate_count - len(starts)
+        
+        # 2-3. 필터 평가 및 레코드 추출
+        self._extract_range(data, starts, len(starts), with_record_type, record_filter, table, result)
+        return result
+    
+    def _find_starts(
+        self,
+        data: bytes,
+        data_start: int,
+        marker_re,
+        with_record_type: bool,
+        lo: Optional[int] = None,
+        hi: Optional[int] = None
+    ) -> List[int]:
+        """
+        레코드 시작 후보 (마커 위치가 [lo, hi) 구간인 것만, 기본값은 data_start부터 끝까지)
+        
+        마커(07 E?)는 서로 겹칠 수 없으므로 구간별로 나누어 찾아도 전체를 한 번에 찾은 결과와 같음
+        """
+        lo = data_start if lo is None else lo
+        end = len(data) if hi is None else hi
+        # 구간 끝 바로 앞 마커의 두 번째 바이트까지 보이도록 1바이트 더 검색
+        matches = marker_re.finditer(data, lo, min(end + 1, len(data)))
+        if not with_record_type:
+            return [m.start() for m in matches if m.start() < end]
+        
+        starts = []
+        for m in matches:
+            pos = m.start()
+            if pos >= end:
+                break
+            if pos > data_start:
                 # 레코드 타입 바이트 확인 (마커 앞 1바이트)
-                if pos > 0:
-                    rec_type = binary_data[pos - 1]
-                    # 레코드 타입 검증 완화: 0x00-0xFF 범위 모두 허용 (너무 엄격한 필터링 제거)
-                    # 단, 0x00은 제외 (일반적으로 유효하지 않음)
-                    if rec_type != 0:
-                        all_marker_positions.append(pos - 1)  # 레코드 타입 포함
-                else:
-                    # 파일 시작 부분의 마커도 포함
-                    all_marker_positions.append(pos)
-                pos += 1
-        
-        # 마커 위치 정렬
-        all_marker_positions.sort()
-        
-        # 각 레코드 추출 (타임스탬프 검증 완화)
-        for i, rec_start in enumerate(all_marker_positions):
-            # rec_start가 음수일 수 있으므로 조정
-            if rec_start < 0:
-                marker_pos = 0
+                # 레코드 타입 검증 완화: 0x00만 제외 (일반적으로 유효하지 않음)
+                if data[pos - 1] != 0:
+                    starts.append(pos - 1)  # 레코드 타입 포함
             else:
-                marker_pos = rec_start + 1  # 레코드 타입 다음이 마커
-            
-            # 타임스탬프 추출 (마커 뒤 6바이트)
-            ts = None
-            if marker_pos + 8 <= len(binary_data):
-                ts_bytes = binary_data[marker_pos+2:marker_pos+8]
-                if len(ts_bytes) == 6:
-                    try:
-                        yy, mm, dd, hh, mi, ss = ts_bytes
-                        # 타임스탬프 검증 완화: 기본적인 범위만 확인
-                        if (0 <= yy <= 99 and 0 <= mm <= 12 and 0 <= dd <= 31 and
-                            0 <= hh < 24 and 0 <= mi < 60 and 0 <= ss < 60):
-                            try:
-                                ts = datetime(2000 + yy, mm, dd, hh, mi, ss)
-                            except:
-                                # 날짜가 유효하지 않아도 레코드는 포함 (예: 2월 30일 등)
-                                # 타임스탬프는 None으로 유지
-                                pass
-                    except:
-                        pass
-            
+                # 레코드 영역 시작 부분의 마커도 포함
+                starts.append(pos)
+        return starts
+    
+    def _extract_range(
+        self,
+        data: bytes,
+        starts: List[int],
+        count: int,
+        with_record_type: bool,
+        record_filter: Optional[RecordFilter],
+        table: bool,
+        result: ScanResult
+    ) -> ScanResult:
+        """
+        starts 앞 count개의 레코드를 추출하여 result에 추가
+        
+        starts[count]가 있으면 마지막 레코드의 끝으로 사용 (구간 스캔 시 다음 구간의 첫 레코드 시작)
+        """
+        # 레코드 타입 다음이 마커
+        marker_offset = 1 if with_record_type else 0
+        
+        # 2. 필터 준비
+        markers = record_types = None
+        since_key = until_key = None
+        if record_filter is not None:
+            markers = record_filter.marker_set()
+            if with_record_type:
+                record_types = record_filter.record_type_set()
+            since_key, until_key = record_filter.time_keys()
+        time_filtered = since_key is not None or until_key is not None
+        
+        # 3. 각 레코드 추출 (타임스탬프 검증 완화)
+        data_len = len(data)
+        records = result.records
+        for i in range(count):
+            rec_start = starts[i]
             # 레코드 데이터: 다음 레코드까지 또는 최대 100바이트
-            if i + 1 < len(all_marker_positions):
-                # 다음 레코드가 있으면 그 전까지
-                record_end = all_marker_positions[i + 1]
+            if i + 1 < len(starts):
+                record_end = starts[i + 1]
             else:
-                # 마지막 레코드면 최대 100바이트 또는 파일 끝까지
-                record_end = min(rec_start + 100, len(binary_data))
+                record_end = min(rec_start + 100, data_len)
+            
+            # 최소 마커 + 타임스탬프 (레코드 타입 없어도 OK)
+            if record_end - rec_start < 8:
+                continue
+            
+            marker_pos = rec_start + marker_offset
             
-            record_data = binary_data[max(0, rec_start):record_end]
+            if markers is not None and (marker_pos + 1 >= data_len or data[marker_pos + 1] not in markers):
+                result.excluded_by_marker += 1
+                continue
             
-            if len(record_data) >= 8:  # 최소 마커 + 타임스탬프 (레코드 타입 없어도 OK)
-                # 타임스탬프가 없어도 레코드는 포함 (타임스탬프는 None으로 유지)
-                records.append((ts, record_data))
+            if record_types is not None and data[rec_start] not in record_types:
+                result.excluded_by_record_type += 1
+                continue
+            
+            # 타임스탬프 (마커 뒤 6바이트)
+            # 타임스탬프 검증 완화: 기본적인 범위만 확인
+            ts_key = None
+            if marker_pos + 8 <= data_len:
+                yy, mm, dd, hh, mi, ss = data[marker_pos + 2:marker_pos + 8]
+                if yy <= 99 and mm <= 12 and dd <= 31 and hh < 24 and mi < 60 and ss < 60:
+                    ts_key = (yy << 40) | (mm << 32) | (dd << 24) | (hh << 16) | (mi << 8) | ss
+            
+            if time_filtered:
+                if (ts_key is None or
+                        (since_key is not None and ts_key < since_key) or
+                        (until_key is not None and ts_key > until_key)):
+                    result.excluded_by_time += 1
+                    continue
+            
+            ts = None
+            if ts_key is not None:
+                try:
+                    ts = datetime(2000 + yy, mm, dd, hh, mi, ss)
+                except ValueError:
+                    # 날짜가 유효하지 않아도 레코드는 포함 (예: 2월 30일 등)
+                    # 타임스탬프는 None으로 유지
+                    if time_filtered:
+                        result.excluded_by_time += 1
+                        continue
+            
+            # 타임스탬프가 없어도 레코드는 포함 (타임스탬프는 None으로 유지)
+            if table:
+                result.table.append((ts_key if ts is not None else None, rec_start, record_end))
+            else:
+                records.append((ts, data[rec_start:record_end]))
+        
+        return result
+    
+    def _validate_boundaries(self, data: bytes, starts: List[int], with_record_type: bool) -> List[int]:
+        """
+        마커 후보 중 레코드 경계로 볼 수 있는 위치만 남김 (데이터는 다시 훑지 않고 후보 위치만 확인)
+        
+        - normal: 마커 뒤 6바이트가 실제 날짜/시각 (월 1-12, 해당 월의 일수, 시/분/초 범위)
+        - strict: normal을 통과한 후보 중
+                  · 연도가 앞 레코드와 다르고 뒤 2개 후보로도 이어지지 않는 후보 제외
+                    (레코드는 시간순으로 기록되므로 연도 경계/링 버퍼 순환 위치의 실제 레코드는
+                    뒤 레코드와 연도가 같음)
+                  · 연도/레코드 타입 분포에서 비율이 STRICT_MIN_SHARE 미만인 값을 가진 후보 제외
+                  (레코드 데이터 안의 07 E?는 뒤 바이트가 임의 값이라 동떨어진/드문 연도, 타입으로 나타남)
+        
+        Returns:
+            경계로 인정된 레코드 시작 위치 (원래 순서 유지)
+        """
+        plausible = self._plausible_boundaries(data, starts, with_record_type)
+        if self.strictness == 'strict':
+            plausible = self._strict_boundaries(plausible)
+        return [start for start, _, _ in plausible]
+    
+    def _plausible_boundaries(
+        self,
+        data: bytes,
+        starts: List[int],
+        with_record_type: bool
+    ) -> List[Tuple[int, int, Optional[int]]]:
+        """타임스탬프가 실제 날짜/시각인 후보 (시작, 연도, 레코드 타입) - 후보별로 독립 판정"""
+        marker_offset = 1 if with_record_type else 0
+        data_len = len(data)
+        plausible = []
+        for start in starts:
+            ts_pos = start + marker_offset + 2
+            if ts_pos + 6 > data_len:
+                continue
+            yy, mm, dd, hh, mi, ss = data[ts_pos:ts_pos + 6]
+            if yy > 99 or hh >= 24 or mi >= 60 or ss >= 60:
+                continue
+            try:
+                datetime(2000 + yy, mm, dd)
+            except ValueError:
+                continue
+            plausible.append((start, yy, data[start] if with_record_type else None))
+        return plausible
+    
+    def _strict_boundaries(
+        self,
+        plausible: List[Tuple[int, int, Optional[int]]]
+    ) -> List[Tuple[int, int, Optional[int]]]:
+        """연도 연속성과 연도/레코드 타입 분포로 후보를 거름 (전체 후보 기준)"""
+        if len(plausible) > 2:
+            # 현재 연도를 따라가며 연도가 바뀌는 후보는 뒤 2개 후보 중 같은 연도가 있을 때만 인정
+            years = [yy for _, yy, _ in plausible]
+            current = next((yy for yy, after in zip(years, years[1:]) if yy == after), years[0])
+            continued = []
+            for i, row in enumerate(plausible):
+                if row[1] != current:
+                    if row[1] not in years[i + 1:i + 3]:
+                        continue
+                    current = row[1]
+                continued.append(row)
+            plausible = continued
+        
+        if len(plausible) >= STRICT_MIN_SAMPLES:
+            min_count = len(plausible) * STRICT_MIN_SHARE
+            years = Counter(yy for _, yy, _ in plausible)
+            record_types = Counter(rtype for _, _, rtype in plausible)
+            plausible = [
+                row for row in plausible
+                if years[row[1]] >= min_count and record_types[row[2]] >= min_count
+            ]
+        
+        return plausible
+    
+    def _scan_parallel(
+        self,
+        data: bytes,
+        data_start: int,
+        marker_re,
+        with_record_type: bool,
+        record_filter: Optional[RecordFilter],
+        table: bool,
+        workers: int
+    ) -> ScanResult:
+        """
+        큰 버퍼를 구간으로 나누어 작업 프로세스에서 스캔 (_scan과 바이트 단위로 같은 결과)
+        
+        - 버퍼는 공유 메모리에 한 번만 복사하고 작업 프로세스는 이름으로 연결
+        - 1단계: 바이트 구간별 마커 후보 (+ normal 이상이면 후보별 타임스탬프 검증)
+          → 이어 붙인 뒤 strict 검증(전체 분포 필요)만 여기서 수행
+        - 2단계: 후보 번호 구간별 레코드 추출. 구간 끝 레코드는 다음 구간 첫 후보까지로 이어 붙임
+          작업 프로세스는 (키, 시작, 끝) 배열만 반환하고 레코드 슬라이싱은 여기서 수행
+        """
+        result = ScanResult()
+        if table:
+            result.buffer = data
+        
+        chunk_count = workers * PARALLEL_SCAN_CHUNKS_PER_WORKER
+        span = len(data) - data_start
+        bounds = [data_start + span * i // chunk_count for i in range(chunk_count)] + [len(data)]
         
-        return records
+        # 작업 프로세스가 같은 resource tracker를 쓰도록 풀 생성 전에 시작
+        resource_tracker.ensure_running()
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        try:
+            shm.buf[:len(data)] = data
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # 1단계: 후보 위치
+                futures = [
+                    executor.submit(
+                        _scan_chunk_starts, shm.name, len(data), data_start, lo, hi,
+                        marker_re, with_record_type, self.strictness
+                    )
+                    for lo, hi in zip(bounds, bounds[1:])
+                ]
+                starts = array('q')
+                years = array('q')
+                record_types = array('q')
+                for future in futures:
+                    raw_count, chunk_starts, chunk_years, chunk_types = future.result()
+                    result.candidate_count += raw_count
+                    starts.extend(chunk_starts)
+                    years.extend(chunk_years)
+                    record_types.extend(chunk_types)
+                
+                if self.strictness == 'strict':
+                    plausible = [
+                        (start, yy, rtype if rtype >= 0 else None)
+                        for start, yy, rtype in zip(starts, years, record_types)
+                    ]
+                    starts = array('q', [start for start, _, _ in self._strict_boundaries(plausible)])
+                result.rejected_candidates = result.candidate_count - len(starts)
+                
+                # 2단계: 레코드 추출 (구간마다 다음 구간 첫 후보를 경계로 함께 전달)
+                step = max(-(-len(starts) // chunk_count), 1)
+                futures = [
+                    executor.submit(
+                        _scan_chunk_records, shm.name, len(data), starts[i:i + step + 1].tobytes(),
+                        min(step, len(starts) - i), with_record_type, record_filter
+                    )
+                    for i in range(0, len(starts), step)
+                ]
+                for future in futures:
+                    keys, rec_starts, rec_ends, excluded = future.result()
+                    result.excluded_by_time += excluded[0]
+                    result.excluded_by_marker += excluded[1]
+                    result.excluded_by_record_type += excluded[2]
+                    if table:
+                        result.table.extend(
+                            (key if key >= 0 else None, start, end)
+                            for key, start, end in zip(keys, rec_starts, rec_ends)
+                        )
+                    else:
+                        result.records.extend(
+                            (_unpack_timestamp(key) if key >= 0 else None, data[start:end])
+                            for key, start, end in zip(keys, rec_starts, rec_ends)
+                        )
+        finally:
+            shm.close()
+            shm.unlink()
+        
+        return result
     
     def _merge_and_deduplicate(
         self, 
@@ -685,60 +1899,17 @@ class FDCNEOConverter:
         
         return result
     
-    def _save_as_online(self, records: List[Tuple[datetime, bytes]], output_file: str):
-        """레코드를 온라인 형식으로 저장"""
+    def _build_online_data(self, records: List[Tuple[datetime, bytes]]) -> bytes:
+        """레코드를 온라인 형식(Hex-String)으로 생성"""
         
         # 파일 타임스탬프
-        now = datetime.now()
-        file_timestamp = bytes([
-            now.year % 100,
-            now.month,
-            now.day,
-            now.hour,
-            now.minute,
-            now.second
-        ])
+        file_timestamp = self._timestamp_bytes(datetime.now())
         
         # 헤더
         header = b'\x00\x0A'
         
         # 레코드 데이터 결합 (모든 레코드 포함, 온라인 형식에 맞게 변환)
-        record_data = b''
-        for ts, data in records:
-            # 오프라인 형식([레코드타입][07][마커][타임스탬프][데이터])을 
-            # 온라인 형식([07][마커][타임스탬프][데이터])으로 변환
-            if len(data) >= 9 and data[1:3] == b'\x07':  # 레코드타입 + 07 + 마커
-                # 레코드 타입 제거하고 온라인 형식으로 변환
-                online_record = data[1:]  # 레코드 타입 제거
-                record_data += online_record
-            elif len(data) >= 8 and data[0:2] == b'\x07':  # 이미 온라인 형식
-                record_data += data
-            else:
-                # 형식 변환 필요
-                marker_pos = data.find(b'\x07')
-                if marker_pos != -1 and marker_pos + 1 < len(data):
-                    marker_byte = data[marker_pos + 1]
-                    # 타임스탬프가 None이면 레코드 데이터에서 타임스탬프 추출 시도
-                    if ts is not None:
-                        ts_bytes = bytes([
-                            ts.year % 100,
-                            ts.month,
-                            ts.day,
-                            ts.hour,
-                            ts.minute,
-                            ts.second
-                        ])
-                    else:
-                        # 타임스탬프가 없으면 레코드 데이터에서 추출 시도 (마커 뒤 6바이트)
-                        if marker_pos + 8 <= len(data):
-                            ts_bytes = data[marker_pos+2:marker_pos+8]
-                            if len(ts_bytes) != 6:
-                                ts_bytes = b'\x00' * 6  # 기본값
-                        else:
-                            ts_bytes = b'\x00' * 6  # 기본값
-                    data_part = data[marker_pos + 8:] if marker_pos + 8 < len(data) else b''
-                    online_record = b'\x07' + bytes([marker_byte]) + ts_bytes + data_part
-                    record_data += online_record
+        record_data = b''.join(self._to_online_record(ts, data) for ts, data in records)
         
         # 전체 데이터
         online_data = file_timestamp + header + record_data
@@ -746,34 +1917,22 @@ class FDCNEOConverter:
         # 병합 결과는 모든 레코드를 포함 (크기 제한 없음)
         # 일반 온라인 파일은 518바이트 제한이지만, 병합 결과는 전체 데이터 포함
         
-        # Hex-String으로 저장
-        hex_string = online_data.hex().upper()
-        with open(output_file, 'w') as f:
-            f.write(hex_string)
+        # Hex-String으로 변환
+        return online_data.hex().upper().encode('ascii')
     
-    def _save_as_offline(self, records: List[Tuple[datetime, bytes]], output_file: str, is_gt: bool = True):
-        """레코드를 오프라인 형식으로 저장"""
-        
-        # ConfigDone 헤더 (10 bytes)
-        config_done = b'ConfigDone'
-        
-        # 설정 데이터 영역 (32 bytes, 오프셋 10-41)
-        config_area_1 = b'\x00' * 32
-        
-        # 시스템 식별자 (오프셋 42부터)
-        if is_gt:
-            identifier = b'GSP'  # 3 bytes
-            config_area_2 = b'\x00' * 228  # 오프셋 45-272 (228 bytes)
-        else:
-            identifier = b'WBVF'  # 4 bytes
-            config_area_2 = b'\x00' * 227  # 오프셋 46-272 (227 bytes)
-        
-        # 인덱스 테이블 (200 bytes, 오프셋 273-472)
-        index_table = b'\x00\x00' + b'B2\x00B1\x00' + b'1\x00\x002\x00\x003\x00\x00'
-        index_table += b'\x00' * (200 - len(index_table))
-        
-        # 레코드 데이터 시작 위치까지 패딩 (~7000 오프셋)
-        record_start_padding = b'\x00' * (7000 - len(config_done) - len(config_area_1) - len(identifier) - len(config_area_2) - len(index_table))
+    def _count_fitting_records(self, records: List[Tuple[datetime, bytes]], site: str) -> int:
+        """오프라인 이미지 1개에 온전히 들어가는 앞쪽 레코드 수"""
+        capacity = offline_capacity(site)
+        used = 0
+        for i, (_, data) in enumerate(records):
+            used += len(data)
+            if used > capacity:
+                return i
+        return len(records)
+    
+    def _build_offline_data(self, records: List[Tuple[datetime, bytes]], is_gt: bool = True) -> bytes:
+        """레코드를 오프라인 형식(Binary)으로 생성"""
+        spec = get_format('offline', 'GT' if is_gt else 'WB')
         
         # 레코드 데이터 결합
         record_data = b''
@@ -781,18 +1940,115 @@ class FDCNEOConverter:
             record_data += data
         
         # 전체 구조
-        offline_data = config_done + config_area_1 + identifier + config_area_2 + index_table + record_start_padding + record_data
+        offline_data = self._offline_header(spec) + record_data
         
         # 목표 크기로 패딩
-        target_size = 524288 if is_gt else 262144
+        target_size = spec.file_size
         if len(offline_data) < target_size:
             offline_data += b'\x00' * (target_size - len(offline_data))
         else:
             offline_data = offline_data[:target_size]
         
-        # Binary로 저장
-        with open(output_file, 'wb') as f:
-            f.write(offline_data)
+        return offline_data
+
+
+def _scan_chunk_starts(
+    shm_name: str,
+    size: int,
+    data_start: int,
+    lo: int,
+    hi: int,
+    marker_re,
+    with_record_type: bool,
+    strictness: str
+) -> Tuple[int, array, array, array]:
+    """
+    병렬 스캔 1단계 (작업 프로세스): 바이트 구간 [lo, hi)의 레코드 시작 후보
+    
+    Returns:
+        (후보 수, 시작 위치, 연도, 레코드 타입) - 연도/레코드 타입은 strict일 때만 채움 (타입 없음 = -1)
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    data = shm.buf[:size]
+    try:
+        converter = FDCNEOConverter(strictness)
+        starts = converter._find_starts(data, data_start, marker_re, with_record_type, lo, hi)
+        raw_count = len(starts)
+        years = array('q')
+        record_types = array('q')
+        if strictness != 'loose':
+            plausible = converter._plausible_boundaries(data, starts, with_record_type)
+            starts = [start for start, _, _ in plausible]
+            if strictness == 'strict':
+                years = array('q', [yy for _, yy, _ in plausible])
+                record_types = array('q', [rtype if rtype is not None else -1 for _, _, rtype in plausible])
+        return raw_count, array('q', starts), years, record_types
+    finally:
+        data.release()
+        shm.close()
+
+
+def _scan_chunk_records(
+    shm_name: str,
+    size: int,
+    starts_bytes: bytes,
+    count: int,
+    with_record_type: bool,
+    record_filter: Optional[RecordFilter]
+) -> Tuple[array, array, array, Tuple[int, int, int]]:
+    """
+    병렬 스캔 2단계 (작업 프로세스): 후보 앞 count개의 레코드 테이블
+    
+    starts_bytes에 count+1번째 후보가 있으면 마지막 레코드의 끝으로 사용
+    
+    Returns:
+        (정수 타임스탬프 키(없으면 -1), 시작, 끝, (시간/마커/레코드 타입 조건 제외 수))
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    data = shm.buf[:size]
+    try:
+        starts = array('q')
+        starts.frombytes(starts_bytes)
+        result = FDCNEOConverter()._extract_range(
+            data, starts, count, with_record_type, record_filter, True, ScanResult()
+        )
+        return (
+            array('q', [key if key is not None else -1 for key, _, _ in result.table]),
+            array('q', [start for _, start, _ in result.table]),
+            array('q', [end for _, _, end in result.table]),
+            (result.excluded_by_time, result.excluded_by_marker, result.excluded_by_record_type)
+        )
+    finally:
+        data.release()
+        shm.close()
+
+
+# 공개 메서드 호출 수/지연 시간/레코드 수 계측 (메트릭 비활성화 시 플래그 확인만)
+instrument_class(FDCNEOConverter)
+
+# 프로파일러는 변환/병합/비교 진입점만 (detect_site 같은 보조 메서드나 다른 모듈이 파일마다 부르는
+# scan_records/scan_table은 보고서를 만들지 않음)
+profile_class(FDCNEOConverter, (
+    'online_to_offline',
+    'online_to_offline_bytes',
+    'offline_to_online',
+    'offline_to_online_bytes',
+    'offline_to_online_pages',
+    'merge_to_online',
+    'merge_to_online_bytes',
+    'merge_to_offline',
+    'merge_to_offline_bytes',
+    'merge_records',
+    'extract_records',
+    'diff',
+    'diff_bytes',
+), file_methods=(
+    'online_to_offline',
+    'offline_to_online',
+    'merge_to_online',
+    'merge_to_offline',
+    'diff',
+))
 
 
 # 테스트 코드
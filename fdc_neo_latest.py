@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Latest
+사이트별 최근 고장 N건 뷰 (디스크에 저장하는 크기 제한 힙, 병합/통합 때마다 증분 갱신)
+
+대시보드의 "사이트별 최근 고장"을 Fault_* 파일 전체 변환·정렬 없이 바로 조회
+"""
+
+import heapq
+import os
+import struct
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fdc_neo_converter import (
+    FDCNEOConverter,
+    RecordFilter,
+    parse_site_id,
+    _atomic_write,
+    _pack_timestamp,
+    _unpack_timestamp,
+)
+from fdc_neo_reader import scan_files
+
+
+# 뷰 파일 구조: [매직 8B][사이트 종류 2B][용량 4B][항목 수 4B] + ([타임스탬프 키 8B][길이 4B][온라인 레코드])...
+LATEST_MAGIC = b'FDCTOP1\x00'
+LATEST_EXT = '.fdct'
+_HEADER = struct.Struct('<8s2sII')
+_ENTRY = struct.Struct('<qI')
+
+# 사이트별 보관할 최근 레코드 수
+DEFAULT_CAPACITY = 100
+
+# Streamlit 앱이 사용할 뷰 디렉토리 (없으면 임시 디렉토리 아래 fdc_neo_latest)
+ENV_DIR = 'FDC_NEO_LATEST_DIR'
+
+_converter = FDCNEOConverter()
+
+
+class SiteLatest:
+    """
+    한 사이트의 최근 레코드 힙 (가장 오래된 레코드가 루트인 최소 힙, 최대 capacity개)
+    
+    레코드는 온라인 형식([07][마커][타임스탬프][데이터])으로 정규화해 보관하므로
+    온라인/오프라인 파일에서 온 같은 고장은 한 번만 들어감 (타임스탬프 + 데이터가 같으면 중복)
+    """
+    
+    def __init__(self, site_id: str, site: str = 'GT', capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError(f"용량은 1 이상이어야 함: {capacity}")
+        self.site_id = site_id
+        self.site = site
+        self.capacity = capacity
+        self.heap: List[Tuple[int, bytes]] = []
+        self._members: Set[Tuple[int, bytes]] = set()
+        self.changed = False  # 마지막 저장 이후 변경 여부
+    
+    def __len__(self) -> int:
+        return len(self.heap)
+    
+    def accepts(self, key: int) -> bool:
+        """이 타임스탬프 키의 레코드가 힙에 들어갈 수 있는지 (가득 찼으면 가장 오래된 레코드보다 최신이어야 함)"""
+        return len(self.heap) < self.capacity or key >= self.heap[0][0]
+    
+    def push(self, key: int, record: bytes) -> bool:
+        """온라인 형식 레코드 1개 추가 (O(log N), 추가했으면 True)"""
+        item = (key, record)
+        if item in self._members:
+            return False
+        if len(self.heap) < self.capacity:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            self._members.discard(heapq.heapreplace(self.heap, item))
+        else:
+            return False
+        self._members.add(item)
+        self.changed = True
+        return True
+    
+    def update(self, records: Iterable[Tuple[Optional[datetime], bytes]]) -> int:
+        """
+        추출 레코드 반영 (O(새 레코드 × log N))
+        
+        힙이 가득 찬 뒤에는 가장 오래된 레코드보다 이전인 레코드를 변환 없이 바로 건너뜀
+        (타임스탬프가 없는 레코드는 제외)
+        
+        Args:
+            records: (타임스탬프, 레코드 데이터) - extract_records 결과 (온라인/오프라인 형식 모두 가능)
+        
+        Returns:
+            추가된 레코드 수 (같은 갱신 중에 다시 밀려난 레코드 포함)
+        """
+        added = 0
+        for ts, data in records:
+            if ts is None:
+                continue
+            key = _pack_timestamp(ts)
+            if not self.accepts(key):
+                continue
+            record = _converter._to_online_record(ts, data)
+            if record and self.push(key, record):
+                added += 1
+        return added
+    
+    def latest(self, n: Optional[int] = None) -> List[Tuple[datetime, bytes]]:
+        """최신순 (타임스탬프, 온라인 레코드) 목록 (n: 최대 개수)"""
+        items = heapq.nlargest(n, self.heap) if n is not None else sorted(self.heap, reverse=True)
+        return [(_unpack_timestamp(key), record) for key, record in items]
+    
+    @property
+    def newest(self) -> Optional[datetime]:
+        return _unpack_timestamp(max(self.heap)[0]) if self.heap else None
+    
+    @property
+    def oldest(self) -> Optional[datetime]:
+        """보관 중인 가장 오래된 레코드 시각 (가득 찬 힙에서는 새 레코드가 들어갈 하한)"""
+        return _unpack_timestamp(self.heap[0][0]) if self.heap else None
+
+
+class LatestFaultsView:
+    """
+    사이트별 최근 고장 뷰 디렉토리
+    
+    파일 구조:
+        <view_dir>/
+            latest_<사이트>.fdct   사이트별 힙 (임시 파일에 기록 후 rename)
+    
+    - 갱신: merge_site_group/run_batch_merge(latest_dir=...), SnapshotLog/SegmentedArchive/FDCNEOConverter(latest=...)
+            또는 update()
+    - 조회: latest() / sites() - 뷰 파일만 읽음 (파일이 바뀌지 않았으면 메모리 캐시 사용)
+    - 용량을 늘리면 이미 밀려난 레코드는 복구되지 않으므로 update_from_files()로 다시 채움
+    - 같은 사이트는 한 프로세스에서만 갱신 (사이트가 다르면 병렬 갱신 가능)
+    """
+    
+    def __init__(self, view_dir: str, capacity: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            view_dir: 뷰 디렉토리 (없으면 생성)
+            capacity: 사이트별 보관할 최근 레코드 수
+        """
+        self.view_dir = view_dir
+        self.capacity = capacity
+        # 사이트 ID → ((mtime_ns, 크기), 힙)
+        self._cache: Dict[str, Tuple[Tuple[int, int], SiteLatest]] = {}
+        os.makedirs(view_dir, exist_ok=True)
+    
+    def path(self, site_id: str) -> str:
+        return os.path.join(self.view_dir, f"latest_{site_id}{LATEST_EXT}")
+    
+    # =====================================================================
+    # 갱신
+    # =====================================================================
+    
+    def update(
+        self,
+        site_id: str,
+        records: Iterable[Tuple[Optional[datetime], bytes]],
+        site: Optional[str] = None
+    ) -> int:
+        """
+        한 사이트에 추출 레코드 반영 후 저장 (추가된 레코드가 없으면 기록하지 않음)
+        
+        Args:
+            site_id: 사이트 ID
+            records: (타임스탬프, 레코드 데이터) 리스트
+            site: 'GT' / 'WB' (새 사이트일 때 기록, 없으면 GT)
+        
+        Returns:
+            추가된 레코드 수 (같은 갱신 중에 다시 밀려난 레코드 포함)
+        """
+        heap = self.load(site_id, site)
+        added = heap.update(records)
+        self.save(heap)
+        return added
+    
+    def update_from_files(
+        self,
+        paths: Iterable[str],
+        record_filter: Optional[RecordFilter] = None
+    ) -> Dict[str, int]:
+        """
+        기존 Fault_*/GT_*/WB_* 파일로 뷰 채우기 (처음 만들 때, 용량을 늘렸을 때)
+        
+        파일은 동시에 미리 읽고, 사이트 ID는 파일명에서 판별 (알 수 없으면 건너뜀)
+        
+        Returns:
+            사이트 ID → 추가된 레코드 수 (읽기/파싱 실패 파일은 건너뜀)
+        """
+        heaps: Dict[str, SiteLatest] = {}
+        added: Dict[str, int] = {}
+        for item, scan in scan_files(paths, record_filter=record_filter):
+            site_id = parse_site_id(item.path)
+            if scan is None or site_id is None:
+                continue
+            if site_id not in heaps:
+                heaps[site_id] = self.load(site_id, _converter.detect_site(item.data, item.path))
+            added[site_id] = added.get(site_id, 0) + heaps[site_id].update(scan.records)
+        for heap in heaps.values():
+            self.save(heap)
+        return added
+    
+    def save(self, heap: SiteLatest):
+        """변경된 힙을 뷰 파일에 기록 (임시 파일 + rename, 중단되어도 이전 뷰가 남음)"""
+        if not heap.changed:
+            return
+        parts = [_HEADER.pack(LATEST_MAGIC, heap.site.encode('ascii'), heap.capacity, len(heap.heap))]
+        for key, record in heap.heap:
+            parts.append(_ENTRY.pack(key, len(record)))
+            parts.append(record)
+        
+        path = self.path(heap.site_id)
+        _atomic_write(path, b''.join(parts))
+        heap.changed = False
+        self._cache[heap.site_id] = (self._stat(path), heap)
+    
+    # =====================================================================
+    # 조회
+    # =====================================================================
+    
+    def load(self, site_id: str, site: Optional[str] = None) -> SiteLatest:
+        """
+        사이트 힙 읽기 (뷰 파일이 없으면 빈 힙)
+        
+        Args:
+            site_id: 사이트 ID
+            site: 새 사이트의 'GT' / 'WB' (기존 뷰는 파일에 기록된 값 사용)
+        """
+        path = self.path(site_id)
+        stat = self._stat(path)
+        cached = self._cache.get(site_id)
+        if cached is not None and cached[0] == stat:
+            return cached[1]
+        
+        if stat is None:
+            heap = SiteLatest(site_id, _converter.detect_site(site=site), self.capacity)
+        else:
+            heap = self._read(path, site_id)
+        self._cache[site_id] = (stat, heap)
+        return heap
+    
+    def latest(self, site_id: str, n: Optional[int] = None) -> List[Tuple[datetime, bytes]]:
+        """
+        사이트의 최근 고장 (최신순 (타임스탬프, 온라인 레코드), 뷰가 없으면 빈 리스트)
+        
+        Args:
+            site_id: 사이트 ID
+            n: 최대 개수 (없으면 보관 중인 전체)
+        """
+        return self.load(site_id).latest(n)
+    
+    def site_ids(self) -> List[str]:
+        """뷰가 있는 사이트 ID 목록"""
+        prefix = 'latest_'
+        return sorted(
+            name[len(prefix):-len(LATEST_EXT)]
+            for name in os.listdir(self.view_dir)
+            if name.startswith(prefix) and name.endswith(LATEST_EXT)
+        )
+    
+    def sites(self) -> List[SiteLatest]:
+        """모든 사이트 힙 (최근 고장이 최신인 사이트 순)"""
+        heaps = [self.load(site_id) for site_id in self.site_ids()]
+        return sorted(heaps, key=lambda heap: heap.newest or datetime.min, reverse=True)
+    
+    def _read(self, path: str, site_id: str) -> SiteLatest:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"최근 고장 뷰 파일이 아님: {path}")
+        magic, site, capacity, count = _HEADER.unpack_from(data, 0)
+        if magic != LATEST_MAGIC:
+            raise ValueError(f"최근 고장 뷰 파일이 아님: {path}")
+        
+        heap = SiteLatest(site_id, site.decode('ascii'), self.capacity)
+        pos = _HEADER.size
+        for _ in range(count):
+            if pos + _ENTRY.size > len(data):
+                raise ValueError(f"최근 고장 뷰 파일이 잘림: {path}")
+            key, length = _ENTRY.unpack_from(data, pos)
+            pos += _ENTRY.size
+            heap.push(key, data[pos:pos + length])
+            pos += length
+        # 저장 당시 용량과 같으면 파일 내용 그대로 (용량을 줄였으면 push에서 오래된 레코드가 밀려남)
+        heap.changed = capacity != self.capacity
+        return heap
+    
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
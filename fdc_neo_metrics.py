@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Metrics
+변환기 처리량/지연 시간 메트릭 (Prometheus 텍스트 형식, 로컬 HTTP 엔드포인트 또는 파일)
+
+비활성화 상태(기본값)에서는 계측 래퍼가 플래그 하나만 확인하고 원래 메서드를 호출
+활성화: enable() 또는 환경 변수 FDC_NEO_METRICS=1
+"""
+
+import atexit
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 환경 변수: 활성화 / HTTP 포트 / 파일 경로 (start_from_env에서 사용)
+ENV_ENABLED = 'FDC_NEO_METRICS'
+ENV_PORT = 'FDC_NEO_METRICS_PORT'
+ENV_FILE = 'FDC_NEO_METRICS_FILE'
+
+# 호출 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """레이블별 값을 가진 메트릭 (모든 갱신은 레지스트리 잠금 안에서)"""
+    type_name = ''
+    
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str], lock: threading.Lock):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = lock
+        self._values: Dict[LabelValues, float] = {}
+    
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """누적 카운터"""
+    type_name = 'counter'
+    
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    """현재 값 (예: 처리 중인 호출 수)"""
+    type_name = 'gauge'
+    
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+    
+    def set(self, *labels: str, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """구간별 누적 히스토그램 (Prometheus histogram_quantile로 p50/p99 계산)"""
+    type_name = 'histogram'
+    
+    def __init__(self, name, help_text, label_names, lock, buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, label_names, lock)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블 → ([구간별 개수 (누적 아님), +Inf 포함], 합계, 개수)
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+    
+    def observe(self, *labels: str, value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0, 0])
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1][0] += value
+            series[1][1] += 1
+    
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series[1][1] if series else 0
+    
+    def quantile(self, q: float, *labels: str) -> Optional[float]:
+        """구간 경계 기준 분위수 추정 (관측값이 없으면 None)"""
+        series = self._series.get(labels)
+        if not series or not series[1][1]:
+            return None
+        rank = q * series[1][1]
+        seen = 0
+        for bound, n in zip(self.buckets + (float('inf'),), series[0]):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float('inf')
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+        for labels, (counts, (total, count)) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 모음 (Prometheus 텍스트 형식 출력)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+    
+    def counter(self, name: str, help_text: str, label_names: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, label_names, self._lock))
+    
+    def gauge(self, name: str, help_text: str, label_names: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, label_names, self._lock))
+    
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, label_names, self._lock, buckets))
+    
+    def _register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (exposition format 0.0.4)"""
+        with self._lock:
+            lines = []
+            for metric in self._metrics.values():
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+    
+    def dump(self, path: str):
+        """파일로 기록 (node_exporter textfile collector 등에서 읽을 수 있도록 임시 파일 후 rename)"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+    
+    def serve(self, port: int = 9464, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """
+        GET /metrics 엔드포인트를 백그라운드 스레드로 실행
+        
+        Returns:
+            HTTP 서버 (종료: server.shutdown())
+        """
+        registry = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name='fdc-neo-metrics', daemon=True).start()
+        return server
+
+
+# =====================================================================
+# 변환기 계측
+# =====================================================================
+
+REGISTRY = MetricsRegistry()
+
+CALLS = REGISTRY.counter(
+    'fdc_neo_calls_total', '변환기 메서드 호출 수 (status: ok/error/cancelled)', ('method', 'status'))
+IN_FLIGHT = REGISTRY.gauge(
+    'fdc_neo_in_flight', '처리 중인 변환기 메서드 호출 수', ('method',))
+DURATION = REGISTRY.histogram(
+    'fdc_neo_call_duration_seconds', '변환기 메서드 호출 지연 시간 (초)', ('method',))
+INPUT_RECORDS = REGISTRY.counter(
+    'fdc_neo_input_records_total', '입력 레코드 수 (ConversionResult.input_record_count)', ('method',))
+OUTPUT_RECORDS = REGISTRY.counter(
+    'fdc_neo_output_records_total', '출력/추출 레코드 수', ('method',))
+DUPLICATE_RECORDS = REGISTRY.counter(
+    'fdc_neo_duplicate_records_total', '중복 제거된 레코드 수 (중복률 = duplicate / input)', ('method',))
+REJECTED_CANDIDATES = REGISTRY.counter(
+    'fdc_neo_rejected_candidates_total', '레코드 경계로 인정되지 않은 마커 후보 수 (strictness)', ('method',))
+
+_enabled = os.environ.get(ENV_ENABLED, '') not in ('', '0')
+_started = False
+_start_lock = threading.Lock()
+
+# 스레드별 계측 중인 호출 깊이 (바깥쪽 공개 메서드 호출만 집계, 안쪽 호출은 그대로 실행)
+_local = threading.local()
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _account(method: str, result):
+    """반환값 종류별 레코드 수 집계 (ConversionResult / ScanResult / 레코드 리스트)"""
+    if hasattr(result, 'success'):
+        INPUT_RECORDS.inc(method, amount=result.input_record_count)
+        OUTPUT_RECORDS.inc(method, amount=result.output_record_count)
+        DUPLICATE_RECORDS.inc(method, amount=result.duplicate_count)
+        REJECTED_CANDIDATES.inc(method, amount=result.rejected_candidates)
+    elif hasattr(result, 'candidate_count'):
+        OUTPUT_RECORDS.inc(method, amount=len(result.records) or len(result.table))
+        REJECTED_CANDIDATES.inc(method, amount=result.rejected_candidates)
+    elif isinstance(result, list):
+        OUTPUT_RECORDS.inc(method, amount=len(result))
+
+
+def _status(result) -> str:
+    return 'ok' if getattr(result, 'success', True) else 'error'
+
+
+def _instrument(method: str, func):
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            if not _enabled or getattr(_local, 'depth', 0):
+                yield from func(*args, **kwargs)
+                return
+            # 제너레이터는 끝까지 순회한 시간을 1회 호출로 기록
+            # (제너레이터 본문이 실행되는 동안만 깊이를 올려, 항목 사이 호출자 코드의 호출은 따로 집계)
+            # 호출자가 도중에 중단(break/close)하면 'cancelled'로 기록
+            IN_FLIGHT.inc(method)
+            start = time.perf_counter()
+            status = 'error'
+            items = None
+            try:
+                items = func(*args, **kwargs)
+                while True:
+                    _local.depth = 1
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        break
+                    finally:
+                        _local.depth = 0
+                    OUTPUT_RECORDS.inc(method, amount=getattr(item, 'record_count', 1))
+                    yield item
+                status = 'ok'
+            except GeneratorExit:
+                status = 'cancelled'
+                raise
+            finally:
+                if items is not None:
+                    items.close()
+                IN_FLIGHT.dec(method)
+                DURATION.observe(method, value=time.perf_counter() - start)
+                CALLS.inc(method, status)
+        return generator_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # 비활성이거나 계측 중인 호출 안의 호출이면 그대로 실행
+        if not _enabled or getattr(_local, 'depth', 0):
+            return func(*args, **kwargs)
+        IN_FLIGHT.inc(method)
+        start = time.perf_counter()
+        status = 'error'
+        _local.depth = 1
+        try:
+            result = func(*args, **kwargs)
+            status = _status(result)
+            _account(method, result)
+            return result
+        finally:
+            _local.depth = 0
+            IN_FLIGHT.dec(method)
+            DURATION.observe(method, value=time.perf_counter() - start)
+            CALLS.inc(method, status)
+    return wrapper
+
+
+def instrument_class(cls):
+    """클래스의 모든 공개 메서드에 계측 래퍼 적용 (메서드 레이블: 메서드 이름, 바깥쪽 호출만 집계)"""
+    for name, func in list(vars(cls).items()):
+        if not name.startswith('_') and inspect.isfunction(func):
+            setattr(cls, name, _instrument(name, func))
+    return cls
+
+
+def start_from_env() -> Optional[ThreadingHTTPServer]:
+    """
+    환경 변수로 메트릭 출력 시작 (프로세스당 한 번만, Streamlit 재실행 시에도 안전)
+    
+    - FDC_NEO_METRICS_PORT: 로컬 HTTP 엔드포인트 (http://127.0.0.1:<포트>/metrics)
+    - FDC_NEO_METRICS_FILE: 종료 시 및 15초마다 파일로 기록
+    둘 중 하나라도 있으면 계측도 활성화
+    
+    Returns:
+        HTTP 서버 (포트가 없거나 이미 시작했으면 None)
+    """
+    global _started
+    port = os.environ.get(ENV_PORT)
+    path = os.environ.get(ENV_FILE)
+    if not port and not path:
+        return None
+    
+    with _start_lock:
+        if _started:
+            return None
+        _started = True
+    
+    enable()
+    server = None
+    if port:
+        server = REGISTRY.serve(int(port))
+    if path:
+        def dump_loop():
+            while True:
+                time.sleep(15)
+                REGISTRY.dump(path)
+        threading.Thread(target=dump_loop, name='fdc-neo-metrics-dump', daemon=True).start()
+        atexit.register(REGISTRY.dump, path)
+    return server
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Profile
+변환기 호출 샘플링 프로파일러 (코드 수정 없이 느린 덤프의 시간 분포 확인)
+
+- 활성화: 환경 변수 FDC_NEO_PROFILE=1 / enable() (프로세스 전체)
+          또는 with profiling(): (현재 스레드만, Streamlit 세션별 사이드바 토글)
+- 변환기 변환/병합 진입점 호출 1회를 별도 스레드에서 주기적으로 호출 스택을 수집하며 실행
+- 경로 기반 변환은 출력 파일 옆에 collapsed stack(<출력>.profile.collapsed, flamegraph.pl/speedscope 입력)과
+  함수별 요약 + 스캐너 통계(<출력>.profile.txt)를 기록
+  (메모리 변환은 profiling()/enable()의 디렉토리 → FDC_NEO_PROFILE_DIR → 현재 디렉토리에 <메서드>_<시각>)
+"""
+
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+from dataclasses import dataclass, field
+
+
+ENV_ENABLED = 'FDC_NEO_PROFILE'
+ENV_DIR = 'FDC_NEO_PROFILE_DIR'
+ENV_INTERVAL = 'FDC_NEO_PROFILE_INTERVAL'  # 샘플링 간격 (ms)
+
+DEFAULT_INTERVAL = 0.005
+COLLAPSED_SUFFIX = '.profile.collapsed'
+SUMMARY_SUFFIX = '.profile.txt'
+
+# 레코드 길이 분포 구간 (스캐너 레코드는 최소 8바이트, 파일 끝 레코드는 최대 100바이트)
+RECORD_LENGTH_BUCKETS = (8, 16, 24, 32, 48, 64, 100)
+
+# 요약에 표시할 함수 수
+SUMMARY_TOP = 30
+
+# 스택에서 뺄 계측 래퍼 모듈 (계측된 메서드 호출마다 끼어 있어 정보가 없음)
+_WRAPPER_MODULES = frozenset({'fdc_neo_profile', 'fdc_neo_metrics'})
+
+
+@dataclass
+class ScanProfile:
+    """스캐너 호출 1회 통계 (파서 관점 주석)"""
+    region_bytes: int  # 레코드 영역 크기
+    candidate_count: int  # 마커 후보 수
+    rejected_candidates: int  # 경계로 인정되지 않은 후보 수
+    record_lengths: List[int] = field(default_factory=list)  # 추출된 레코드 길이
+
+
+@dataclass
+class ProfileReport:
+    """기록된 프로파일 파일"""
+    label: str
+    collapsed_path: str
+    summary_path: str
+    samples: int
+    elapsed: float  # 초
+
+
+class ProfileSession:
+    """
+    샘플링 세션 (with 블록 동안 현재 스레드의 호출 스택을 interval마다 수집)
+    
+    스택은 with 블록을 연 함수부터 기록 (그 위의 호출자 프레임은 제외)
+    """
+    
+    def __init__(self, label: str = 'profile', interval: Optional[float] = None):
+        self.label = label
+        self.interval = interval if interval is not None else _env_interval()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.elapsed = 0.0
+        self.scans: List[ScanProfile] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def __enter__(self) -> 'ProfileSession':
+        self._target = threading.get_ident()
+        self._root = sys._getframe(1)
+        self._previous = getattr(_local, 'session', None)
+        _local.session = self
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='fdc-neo-profile', daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+        _local.session = self._previous
+        self._root = None
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                module = frame.f_globals.get('__name__', '?')
+                if module not in _WRAPPER_MODULES:
+                    code = frame.f_code
+                    stack.append(f"{module}:{getattr(code, 'co_qualname', code.co_name)}")
+                if frame is self._root:
+                    break
+                frame = frame.f_back
+            del frame
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+                self.samples += 1
+    
+    def note_scan(self, scan: ScanProfile):
+        self.scans.append(scan)
+    
+    # =====================================================================
+    # 보고서
+    # =====================================================================
+    
+    def collapsed(self) -> str:
+        """collapsed stack 형식 ('호출자;...;함수 샘플 수', flamegraph.pl / speedscope 입력)"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+    
+    def function_summary(self) -> List[Dict[str, object]]:
+        """함수별 self(맨 위 프레임)/total(스택에 포함) 샘플 수 (self 내림차순)"""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            self_counts[frames[-1]] += count
+            for name in set(frames):
+                total_counts[name] += count
+        return [
+            {'function': name, 'self': self_counts[name], 'total': total}
+            for name, total in sorted(total_counts.items(), key=lambda item: (-self_counts[item[0]], -item[1]))
+        ]
+    
+    def scan_summary(self) -> Dict[str, object]:
+        """스캐너 통계 합계: KB당 마커 후보 수, 레코드당 바이트 분포"""
+        region_bytes = sum(scan.region_bytes for scan in self.scans)
+        candidates = sum(scan.candidate_count for scan in self.scans)
+        lengths = sorted(length for scan in self.scans for length in scan.record_lengths)
+        kb = region_bytes / 1024
+        
+        histogram = Counter()
+        for length in lengths:
+            histogram[_bucket_label(length)] += 1
+        
+        def percentile(p: float) -> int:
+            return lengths[min(int(len(lengths) * p), len(lengths) - 1)] if lengths else 0
+        
+        return {
+            'scan_calls': len(self.scans),
+            'region_bytes': region_bytes,
+            'candidates': candidates,
+            'rejected_candidates': sum(scan.rejected_candidates for scan in self.scans),
+            'records': len(lengths),
+            'marker_hits_per_kb': candidates / kb if kb else 0.0,
+            'records_per_kb': len(lengths) / kb if kb else 0.0,
+            'bytes_per_record': {
+                'mean': sum(lengths) / len(lengths) if lengths else 0.0,
+                'min': lengths[0] if lengths else 0,
+                'p50': percentile(0.5),
+                'p90': percentile(0.9),
+                'p99': percentile(0.99),
+                'max': lengths[-1] if lengths else 0,
+            },
+            'histogram': [(label, histogram[label]) for label in _bucket_labels()],
+        }
+    
+    def summary(self) -> str:
+        """사람이 읽는 요약 (함수별 샘플 비율 + 스캐너 통계)"""
+        total = max(self.samples, 1)
+        lines = [
+            f"# FDC NEO profile: {self.label}",
+            f"# {datetime.now().isoformat(timespec='seconds')}  경과 {self.elapsed:.3f}s  "
+            f"샘플 {self.samples}개 (간격 {self.interval * 1000:.1f}ms)",
+            "",
+            f"{'self%':>7} {'total%':>7} {'self':>7} {'total':>7}  함수",
+        ]
+        for row in self.function_summary()[:SUMMARY_TOP]:
+            lines.append(
+                f"{row['self'] / total:>7.1%} {row['total'] / total:>7.1%} "
+                f"{row['self']:>7} {row['total']:>7}  {row['function']}"
+            )
+        
+        scan = self.scan_summary()
+        if scan['scan_calls']:
+            per_record = scan['bytes_per_record']
+            lines += [
+                "",
+                "# 스캐너",
+                f"스캔 {scan['scan_calls']}회, 레코드 영역 {scan['region_bytes']:,} bytes",
+                f"마커 후보 {scan['candidates']:,}개 ({scan['marker_hits_per_kb']:.2f}/KB), "
+                f"경계 제외 {scan['rejected_candidates']:,}개",
+                f"레코드 {scan['records']:,}개 ({scan['records_per_kb']:.2f}/KB)",
+                f"레코드당 bytes: 평균 {per_record['mean']:.1f}, 최소 {per_record['min']}, "
+                f"p50 {per_record['p50']}, p90 {per_record['p90']}, p99 {per_record['p99']}, 최대 {per_record['max']}",
+                "",
+                f"{'bytes':>9} {'레코드':>9}",
+            ]
+            records = max(scan['records'], 1)
+            for label, count in scan['histogram']:
+                lines.append(f"{label:>9} {count:>9,}  {'#' * round(40 * count / records)}")
+        return '\n'.join(lines) + '\n'
+    
+    def write(self, base_path: str) -> ProfileReport:
+        """<base_path>.profile.collapsed / <base_path>.profile.txt 기록"""
+        collapsed_path = base_path + COLLAPSED_SUFFIX
+        summary_path = base_path + SUMMARY_SUFFIX
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(self.summary())
+        return ProfileReport(self.label, collapsed_path, summary_path, self.samples, self.elapsed)
+
+
+def _bucket_label(length: int) -> str:
+    for lower, upper in zip(RECORD_LENGTH_BUCKETS, RECORD_LENGTH_BUCKETS[1:]):
+        if length < upper:
+            return f"{lower}-{upper - 1}"
+    return f"{RECORD_LENGTH_BUCKETS[-1]}+"
+
+
+def _bucket_labels() -> List[str]:
+    return [_bucket_label(lower) for lower in RECORD_LENGTH_BUCKETS]
+
+
+# =====================================================================
+# 변환기 계측
+# =====================================================================
+
+_local = threading.local()
+_enabled = os.environ.get(ENV_ENABLED, '') not in ('', '0')
+_output_dir: Optional[str] = None
+_reports: List[ProfileReport] = []
+_reports_lock = threading.Lock()
+
+# 보관할 최근 보고서 수 (last_reports)
+_KEEP_REPORTS = 20
+
+
+def enable(output_dir: Optional[str] = None):
+    """
+    프로세스 전체 프로파일링 시작 (모든 스레드, 스크립트/배치 작업용)
+    
+    Args:
+        output_dir: 출력 파일 경로가 없는 호출의 보고서 디렉토리 (없으면 FDC_NEO_PROFILE_DIR / 현재 디렉토리)
+    """
+    global _enabled, _output_dir
+    _enabled = True
+    _output_dir = output_dir
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled or getattr(_local, 'scope', None) is not None
+
+
+def last_reports() -> List[ProfileReport]:
+    """enable()/환경 변수로 기록된 최근 보고서 (최신순, profiling() 보고서는 제외)"""
+    with _reports_lock:
+        return list(reversed(_reports))
+
+
+@contextmanager
+def profiling(
+    output_dir: Optional[str] = None,
+    reports: Optional[List[ProfileReport]] = None
+) -> Iterator[List[ProfileReport]]:
+    """
+    with 블록 안에서 현재 스레드의 변환기 호출만 프로파일링
+    
+    enable()과 달리 다른 스레드(Streamlit의 다른 세션)에는 영향이 없고,
+    보고서는 전역 목록(last_reports) 대신 reports에만 추가함
+    
+    Args:
+        output_dir: 출력 파일 경로가 없는 호출의 보고서 디렉토리 (없으면 FDC_NEO_PROFILE_DIR / 현재 디렉토리)
+        reports: 보고서를 추가할 리스트 (세션별 보관용, 최근 _KEEP_REPORTS개 유지, 없으면 새 리스트)
+    
+    Yields:
+        reports
+    """
+    if reports is None:
+        reports = []
+    previous = getattr(_local, 'scope', None)
+    _local.scope = (output_dir, reports)
+    try:
+        yield reports
+    finally:
+        _local.scope = previous
+
+
+def _env_interval() -> float:
+    value = os.environ.get(ENV_INTERVAL)
+    return float(value) / 1000 if value else DEFAULT_INTERVAL
+
+
+def _report_base(method: str, result, output_dir: Optional[str], writes_output: bool) -> str:
+    """
+    보고서 경로 (확장자 제외)
+    
+    경로 기반 메서드가 실제로 기록한 출력 파일이 있으면 그 옆 (상대 경로/파일명만 있어도),
+    그 밖에는 보고서 디렉토리에 메서드 이름 + 시각 (메모리 변환의 output_file은 권장 파일명일 뿐이므로
+    그대로 쓰면 현재 디렉토리에 기록되고 같은 사이트의 보고서끼리 덮어씀)
+    """
+    output_file = getattr(result, 'output_file', '')
+    if writes_output and output_file and os.path.isfile(output_file):
+        return output_file
+    directory = output_dir or os.environ.get(ENV_DIR) or os.getcwd()
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{method}_{datetime.now().strftime('%y%m%d_%H%M%S_%f')}")
+
+
+def _profile(method: str, func, writes_output: bool = False):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # 비활성이거나 프로파일 중인 호출 안의 호출이면 그대로 실행
+        scope = getattr(_local, 'scope', None)
+        if not (_enabled or scope is not None) or getattr(_local, 'session', None) is not None:
+            return func(*args, **kwargs)
+        with ProfileSession(method) as session:
+            result = func(*args, **kwargs)
+        output_dir, reports = scope if scope is not None else (_output_dir, None)
+        try:
+            report = session.write(_report_base(method, result, output_dir, writes_output))
+        except OSError:
+            # 보고서 기록 실패가 변환 결과에 영향을 주지 않도록 무시
+            return result
+        if reports is not None:
+            reports.append(report)
+            del reports[:-_KEEP_REPORTS]
+        else:
+            with _reports_lock:
+                _reports.append(report)
+                del _reports[:-_KEEP_REPORTS]
+        return result
+    return wrapper
+
+
+def _scan_hook(func):
+    """스캐너 호출마다 활성 세션에 영역 크기 / 마커 후보 / 레코드 길이 기록"""
+    @functools.wraps(func)
+    def wrapper(self, data, data_start, *args, **kwargs):
+        result = func(self, data, data_start, *args, **kwargs)
+        session = getattr(_local, 'session', None)
+        if session is not None:
+            if result.table:
+                lengths = [end - start for _, start, end in result.table]
+            else:
+                lengths = [len(record) for _, record in result.records]
+            session.note_scan(ScanProfile(
+                region_bytes=max(len(data) - data_start, 0),
+                candidate_count=result.candidate_count,
+                rejected_candidates=result.rejected_candidates,
+                record_lengths=lengths
+            ))
+        return result
+    return wrapper
+
+
+def profile_class(
+    cls,
+    methods: Iterable[str],
+    file_methods: Iterable[str] = (),
+    scan_method: str = '_scan'
+):
+    """
+    지정한 진입점 메서드(제너레이터 제외)에 프로파일 래퍼, 스캐너 메서드에 통계 수집 래퍼 적용
+    
+    비활성 상태의 비용은 호출마다 플래그 확인 1회
+    
+    Args:
+        cls: 대상 클래스
+        methods: 보고서를 만들 메서드 이름 (변환/병합 진입점, 보조 메서드는 제외)
+        file_methods: methods 중 결과를 output_file에 기록하는 경로 기반 메서드 (보고서를 출력 파일 옆에 기록)
+        scan_method: 스캐너 메서드 이름
+    """
+    file_methods = set(file_methods)
+    for name in methods:
+        func = vars(cls).get(name)
+        if not inspect.isfunction(func) or inspect.isgeneratorfunction(inspect.unwrap(func)):
+            raise ValueError(f"프로파일할 수 없는 메서드: {cls.__name__}.{name}")
+        setattr(cls, name, _profile(name, func, name in file_methods))
+    if scan_method in vars(cls):
+        setattr(cls, scan_method, _scan_hook(vars(cls)[scan_method]))
+    return cls
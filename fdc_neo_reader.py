@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Reader
+작은 스냅샷 파일 수천~수십만 개를 스레드 풀로 미리 읽어 파서에 바로 공급
+(약 1KB 온라인 파일은 파싱보다 open/read/close 지연이 처리 시간을 좌우하므로 읽기를 겹쳐서 실행)
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+
+from fdc_neo_converter import FDCNEOConverter, RecordFilter, ScanResult
+
+
+# 입력 파일명 접두사 (온라인 GT_/WB_, 오프라인 Fault_)
+INPUT_PREFIXES = ('GT_', 'WB_', 'Fault_')
+
+# 동시에 진행할 읽기 수
+DEFAULT_READ_WORKERS = 16
+# 미리 읽어 둘 최대 파일 수 (메모리 상한 ≈ read_ahead × 파일 크기)
+DEFAULT_READ_AHEAD = 1024
+# 스레드 작업 1개가 연달아 읽는 파일 수 (작은 파일마다 작업을 만들면 스케줄링 비용이 읽기보다 큼)
+DEFAULT_READ_BATCH = 32
+
+_READ_CHUNK = 1 << 16
+
+
+@dataclass
+class ReadItem:
+    """읽은 파일 1개"""
+    path: str
+    data: bytes = b''
+    error: str = ''  # 읽기/파싱 실패 시 오류 메시지 (data는 비어 있을 수 있음)
+    
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def list_input_files(
+    root: str,
+    prefixes: Tuple[str, ...] = INPUT_PREFIXES,
+    recursive: bool = True
+) -> List[str]:
+    """
+    디렉토리의 입력 파일 경로를 읽기 순서대로 반환
+    
+    os.scandir 항목의 inode 번호(Linux/macOS는 추가 stat 없이 디렉토리 항목에 포함)로 정렬
+    대부분의 파일 시스템에서 inode 순서가 디스크 배치 순서에 가까워 탐색이 줄어듦
+    
+    Args:
+        root: 입력 디렉토리
+        prefixes: 대상 파일명 접두사
+        recursive: 하위 디렉토리 포함 여부
+    """
+    entries = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.startswith(prefixes) and entry.is_file():
+                    entries.append((entry.inode(), entry.path))
+    entries.sort()
+    return [path for _, path in entries]
+
+
+def read_file(path: str) -> ReadItem:
+    """파일 전체 읽기 (버퍼 없는 os.open/os.read, 작은 파일은 read 2회로 끝남)"""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            chunks = []
+            while True:
+                chunk = os.read(fd, _READ_CHUNK)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        finally:
+            os.close(fd)
+        return ReadItem(path, b''.join(chunks))
+    except OSError as e:
+        return ReadItem(path, error=str(e))
+
+
+def _read_batch(paths: List[str]) -> List[ReadItem]:
+    return [read_file(path) for path in paths]
+
+
+def prefetch_files(
+    paths: Iterable[str],
+    max_workers: int = DEFAULT_READ_WORKERS,
+    read_ahead: int = DEFAULT_READ_AHEAD,
+    batch_size: int = DEFAULT_READ_BATCH
+) -> Iterator[ReadItem]:
+    """
+    파일을 스레드 풀에서 미리 읽으면서 입력 순서대로 전달
+    
+    경로를 batch_size개씩 묶어 스레드 작업으로 읽고, 소비자가 앞 파일을 처리하는 동안
+    최대 read_ahead개까지 읽기를 진행 (소비가 느리면 읽기도 멈추므로 메모리 사용량이 제한됨)
+    
+    Args:
+        paths: 파일 경로 목록 (list_input_files 순서 권장)
+        max_workers: 읽기 스레드 수
+        read_ahead: 미리 읽어 둘 최대 파일 수
+        batch_size: 스레드 작업 1개가 읽는 파일 수
+    
+    Yields:
+        ReadItem (읽기 실패도 error와 함께 전달, 전체 작업은 멈추지 않음)
+    """
+    batch_size = max(batch_size, 1)
+    max_pending = max(read_ahead // batch_size, 1)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fdc-neo-read') as executor:
+        pending = deque()
+        try:
+            batch = []
+            for path in paths:
+                batch.append(path)
+                if len(batch) < batch_size:
+                    continue
+                pending.append(executor.submit(_read_batch, batch))
+                batch = []
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            if batch:
+                pending.append(executor.submit(_read_batch, batch))
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # 중간에 순회를 멈추면 아직 시작하지 않은 읽기는 취소
+            for future in pending:
+                future.cancel()
+
+
+def scan_files(
+    paths: Iterable[str],
+    kind: Optional[str] = None,
+    record_filter: Optional[RecordFilter] = None,
+    converter: Optional[FDCNEOConverter] = None,
+    max_workers: int = DEFAULT_READ_WORKERS,
+    read_ahead: int = DEFAULT_READ_AHEAD,
+    batch_size: int = DEFAULT_READ_BATCH
+) -> Iterator[Tuple[ReadItem, Optional[ScanResult]]]:
+    """
+    미리 읽은 버퍼를 바로 레코드 스캔 (읽기는 스레드 풀, 파싱은 호출 스레드)
+    
+    Args:
+        paths: 파일 경로 목록
+        kind: 'online' / 'offline' (없으면 파일마다 자동 판별)
+        record_filter: 추출 필터
+        converter: 사용할 변환기 (없으면 기본 설정으로 생성)
+        max_workers: 읽기 스레드 수
+        read_ahead: 미리 읽어 둘 최대 파일 수
+        batch_size: 스레드 작업 1개가 읽는 파일 수
+    
+    Yields:
+        (ReadItem, ScanResult) - 읽기/파싱에 실패한 파일은 ScanResult가 None이고 item.error에 사유
+    """
+    if converter is None:
+        converter = FDCNEOConverter()
+    for item in prefetch_files(paths, max_workers, read_ahead, batch_size):
+        if not item.ok:
+            yield item, None
+            continue
+        try:
+            scan = converter.scan_records(item.data, kind, record_filter)
+        except Exception as e:
+            item.error = str(e)
+            yield item, None
+            continue
+        yield item, scan
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Shared Memory
+레코드 테이블(타임스탬프 키, 오프셋, 레코드 데이터)을 공유 메모리에 올려
+작업 프로세스 간에 레코드 리스트 대신 작은 핸들만 주고받음
+"""
+
+import os
+import struct
+import uuid
+from concurrent.futures import Executor
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass
+
+from fdc_neo_converter import (
+    FDCNEOConverter,
+    RecordFilter,
+    _pack_timestamp,
+    _unpack_timestamp,
+)
+
+
+# 세그먼트 구조: [헤더][타임스탬프 키 int64 × N][오프셋 uint64 × (N+1)][레코드 데이터]
+_HEADER = struct.Struct('<8sQQ')
+SHM_MAGIC = b'FDCSHM1\x00'
+SHM_PREFIX = 'fdcneo'
+
+# 타임스탬프가 없는 레코드의 키
+_NO_TIMESTAMP = -1
+
+
+@dataclass(frozen=True)
+class SharedTableHandle:
+    """공유 메모리 레코드 테이블 핸들 (프로세스 간 전달용, pickle 크기 수십 바이트)"""
+    name: str
+    record_count: int
+    size: int  # 세그먼트 크기 (bytes)
+
+
+def _layout(record_count: int, payload_size: int) -> Tuple[int, int, int]:
+    """(키 시작, 오프셋 시작, 데이터 시작) 위치"""
+    keys_start = _HEADER.size
+    offsets_start = keys_start + 8 * record_count
+    payload_start = offsets_start + 8 * (record_count + 1)
+    return keys_start, offsets_start, payload_start
+
+
+def _write_table(name: Optional[str], keys: List[int], spans: List[Tuple[int, int]], buffer: bytes) -> SharedTableHandle:
+    """키/구간 목록을 공유 메모리 세그먼트 하나로 기록 (buffer[시작:끝]을 이어 붙임)"""
+    count = len(keys)
+    payload_size = sum(end - start for start, end in spans)
+    keys_start, offsets_start, payload_start = _layout(count, payload_size)
+    size = payload_start + payload_size
+    
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    try:
+        view = shm.buf
+        _HEADER.pack_into(view, 0, SHM_MAGIC, count, payload_size)
+        struct.pack_into(f'<{count}q', view, keys_start, *keys)
+        
+        offsets = [0] * (count + 1)
+        pos = payload_start
+        source = memoryview(buffer)
+        for i, (start, end) in enumerate(spans):
+            length = end - start
+            view[pos:pos + length] = source[start:end]
+            pos += length
+            offsets[i + 1] = pos - payload_start
+        struct.pack_into(f'<{count + 1}Q', view, offsets_start, *offsets)
+        
+        source.release()
+        del view
+        handle = SharedTableHandle(shm.name, count, size)
+        shm.close()
+        return handle
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+
+
+def publish_records(records: List[Tuple[datetime, bytes]], name: Optional[str] = None) -> SharedTableHandle:
+    """
+    레코드 리스트를 공유 메모리에 기록
+    
+    Args:
+        records: (타임스탬프, 레코드 데이터) 리스트
+        name: 세그먼트 이름 (SharedTableScope.new_name(), 없으면 자동 생성)
+    
+    Returns:
+        SharedTableHandle (세그먼트 해제 책임은 호출자 → SharedTableScope 사용 권장)
+    """
+    keys = [_pack_timestamp(ts) if ts is not None else _NO_TIMESTAMP for ts, _ in records]
+    buffer = b''.join(data for _, data in records)
+    spans = []
+    pos = 0
+    for _, data in records:
+        spans.append((pos, pos + len(data)))
+        pos += len(data)
+    return _write_table(name, keys, spans, buffer)
+
+
+def extract_to_shared(
+    source,
+    name: str,
+    kind: Optional[str] = None,
+    record_filter: Optional[RecordFilter] = None
+) -> SharedTableHandle:
+    """
+    파일에서 레코드를 추출해 바로 공유 메모리에 기록 (작업 프로세스용 모듈 최상위 함수)
+    
+    레코드를 하나씩 잘라 리스트로 만들지 않고 스캔 테이블 오프셋으로 원본에서 복사
+    
+    Args:
+        source: 파일 경로 또는 파일 내용
+        name: 세그먼트 이름 (부모 프로세스의 SharedTableScope.new_name())
+        kind: 'online' / 'offline' (없으면 자동 판별)
+        record_filter: 추출 필터
+    
+    Returns:
+        SharedTableHandle
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            source = f.read()
+    scan = FDCNEOConverter().scan_table(source, kind, record_filter)
+    keys = [key if key is not None else _NO_TIMESTAMP for key, _, _ in scan.table]
+    spans = [(start, end) for _, start, end in scan.table]
+    return _write_table(name, keys, spans, scan.buffer)
+
+
+class SharedRecordTable:
+    """
+    공유 메모리 레코드 테이블 읽기 (복사 없이 세그먼트를 직접 참조)
+    
+    records()로 기존 형식의 (타임스탬프, 데이터) 리스트를 만들 수 있음
+    """
+    
+    def __init__(self, handle: SharedTableHandle):
+        self.handle = handle
+        self._shm = shared_memory.SharedMemory(name=handle.name)
+        view = self._shm.buf
+        magic, count, payload_size = _HEADER.unpack_from(view, 0)
+        if magic != SHM_MAGIC:
+            self._shm.close()
+            raise ValueError(f"레코드 테이블 세그먼트가 아님: {handle.name}")
+        
+        keys_start, offsets_start, payload_start = _layout(count, payload_size)
+        self.record_count = count
+        self.keys = view[keys_start:offsets_start].cast('q')
+        self.offsets = view[offsets_start:payload_start].cast('Q')
+        self.payload = view[payload_start:payload_start + payload_size]
+    
+    def __len__(self) -> int:
+        return self.record_count
+    
+    def __getitem__(self, i: int) -> Tuple[Optional[datetime], bytes]:
+        key = self.keys[i]
+        ts = _unpack_timestamp(key) if key != _NO_TIMESTAMP else None
+        return ts, bytes(self.payload[self.offsets[i]:self.offsets[i + 1]])
+    
+    def records(self) -> List[Tuple[Optional[datetime], bytes]]:
+        """(타임스탬프, 레코드 데이터) 리스트로 변환"""
+        return [self[i] for i in range(self.record_count)]
+    
+    def close(self):
+        """세그먼트 참조 해제 (unlink는 SharedTableScope가 담당)"""
+        if self._shm is None:
+            return
+        for view in (self.keys, self.offsets, self.payload):
+            view.release()
+        self._shm.close()
+        self._shm = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SharedTableScope:
+    """
+    공유 메모리 세그먼트 수명 관리
+    
+    - 세그먼트 이름은 이 범위에서 발급 (new_name) → 작업 프로세스가 그 이름으로 생성
+    - 범위를 벗어날 때 (성공/예외/KeyboardInterrupt 등 취소) 발급한 모든 이름을 unlink
+      (아직 생성되지 않았거나 이미 지워진 이름은 무시)
+    - 작업 프로세스 풀은 이 범위 안에서 with로 열어야 실행 중인 작업이 끝난 뒤 정리됨
+    
+    사용 예:
+        with SharedTableScope() as scope:
+            with ProcessPoolExecutor() as executor:
+                tables = scope.map_extract(executor, paths)
+            merged = converter._merge_and_deduplicate(tables[a].records(), tables[b].records())
+    """
+    
+    def __init__(self, prefix: str = SHM_PREFIX):
+        self.prefix = prefix
+        self._names: List[str] = []
+        self._tables: List[SharedRecordTable] = []
+        # 작업 프로세스가 부모와 같은 resource tracker를 쓰도록 풀 생성 전에 시작
+        # (작업 프로세스마다 tracker가 생기면 작업 프로세스 종료 시 세그먼트가 지워짐)
+        resource_tracker.ensure_running()
+    
+    def new_name(self) -> str:
+        # POSIX 공유 메모리 이름 길이 제한(macOS 31자)을 고려해 짧게
+        name = f"{self.prefix}_{os.getpid()}_{uuid.uuid4().hex[:12]}"
+        self._names.append(name)
+        return name
+    
+    def publish(self, records: List[Tuple[datetime, bytes]]) -> SharedTableHandle:
+        return publish_records(records, self.new_name())
+    
+    def attach(self, handle: SharedTableHandle) -> SharedRecordTable:
+        table = SharedRecordTable(handle)
+        self._tables.append(table)
+        return table
+    
+    def map_extract(
+        self,
+        executor: Executor,
+        sources: Iterable,
+        kind: Optional[str] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> Dict[object, SharedRecordTable]:
+        """
+        파일별 추출을 작업 프로세스에서 실행하고 결과 테이블을 연결
+        
+        Args:
+            executor: 작업 프로세스 풀
+            sources: 파일 경로 목록
+            kind: 'online' / 'offline' (없으면 파일마다 자동 판별)
+            record_filter: 추출 필터
+        
+        Returns:
+            경로 → SharedRecordTable
+        """
+        futures = {
+            source: executor.submit(extract_to_shared, source, self.new_name(), kind, record_filter)
+            for source in sources
+        }
+        return {source: self.attach(future.result()) for source, future in futures.items()}
+    
+    def close(self):
+        """연결한 테이블을 닫고 발급한 모든 세그먼트 unlink"""
+        for table in self._tables:
+            table.close()
+        self._tables.clear()
+        
+        for name in self._names:
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+            except FileNotFoundError:
+                continue
+            shm.close()
+            shm.unlink()
+        self._names.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
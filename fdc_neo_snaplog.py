@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Snapshot Log
+사이트별 온라인 스냅샷 로그 (GT_/WB_ 파일 수만 개를 추가 기록 전용 로그 파일 1개로 통합)
+"""
+
+import bisect
+import os
+import struct
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from fdc_neo_converter import (
+    FDCNEOConverter,
+    ConversionResult,
+    RecordFilter,
+    ScanResult,
+    BufferSource,
+    get_format,
+    _pack_timestamp,
+    _unpack_timestamp,
+)
+from fdc_neo_latest import LatestFaultsView
+from fdc_neo_reader import prefetch_files
+
+
+# 로그 구조: [매직 8B] + ([페이로드 길이 4B][Hex 디코딩된 온라인 파일 내용])...
+# 인덱스 구조: [매직 8B] + ([파일 타임스탬프 키 8B][페이로드 오프셋 8B][길이 4B])... (로그 기록 순서)
+LOG_MAGIC = b'FDCLOG1\x00'
+INDEX_MAGIC = b'FDCLIX1\x00'
+LOG_EXT = '.fdcl'
+INDEX_EXT = '.idx'
+_LENGTH = struct.Struct('<I')
+_INDEX_ENTRY = struct.Struct('<qQI')
+
+# 파일 타임스탬프가 유효하지 않은 스냅샷의 키
+_NO_TIMESTAMP = -1
+
+
+@dataclass(frozen=True)
+class LogEntry:
+    """로그에 기록된 스냅샷 1개 (오프셋 인덱스 한 행)"""
+    key: int  # 파일 타임스탬프 정수 키 (_pack_timestamp, 없으면 -1)
+    offset: int  # 로그 파일 내 페이로드 시작 오프셋
+    length: int  # 페이로드 길이
+    
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        return _unpack_timestamp(self.key) if self.key != _NO_TIMESTAMP else None
+    
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+
+@dataclass
+class IngestStats:
+    """스냅샷 파일 통합 결과"""
+    added: int = 0  # 로그에 추가된 스냅샷 수
+    duplicates: int = 0  # 같은 내용이 이미 있어 건너뛴 스냅샷 수
+    removed: int = 0  # 통합 후 삭제한 원본 파일 수
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (경로, 오류 메시지)
+
+
+def _file_key(payload: bytes) -> int:
+    """온라인 파일 앞 6바이트 타임스탬프 → 정수 키 (유효하지 않으면 -1)"""
+    if len(payload) < 6:
+        return _NO_TIMESTAMP
+    yy, mm, dd, hh, mi, ss = payload[:6]
+    try:
+        return _pack_timestamp(datetime(2000 + yy, mm, dd, hh, mi, ss))
+    except ValueError:
+        return _NO_TIMESTAMP
+
+
+class SnapshotLog:
+    """
+    사이트별 온라인 스냅샷 로그
+    
+    파일 구조:
+        <log_dir>/
+            GT_<사이트>.fdcl       스냅샷 로그 (길이 접두 + Hex 디코딩된 내용, 추가 기록 전용)
+            GT_<사이트>.fdcl.idx   오프셋 인덱스 (파일 타임스탬프 키, 오프셋, 길이)
+    
+    - 추가는 로그 → 인덱스 순서로 기록. 열 때 인덱스가 로그보다 짧으면 로그를 따라가며 복구하고,
+      기록 도중 중단되어 잘린 마지막 항목은 잘라냄
+    - 조회는 파일 타임스탬프 범위로 인덱스를 찾고, 로그에서 이어진 항목들은 한 번에 읽음
+    - 레코드 추출은 온라인 파일과 같은 스캐너 사용 (Hex 디코딩만 생략)
+    - 기록은 한 프로세스에서만 (동시 기록 잠금 없음)
+    """
+    
+    def __init__(
+        self,
+        log_dir: str,
+        site_id: str,
+        site: str = 'GT',
+        latest: Optional[LatestFaultsView] = None
+    ):
+        """
+        Args:
+            log_dir: 로그 디렉토리 (없으면 생성)
+            site_id: 사이트 ID
+            site: 'GT' 또는 'WB'
+            latest: 최근 고장 뷰 (지정 시 새로 추가된 스냅샷의 레코드로 갱신)
+        """
+        self.converter = FDCNEOConverter()
+        self.site = self.converter.detect_site(site=site)
+        self.site_id = site_id
+        self.latest = latest
+        prefix = get_format('online', self.site).file_prefix
+        self.log_path = os.path.join(log_dir, f"{prefix}_{site_id}{LOG_EXT}")
+        self.index_path = self.log_path + INDEX_EXT
+        # (키, 오프셋) 순으로 정렬된 인덱스
+        self.entries: List[LogEntry] = []
+        self._sort_keys: List[Tuple[int, int]] = []
+        
+        os.makedirs(log_dir, exist_ok=True)
+        self._load()
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    # =====================================================================
+    # 기록
+    # =====================================================================
+    
+    def append(self, data: BufferSource, sync: bool = True) -> bool:
+        """
+        온라인 파일 1개 추가
+        
+        Args:
+            data: 온라인 파일 내용 (Hex-String)
+            sync: 기록 후 fsync 여부
+        
+        Returns:
+            추가했으면 True, 같은 스냅샷(파일 타임스탬프 + 내용)이 이미 있으면 False
+        """
+        payload = self._decode(data)
+        with open(self.log_path, 'ab') as log_f, open(self.index_path, 'ab') as index_f:
+            added = self._append(log_f, index_f, payload)
+            self._sync(log_f, index_f, sync)
+        if added and self.latest is not None:
+            self.latest.update(self.site_id, self.converter._scan_online_binary(payload).records, self.site)
+        return added
+    
+    def ingest(self, paths: Iterable[str], remove_sources: bool = False) -> IngestStats:
+        """
+        온라인 파일들을 로그에 통합 (파일은 동시에 미리 읽음, fsync는 마지막에 한 번)
+        
+        Args:
+            paths: 온라인 파일 경로 목록
+            remove_sources: 로그에 기록(또는 이미 있음)이 확인된 원본 파일 삭제
+        
+        Returns:
+            IngestStats (읽기/형식 오류 파일은 failed에 기록하고 계속 진행)
+        """
+        stats = IngestStats()
+        stored = []
+        heap = self.latest.load(self.site_id, self.site) if self.latest is not None else None
+        with open(self.log_path, 'ab') as log_f, open(self.index_path, 'ab') as index_f:
+            for item in prefetch_files(paths):
+                if not item.ok:
+                    stats.failed.append((item.path, item.error))
+                    continue
+                try:
+                    payload = self._decode(item.data)
+                except ValueError as e:
+                    stats.failed.append((item.path, str(e)))
+                    continue
+                if self._append(log_f, index_f, payload):
+                    stats.added += 1
+                    if heap is not None:
+                        heap.update(self.converter._scan_online_binary(payload).records)
+                else:
+                    stats.duplicates += 1
+                stored.append(item.path)
+            self._sync(log_f, index_f, True)
+        
+        # 최근 고장 뷰는 로그 기록 후 한 번만 저장
+        if heap is not None:
+            self.latest.save(heap)
+        
+        # 로그가 디스크에 기록된 뒤에만 원본 삭제
+        if remove_sources:
+            for path in stored:
+                try:
+                    os.remove(path)
+                    stats.removed += 1
+                except OSError as e:
+                    stats.failed.append((path, str(e)))
+        return stats
+    
+    # =====================================================================
+    # 조회
+    # =====================================================================
+    
+    def select(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[LogEntry]:
+        """
+        파일 타임스탬프 범위의 스냅샷 (양 끝 포함, 시각 순)
+        
+        범위를 지정하면 파일 타임스탬프가 없는 스냅샷은 제외
+        """
+        if since is None and until is None:
+            return list(self.entries)
+        keys = self._sort_keys
+        lo = bisect.bisect_left(keys, (_pack_timestamp(since) if since is not None else 0, 0))
+        hi = bisect.bisect_left(keys, (_pack_timestamp(until) + 1, 0)) if until is not None else len(keys)
+        return self.entries[lo:hi]
+    
+    def read_payloads(self, entries: List[LogEntry]) -> List[bytes]:
+        """
+        스냅샷 내용 읽기 (로그에서 이어진 항목들은 read 한 번으로 읽음)
+        
+        Returns:
+            entries 순서대로 Hex 디코딩된 온라인 파일 내용
+        """
+        payloads: Dict[int, bytes] = {}
+        with open(self.log_path, 'rb') as f:
+            for run in self._contiguous_runs(entries):
+                start = run[0].offset
+                f.seek(start)
+                chunk = f.read(run[-1].end - start)
+                for entry in run:
+                    payloads[entry.offset] = chunk[entry.offset - start:entry.end - start]
+        return [payloads[entry.offset] for entry in entries]
+    
+    def iter_snapshots(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> Iterator[Tuple[LogEntry, ScanResult]]:
+        """
+        스냅샷별 레코드 스캔 (시각 순)
+        
+        Args:
+            since/until: 파일 타임스탬프 범위
+            record_filter: 레코드 추출 필터
+        
+        Yields:
+            (LogEntry, ScanResult)
+        """
+        entries = self.select(since, until)
+        for entry, payload in zip(entries, self.read_payloads(entries)):
+            yield entry, self.converter._scan_online_binary(payload, record_filter)
+    
+    def merge(
+        self,
+        output_format: str = 'online',
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        record_filter: Optional[RecordFilter] = None
+    ) -> ConversionResult:
+        """
+        범위 안의 스냅샷을 병합 (연속된 스냅샷 간에 겹치는 레코드는 중복 제거)
+        
+        중복 규칙은 일괄 병합과 동일: 더 최근 스냅샷에 같은 레코드(타임스탬프 + 데이터)가 있으면
+        이전 스냅샷의 레코드는 제외, 같은 스냅샷 내 중복과 타임스탬프 없는 레코드는 유지
+        
+        Args:
+            output_format: 'online' 또는 'offline'
+            since/until: 파일 타임스탬프 범위
+            record_filter: 레코드 추출 필터
+        
+        Returns:
+            ConversionResult (output_data에 출력 파일 내용)
+        """
+        try:
+            scans = [scan for _, scan in self.iter_snapshots(since, until, record_filter)]
+            
+            # 최신 스냅샷부터 한 번만 순회하며 이미 본 레코드 제외
+            merged = []
+            seen = set()
+            input_count = 0
+            for scan in reversed(scans):
+                input_count += len(scan.records)
+                keys = set()
+                for ts, data in scan.records:
+                    if ts is None:
+                        merged.append((ts, data))
+                    elif (ts, data) not in seen:
+                        merged.append((ts, data))
+                        keys.add((ts, data))
+                seen |= keys
+            
+            result = self.converter.merge_records(merged, [], output_format=output_format, site=self.site)
+            result.input_record_count = input_count
+            result.online_record_count = input_count
+            result.duplicate_count = input_count - result.output_record_count
+            result.message = f"스냅샷 {len(scans)}개 병합: " + result.message
+            return self.converter._add_scan_stats(result, *scans)
+        
+        except Exception as e:
+            return ConversionResult(
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"병합 실패: {str(e)}"
+            )
+    
+    def export(
+        self,
+        output_dir: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> ConversionResult:
+        """
+        범위 안의 스냅샷을 원래 형식의 온라인 파일(GT_<사이트>_<yymmdd>_<hhmmss>.txt)로 내보내기
+        
+        Returns:
+            ConversionResult (output_files에 출력 파일 경로)
+        """
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            prefix = get_format('online', self.site).file_prefix
+            entries = self.select(since, until)
+            output_files = []
+            used_names = set()
+            for entry, payload in zip(entries, self.read_payloads(entries)):
+                ts = entry.timestamp
+                stamp = ts.strftime('%y%m%d_%H%M%S') if ts is not None else f"{entry.offset:012d}"
+                file_name = f"{prefix}_{self.site_id}_{stamp}.txt"
+                # 같은 시각의 스냅샷이 여러 개면 일련번호 추가
+                n = 2
+                while file_name in used_names:
+                    file_name = f"{prefix}_{self.site_id}_{stamp}_{n}.txt"
+                    n += 1
+                used_names.add(file_name)
+                
+                path = os.path.join(output_dir, file_name)
+                with open(path, 'wb') as f:
+                    f.write(payload.hex().upper().encode('ascii'))
+                output_files.append(path)
+            
+            return ConversionResult(
+                success=True,
+                output_file=output_dir,
+                record_count=len(output_files),
+                message=f"내보내기 성공: 스냅샷 {len(output_files)}개",
+                output_files=output_files
+            )
+        
+        except Exception as e:
+            return ConversionResult(
+                success=False,
+                output_file="",
+                record_count=0,
+                message=f"내보내기 실패: {str(e)}"
+            )
+    
+    # =====================================================================
+    # 내부 함수
+    # =====================================================================
+    
+    def _decode(self, data: BufferSource) -> bytes:
+        raw = self.converter._read_buffer(data)
+        if not self.converter._is_hex_text(raw):
+            raise ValueError("온라인 파일(Hex-String)이 아님")
+        return bytes.fromhex(raw.decode('ascii').strip())
+    
+    def _append(self, log_f, index_f, payload: bytes) -> bool:
+        key = _file_key(payload)
+        if self._contains(key, payload, log_f):
+            return False
+        
+        offset = log_f.tell() + _LENGTH.size
+        log_f.write(_LENGTH.pack(len(payload)) + payload)
+        entry = LogEntry(key, offset, len(payload))
+        index_f.write(_INDEX_ENTRY.pack(entry.key, entry.offset, entry.length))
+        self._insert(entry)
+        return True
+    
+    def _insert(self, entry: LogEntry):
+        pos = bisect.bisect_right(self._sort_keys, (entry.key, entry.offset))
+        self._sort_keys.insert(pos, (entry.key, entry.offset))
+        self.entries.insert(pos, entry)
+    
+    def _contains(self, key: int, payload: bytes, log_f) -> bool:
+        """같은 파일 타임스탬프의 스냅샷 중 내용까지 같은 것이 있는지 (같은 키가 있을 때만 로그를 읽음)"""
+        lo = bisect.bisect_left(self._sort_keys, (key, 0))
+        hi = bisect.bisect_left(self._sort_keys, (key + 1, 0))
+        candidates = [entry for entry in self.entries[lo:hi] if entry.length == len(payload)]
+        if not candidates:
+            return False
+        log_f.flush()
+        return payload in self.read_payloads(candidates)
+    
+    def _contiguous_runs(self, entries: List[LogEntry]) -> List[List[LogEntry]]:
+        """로그 안에서 바로 이어진 항목끼리 묶음 (오프셋 순)"""
+        runs = []
+        for entry in sorted(entries, key=lambda e: e.offset):
+            if runs and entry.offset == runs[-1][-1].end + _LENGTH.size:
+                runs[-1].append(entry)
+            else:
+                runs.append([entry])
+        return runs
+    
+    def _sync(self, log_f, index_f, sync: bool):
+        log_f.flush()
+        if sync:
+            os.fsync(log_f.fileno())
+        index_f.flush()
+        if sync:
+            os.fsync(index_f.fileno())
+    
+    def _load(self):
+        """인덱스를 읽고 로그와 맞춤 (인덱스에 없는 로그 뒷부분은 다시 색인, 잘린 항목은 잘라냄)"""
+        if not os.path.exists(self.log_path):
+            with open(self.log_path, 'wb') as f:
+                f.write(LOG_MAGIC)
+            with open(self.index_path, 'wb') as f:
+                f.write(INDEX_MAGIC)
+            return
+        
+        with open(self.log_path, 'rb') as f:
+            if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+                raise ValueError(f"스냅샷 로그 파일이 아님: {self.log_path}")
+        log_size = os.path.getsize(self.log_path)
+        
+        entries = []
+        index_data = b''
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as f:
+                index_data = f.read()
+        if index_data[:len(INDEX_MAGIC)] == INDEX_MAGIC:
+            body = index_data[len(INDEX_MAGIC):]
+            whole = len(body) - len(body) % _INDEX_ENTRY.size
+            for key, offset, length in _INDEX_ENTRY.iter_unpack(body[:whole]):
+                if offset + length > log_size:
+                    break
+                entries.append(LogEntry(key, offset, length))
+        
+        # 인덱스 이후 로그 항목 다시 색인
+        indexed_end = entries[-1].end if entries else len(LOG_MAGIC)
+        with open(self.log_path, 'rb') as f:
+            f.seek(indexed_end)
+            pos = indexed_end
+            while True:
+                prefix = f.read(_LENGTH.size)
+                if len(prefix) < _LENGTH.size:
+                    break
+                (length,) = _LENGTH.unpack(prefix)
+                payload = f.read(length)
+                if len(payload) < length:
+                    break
+                entries.append(LogEntry(_file_key(payload), pos + _LENGTH.size, length))
+                pos += _LENGTH.size + length
+        
+        # 잘린 마지막 항목 제거 후 인덱스를 로그에 맞춰 다시 기록
+        if pos < log_size:
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(pos)
+        expected = INDEX_MAGIC + b''.join(
+            _INDEX_ENTRY.pack(entry.key, entry.offset, entry.length) for entry in entries
+        )
+        if index_data != expected:
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(expected)
+            os.replace(tmp_path, self.index_path)
+        
+        for entry in entries:
+            self._insert(entry)
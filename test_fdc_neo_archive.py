@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Archive 테스트
+같은 스냅샷을 다시 병합해도 아카이브가 늘어나지 않는지 확인
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from fdc_neo_archive import SegmentedArchive
+from fdc_neo_converter import FDCNEOConverter
+
+
+def _online_snapshot(count: int = 15, markers=(0xE9, 0xEA, 0xE7, 0xEB)) -> bytes:
+    """온라인 스냅샷 (Hex-String): markers를 돌아가며 쓰는 레코드 count개"""
+    converter = FDCNEOConverter()
+    base = datetime(2026, 1, 7, 6, 40)
+    records = []
+    for i in range(count):
+        ts = base + timedelta(minutes=7 * i)
+        data = bytes([0x10 + i, 0x20, 0x55, 0x01 + i % 3])
+        records.append((ts, b'\x07' + bytes([markers[i % len(markers)]]) + converter._timestamp_bytes(ts) + data))
+    return converter._build_online_data(records)
+
+
+def _offline_records() -> list:
+    """오프라인 레코드 (레코드 타입 포함) 20개, 2026-01-08부터 30분 간격"""
+    converter = FDCNEOConverter()
+    base = datetime(2026, 1, 8, 0, 0)
+    records = []
+    for i in range(20):
+        ts = base + timedelta(minutes=30 * i)
+        record = bytes([1 + i % 3, 0x07, 0xE7 + i % 2]) + converter._timestamp_bytes(ts) + bytes([0x30 + i, 0x55])
+        records.append((ts, record))
+    return records
+
+
+def _offline_image() -> bytes:
+    """오프라인 이미지 (Fault_GT): _offline_records()"""
+    return FDCNEOConverter()._build_offline_data(_offline_records(), is_gt=True)
+
+
+def test_merge_same_snapshot_twice_adds_nothing(tmp_path):
+    archive = SegmentedArchive(str(tmp_path), 'GT', 'N24987L02')
+    assert archive.merge(_offline_image(), 'offline').output_record_count == 20
+    
+    snapshot = _online_snapshot()
+    first = archive.merge(snapshot, 'online')
+    assert first.success
+    assert first.output_record_count == 15
+    
+    second = SegmentedArchive(str(tmp_path)).merge(snapshot, 'online')
+    assert second.success
+    assert second.output_record_count == 0
+    assert second.duplicate_count == 15
+    assert second.record_count == 35
+
+
+def test_online_records_stored_in_offline_form(tmp_path):
+    archive = SegmentedArchive(str(tmp_path), 'GT', 'N24987L02')
+    archive.merge(_online_snapshot(), 'online')
+    
+    records = SegmentedArchive(str(tmp_path)).read()
+    assert len(records) == 15
+    # [레코드 타입][07][마커][타임스탬프] - 온라인 레코드도 레코드 타입 바이트가 붙어 있음
+    assert all(data[1] == 0x07 and data[2] in (0xE7, 0xE9, 0xEA, 0xEB) for _, data in records)
+    assert [ts for ts, _ in records] == sorted(ts for ts, _ in records)
+
+
+def test_online_copy_of_archived_offline_record_is_duplicate(tmp_path):
+    converter = FDCNEOConverter()
+    # 오프라인 이미지에 있을 수 있는 마커만 (EA/EB는 오프라인 스캐너가 경계로 보지 않음)
+    snapshot = _online_snapshot(markers=(0xE7, 0xE9))
+    online_records = converter.extract_records(snapshot, 'online')
+    # 같은 고장의 오프라인 사본 (레코드 타입 바이트는 온라인 기본값과 다르게)
+    # + 이미지 끝 패딩이 붙는 마지막 레코드는 스냅샷에 없는 레코드
+    offline_records = [(ts, b'\x03' + data) for ts, data in online_records]
+    offline_records += _offline_records()[:1]
+    
+    archive = SegmentedArchive(str(tmp_path), 'GT', 'N24987L02')
+    archive.merge(converter._build_offline_data(offline_records, is_gt=True), 'offline')
+    
+    result = archive.merge(snapshot, 'online')
+    assert result.output_record_count == 0
+    assert result.duplicate_count == 15
+    assert result.record_count == 16
+
+
+def test_archive_files_are_fsynced_before_rename(tmp_path, monkeypatch):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, 'fsync', lambda fd: synced.append(fd) or real_fsync(fd))
+    SegmentedArchive(str(tmp_path), 'GT', 'N24987L02').merge(_offline_image(), 'offline')
+    
+    # 세그먼트, 세그먼트 인덱스, manifest, Bloom filter 모두 임시 파일에서 fsync 후 rename
+    written = os.listdir(tmp_path)
+    assert not any(name.endswith('.tmp') for name in written)
+    assert len(synced) == len(written) == 4
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Batch 테스트
+재시작한 일괄 병합에서 건너뛴 사이트의 파일 상태가 처리한 사이트와 같은 형태인지 확인
+"""
+
+from fdc_neo_batch import run_resumable_batch
+from test_fdc_neo_archive import _offline_image, _online_snapshot
+
+
+def test_resumed_batch_reports_skipped_files_by_full_path(tmp_path):
+    input_dir = tmp_path / 'input'
+    input_dir.mkdir()
+    (input_dir / 'Fault_GT_N24987L02.txt').write_bytes(_offline_image())
+    (input_dir / 'GT_N24987L02_260107_0700.txt').write_bytes(_online_snapshot())
+    paths = sorted(str(path) for path in input_dir.iterdir())
+    output_dir = str(tmp_path)
+    
+    [first] = run_resumable_batch(paths, 'offline', output_dir, max_workers=1)
+    assert first.result.success
+    assert all(status.status != '건너뜀' for status in first.files)
+    
+    # 입력이 바뀌지 않았으면 건너뛰고, 파일 상태는 처음 실행과 같은 전체 경로로 보고
+    [second] = run_resumable_batch(paths, 'offline', output_dir, max_workers=1)
+    assert second.result.success
+    assert [status.status for status in second.files] == ['건너뜀', '건너뜀']
+    assert sorted(status.filename for status in second.files) == sorted(status.filename for status in first.files) == paths
+    assert {status.filename: status.record_count for status in second.files} == \
+        {status.filename: status.record_count for status in first.files}
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Catalog 테스트
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+
+from fdc_neo_catalog import SiteCatalog, scan_file
+from test_fdc_neo_archive import _offline_image
+
+
+def test_touched_file_is_not_parsed_again(tmp_path):
+    path = tmp_path / 'Fault_GT_N24987L02.txt'
+    path.write_bytes(_offline_image())
+    
+    with SiteCatalog(str(tmp_path / 'catalog.db')) as catalog:
+        assert catalog.refresh(str(tmp_path), max_workers=1).scanned == 1
+        entry = catalog.files('N24987L02')[0]
+        assert scan_file(str(path), entry.content_hash) is None
+        
+        # 내용은 그대로, 수정 시각만 변경
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        stats = catalog.refresh(str(tmp_path), max_workers=1)
+        assert (stats.scanned, stats.touched) == (0, 1)
+        assert catalog.files('N24987L02')[0].mtime_ns == st.st_mtime_ns + 10 ** 9
+        assert catalog.refresh(str(tmp_path), max_workers=1).unchanged == 1
+
+
+def test_sites_since_compares_times_not_strings(tmp_path):
+    path = tmp_path / 'Fault_GT_N24987L02.txt'
+    path.write_bytes(_offline_image())
+    db_path = str(tmp_path / 'catalog.db')
+    with SiteCatalog(db_path) as catalog:
+        catalog.refresh(str(tmp_path), max_workers=1)
+        max_ts = catalog.site('N24987L02').max_ts
+    
+    # 이전 버전 카탈로그: 마이크로초 없는 isoformat() 문자열
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE sites SET max_ts = ?", (max_ts.isoformat(),))
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+    
+    with SiteCatalog(db_path) as catalog:
+        assert [s.site_id for s in catalog.sites(since=max_ts)] == ['N24987L02']
+        assert catalog.sites(since=max_ts.replace(microsecond=1)) == []
+        assert catalog.site('N24987L02').max_ts == max_ts == datetime(2026, 1, 8, 9, 30)
+
+
+def test_time_range_lookups(tmp_path):
+    # _offline_image(): 2026-01-08 00:00 ~ 09:30
+    (tmp_path / 'Fault_GT_N24987L02.txt').write_bytes(_offline_image())
+    
+    with SiteCatalog(str(tmp_path / 'catalog.db')) as catalog:
+        catalog.refresh(str(tmp_path), max_workers=1)
+        day = datetime(2026, 1, 8)
+        assert [s.site_id for s in catalog.sites(since=day, until=day.replace(hour=1))] == ['N24987L02']
+        assert catalog.sites(until=datetime(2026, 1, 7, 23, 59)) == []
+        assert len(catalog.files('N24987L02', since=day.replace(hour=9), until=datetime(2026, 1, 9))) == 1
+        assert catalog.files('N24987L02', since=day.replace(hour=10)) == []
+        assert catalog.files('OTHER', since=day) == []
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Container 테스트
+압축 → 읽기 → 복원 왕복이 원본과 같은지, 해시가 다르면 복원을 거부하는지 확인
+"""
+
+from datetime import datetime
+
+import pytest
+
+from fdc_neo_container import FaultContainer, pack_container, pack_file, unpack_file
+from fdc_neo_converter import FDCNEOConverter, RecordFilter
+from test_fdc_neo_archive import _offline_image, _offline_records, _online_snapshot
+
+
+@pytest.mark.parametrize('filename, data', [
+    ('Fault_GT_N24987L02.txt', _offline_image()),
+    ('GT_N24987L02_260107_0700.txt', _online_snapshot()),
+])
+def test_pack_read_reconstitute_round_trip(filename, data):
+    container = FaultContainer(pack_container(data, filename, block_records=4))
+    
+    assert len(container.blocks) > 1
+    assert container.read() == FDCNEOConverter().extract_records(data)
+    assert container.reconstitute() == data
+
+
+def test_read_decompresses_only_blocks_in_range():
+    container = FaultContainer(pack_container(_offline_image(), 'Fault_GT_N24987L02.txt', block_records=4))
+    record_filter = RecordFilter(since=datetime(2026, 1, 8, 2, 0), until=datetime(2026, 1, 8, 3, 0))
+    
+    expected = [(ts, data) for ts, data in _offline_records() if record_filter.since <= ts <= record_filter.until]
+    assert [ts for ts, _ in container.read(record_filter)] == [ts for ts, _ in expected]
+    assert container.decompressed_blocks < len(container.blocks)
+
+
+def test_reconstitute_rejects_hash_mismatch(tmp_path):
+    source = tmp_path / 'Fault_GT_N24987L02.txt'
+    source.write_bytes(_offline_image())
+    packed = pack_file(str(source))
+    assert packed.success
+    
+    restored = unpack_file(packed.output_file, str(tmp_path / 'restored.txt'))
+    assert restored.success
+    assert restored.output_data == source.read_bytes()
+    
+    # 복원 내용이 원본과 달라지면 (여기서는 0 패딩 길이) 해시 검증에서 거부
+    container = FaultContainer(packed.output_file)
+    container.index.tail_zeros += 1
+    with pytest.raises(ValueError, match='해시'):
+        container.reconstitute()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Converter 테스트
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from fdc_neo_converter import FDCNEOConverter
+
+
+def _offline_records(count: int, base: datetime = datetime(2026, 1, 8)) -> list:
+    """오프라인 레코드 (레코드 타입 포함) count개, 10분 간격"""
+    converter = FDCNEOConverter()
+    records = []
+    for i in range(count):
+        ts = base + timedelta(minutes=10 * i)
+        record = bytes([1 + i % 3, 0x07, 0xE7 + i % 3]) + converter._timestamp_bytes(ts) + bytes([0x30 + i % 64, 0x55, 0x10])
+        records.append((ts, record))
+    return records
+
+
+def test_diff_next_day_dump_ignores_last_record_padding():
+    converter = FDCNEOConverter()
+    records = _offline_records(40)
+    old = converter._build_offline_data(records)
+    
+    # 다음 날 덤프: 오래된 5개가 밀려나고 1개 추가 (어제 마지막 레코드는 더 이상 마지막이 아님)
+    ts = records[-1][0] + timedelta(minutes=5)
+    new_record = bytes([2, 0x07, 0xE9]) + converter._timestamp_bytes(ts) + b'\x11\x22\x33'
+    new = converter._build_offline_data(records[5:] + [(ts, new_record)])
+    
+    result = converter.diff_bytes(old, new)
+    assert result.success
+    assert result.added_count == 1
+    assert result.removed_count == 5
+    assert result.identical_count == 35
+
+
+def test_profiling_scope_reports_entry_points_only(tmp_path, monkeypatch):
+    import fdc_neo_profile
+    
+    converter = FDCNEOConverter()
+    path = tmp_path / 'Fault_GT_N24987L02.txt'
+    image = converter._build_offline_data(_offline_records(40), is_gt=True)
+    path.write_bytes(image)
+    work_dir = tmp_path / 'work'
+    work_dir.mkdir()
+    monkeypatch.chdir(work_dir)
+    profile_dir = tmp_path / 'profile'
+    
+    with fdc_neo_profile.profiling(str(profile_dir)) as reports:
+        converter.detect_site(image)
+        assert reports == []
+        # 메모리 변환: output_file은 권장 파일명일 뿐이므로 현재 디렉토리가 아닌 보고서 디렉토리에 기록
+        assert converter.offline_to_online_bytes(image, path.name).success
+        # 경로 기반 변환: 파일명만 지정한 출력도 실제로 기록한 출력 파일 옆(현재 디렉토리)에 기록
+        assert converter.offline_to_online(str(path), 'GT_N24987L02.txt').success
+    
+    assert [report.label for report in reports] == ['offline_to_online_bytes', 'offline_to_online']
+    assert os.path.dirname(reports[0].summary_path) == str(profile_dir)
+    assert os.path.basename(reports[0].summary_path).startswith('offline_to_online_bytes_')
+    assert reports[1].summary_path == 'GT_N24987L02.txt.profile.txt'
+    assert sorted(os.listdir(work_dir)) == [
+        'GT_N24987L02.txt', 'GT_N24987L02.txt.profile.collapsed', 'GT_N24987L02.txt.profile.txt'
+    ]
+    # 다른 스레드/전역 상태에는 영향 없음
+    assert not fdc_neo_profile.is_enabled()
+    assert fdc_neo_profile.last_reports() == []
+
+
+def test_metrics_count_outermost_call_only(monkeypatch):
+    import fdc_neo_metrics
+    
+    monkeypatch.setattr(fdc_neo_metrics, '_enabled', True)
+    calls = fdc_neo_metrics.CALLS
+    before = {method: calls.get(method, 'ok') for method in ('merge_to_offline_bytes', 'scan_records', 'detect_site')}
+    
+    converter = FDCNEOConverter()
+    records = _offline_records(10)
+    online = converter._build_online_data([(ts, data[1:]) for ts, data in records[5:]])
+    offline = converter._build_offline_data(records[:5], is_gt=True)
+    assert converter.merge_to_offline_bytes(online, offline).success
+    
+    after = {method: calls.get(method, 'ok') for method in before}
+    assert after['merge_to_offline_bytes'] == before['merge_to_offline_bytes'] + 1
+    assert after['scan_records'] == before['scan_records']
+    assert after['detect_site'] == before['detect_site']
+
+
+def test_metrics_record_early_stopped_generator_as_cancelled(monkeypatch):
+    import fdc_neo_metrics
+    
+    monkeypatch.setattr(fdc_neo_metrics, '_enabled', True)
+    calls = fdc_neo_metrics.CALLS
+    before = {status: calls.get('iter_online_pages', status) for status in ('ok', 'error', 'cancelled')}
+    
+    converter = FDCNEOConverter()
+    offline = converter._build_offline_data(_offline_records(200), is_gt=True)
+    pages = converter.iter_online_pages(offline, 'GT_N24987L02.bin')
+    assert next(pages).record_count > 0
+    pages.close()
+    
+    after = {status: calls.get('iter_online_pages', status) for status in before}
+    assert after == {**before, 'cancelled': before['cancelled'] + 1}
+    assert fdc_neo_metrics.IN_FLIGHT.get('iter_online_pages') == 0
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Latest 테스트
+병합 경로(일괄 병합, 파일 병합, 아카이브)마다 최근 고장 뷰가 병합 결과로 갱신되는지 확인
+"""
+
+from fdc_neo_archive import SegmentedArchive
+from fdc_neo_batch import group_by_site, merge_site_group
+from fdc_neo_converter import FDCNEOConverter
+from fdc_neo_latest import LatestFaultsView
+from test_fdc_neo_archive import _offline_image, _online_snapshot
+
+
+def test_batch_merge_skips_unknown_site(tmp_path):
+    groups = group_by_site([
+        ('Fault_GT_N24987L02.txt', _offline_image()),
+        ('GT_N24987L02_260107_0700.txt', _online_snapshot()),
+        ('snapshot.txt', _online_snapshot()),
+    ])
+    view_dir = str(tmp_path / 'latest')
+    for group in groups.values():
+        assert merge_site_group(group, 'online', str(tmp_path), latest_dir=view_dir).result.success
+    
+    view = LatestFaultsView(view_dir)
+    assert view.site_ids() == ['N24987L02']
+    assert len(view.latest('N24987L02')) == 35
+
+
+def test_merge_to_offline_updates_view(tmp_path):
+    online_path = tmp_path / 'GT_N24987L02_260107_0700.txt'
+    offline_path = tmp_path / 'Fault_GT_N24987L02.txt'
+    online_path.write_bytes(_online_snapshot())
+    offline_path.write_bytes(_offline_image())
+    
+    view = LatestFaultsView(str(tmp_path / 'latest'))
+    converter = FDCNEOConverter(latest=view)
+    result = converter.merge_to_offline(str(online_path), str(offline_path), str(tmp_path / 'out.txt'))
+    assert result.success
+    assert len(view.latest('N24987L02')) == result.record_count == 35
+
+
+def test_archive_merge_updates_view(tmp_path):
+    view = LatestFaultsView(str(tmp_path / 'latest'))
+    archive = SegmentedArchive(str(tmp_path / 'archive'), 'GT', 'N24987L02', latest=view)
+    archive.merge(_offline_image(), 'offline')
+    archive.merge(_online_snapshot(), 'online')
+    
+    latest = view.latest('N24987L02')
+    assert len(latest) == 35
+    assert latest[0][0] == max(ts for ts, _ in archive.read())
+
+
+def test_batch_merge_goes_through_instrumented_merge_records(tmp_path, monkeypatch):
+    import fdc_neo_metrics
+    
+    monkeypatch.setattr(fdc_neo_metrics, '_enabled', True)
+    before = fdc_neo_metrics.CALLS.get('merge_records', 'ok')
+    group = group_by_site([('Fault_GT_N24987L02.txt', _offline_image())])['N24987L02']
+    view_dir = str(tmp_path / 'latest')
+    assert merge_site_group(group, 'offline', str(tmp_path), latest_dir=view_dir).result.success
+    
+    assert fdc_neo_metrics.CALLS.get('merge_records', 'ok') == before + 1
+    assert len(LatestFaultsView(view_dir).latest('N24987L02')) == 20
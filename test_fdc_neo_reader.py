@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Reader 테스트
+미리 읽기가 입력 순서를 지키는지, 소비자보다 read_ahead 이상 앞서 나가지 않는지 확인
+"""
+
+from fdc_neo_reader import prefetch_files, scan_files
+from test_fdc_neo_archive import _online_snapshot
+
+
+def _write_files(tmp_path, count: int) -> list:
+    """크기가 서로 다른 파일 count개 (내용은 파일 번호로 구분)"""
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"GT_N24987L02_{i:04d}.txt"
+        path.write_bytes(str(i).encode() * (1 + i % 7) * 100)
+        paths.append(str(path))
+    return paths
+
+
+def test_prefetch_keeps_input_order_and_reports_read_errors(tmp_path):
+    paths = _write_files(tmp_path, 50)
+    paths.insert(17, str(tmp_path / 'GT_missing.txt'))
+    
+    items = list(prefetch_files(paths, max_workers=4, read_ahead=8, batch_size=3))
+    assert [item.path for item in items] == paths
+    assert [item.ok for item in items] == [path != paths[17] for path in paths]
+    for item in items:
+        if item.ok:
+            with open(item.path, 'rb') as f:
+                assert item.data == f.read()
+
+
+def test_prefetch_stays_within_read_ahead(tmp_path):
+    paths = _write_files(tmp_path, 100)
+    taken = []
+    
+    def path_source():
+        for path in paths:
+            taken.append(path)
+            yield path
+    
+    # 첫 파일을 받은 시점에는 read_ahead개까지만 읽기 작업에 넘어감
+    items = prefetch_files(path_source(), max_workers=2, read_ahead=12, batch_size=4)
+    assert next(items).path == paths[0]
+    assert len(taken) == 12
+    
+    # 소비한 만큼만 다음 묶음을 넘김
+    for _ in range(4):
+        next(items)
+    assert len(taken) == 16
+    items.close()
+    assert len(taken) == 16
+
+
+def test_scan_files_scans_prefetched_buffers_in_order(tmp_path):
+    snapshot = _online_snapshot()
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"GT_N24987L02_{i}.txt"
+        path.write_bytes(snapshot if i != 2 else b'\x00\x01')
+        paths.append(str(path))
+    
+    results = list(scan_files(paths, 'online', batch_size=2))
+    assert [item.path for item, _ in results] == paths
+    assert [scan is not None and len(scan.records) == 15 for _, scan in results] == [True, True, False, True, True]
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Shared Memory 테스트
+범위를 벗어날 때(예외 포함) 발급한 세그먼트가 모두 정리되는지 확인
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import pytest
+
+from fdc_neo_converter import FDCNEOConverter
+from fdc_neo_shm import SharedTableScope
+from test_fdc_neo_archive import _offline_image, _offline_records
+
+
+def _segment_exists(name: str) -> bool:
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    return True
+
+
+def test_scope_unlinks_segments_after_exception(tmp_path):
+    image_path = tmp_path / 'Fault_GT_N24987L02.txt'
+    image_path.write_bytes(_offline_image())
+    
+    with pytest.raises(RuntimeError):
+        with SharedTableScope() as scope:
+            published = scope.attach(scope.publish(_offline_records()))
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                extracted = scope.map_extract(executor, [str(image_path)], 'offline')[str(image_path)]
+            # 발급만 하고 생성되지 않은 이름도 정리 대상
+            scope.new_name()
+            names = list(scope._names)
+            
+            assert published.records() == _offline_records()
+            assert extracted.records() == FDCNEOConverter().extract_records(_offline_image())
+            assert [_segment_exists(name) for name in names] == [True, True, False]
+            raise RuntimeError('중단')
+    
+    assert not any(_segment_exists(name) for name in names)
+    assert scope._names == [] and scope._tables == []
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+FDC NEO Snapshot Log 테스트
+기록 도중 중단되어 로그/인덱스 끝이 잘린 경우 다시 열 때 복구되는지 확인
+"""
+
+import os
+
+from fdc_neo_snaplog import INDEX_MAGIC, SnapshotLog, _INDEX_ENTRY
+from test_fdc_neo_archive import _online_snapshot
+
+
+def _snapshots() -> list:
+    """온라인 스냅샷 3개 (파일 타임스탬프는 생성 시각이므로 한 번 만들어 재사용)"""
+    return [_online_snapshot(count) for count in (5, 10, 15)]
+
+
+def test_reopen_truncates_partial_tail_entry(tmp_path):
+    snapshots = _snapshots()
+    log = SnapshotLog(str(tmp_path), 'N24987L02')
+    for snapshot in snapshots:
+        assert log.append(snapshot)
+    complete_end = log.entries[1].end
+    
+    # 마지막 스냅샷 기록 중 중단: 로그는 페이로드 일부만, 인덱스는 항목 일부만 남음
+    with open(log.log_path, 'r+b') as f:
+        f.truncate(log.entries[2].offset + 3)
+    with open(log.index_path, 'r+b') as f:
+        f.truncate(len(INDEX_MAGIC) + 2 * _INDEX_ENTRY.size + 5)
+    
+    reopened = SnapshotLog(str(tmp_path), 'N24987L02')
+    assert len(reopened) == 2
+    assert os.path.getsize(reopened.log_path) == complete_end
+    assert os.path.getsize(reopened.index_path) == len(INDEX_MAGIC) + 2 * _INDEX_ENTRY.size
+    assert reopened.read_payloads(reopened.entries) == [bytes.fromhex(s.decode()) for s in snapshots[:2]]
+    
+    # 잘린 스냅샷을 다시 추가하면 정상 항목으로 기록
+    assert reopened.append(snapshots[2])
+    assert len(SnapshotLog(str(tmp_path), 'N24987L02')) == 3
+
+
+def test_reopen_reindexes_log_entries_missing_from_index(tmp_path):
+    snapshots = _snapshots()
+    log = SnapshotLog(str(tmp_path), 'N24987L02')
+    for snapshot in snapshots:
+        log.append(snapshot)
+    entries = list(log.entries)
+    
+    # 로그 기록 후 인덱스 기록 전에 중단
+    with open(log.index_path, 'r+b') as f:
+        f.truncate(len(INDEX_MAGIC) + _INDEX_ENTRY.size)
+    
+    reopened = SnapshotLog(str(tmp_path), 'N24987L02')
+    assert reopened.entries == entries
+    assert not reopened.append(snapshots[1])